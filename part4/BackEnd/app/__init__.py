@@ -2,12 +2,21 @@ from flask import Flask
 from flask_restx import Api
 from flask_cors import CORS
 from app.extensions import bcrypt, jwt, db
+from app.persistence.query_stats import init_query_stats
+from app.persistence.slow_queries import init_slow_query_log
+from app.persistence.sqlite_profile import init_sqlite_profile
+from app.services.password_hasher import (PasswordHasherBusy, init_password_hasher,
+                                          password_hasher_busy)
+from app.services.revocation_store import init_revocation_store
+from app.utils.fieldsets import init_sparse_fieldsets
+from app.utils.profiler import init_profiler
 from app.api.user_endpoints import api as user_ns
 from app.api.amenity_endpoints import api as amenity_ns
 from app.api.place_endpoints import api as place_ns
 from app.api.review_endpoints import api as review_ns
 from app.api.auth_endpoints import api as auth_ns
 from app.api.protected_endpoints import api as protected_ns
+from app.api.admin_endpoints import api as admin_ns
 
 def create_app(config_name='default'):
     """
@@ -21,8 +30,8 @@ def create_app(config_name='default'):
     """
     app = Flask(__name__)
     
-    # Enable CORS for front-end
-    CORS(app)
+    # Enable CORS for front-end (expose the pagination and caching headers to scripts)
+    CORS(app, expose_headers=['X-Next-Cursor', 'Link', 'ETag'])
     
     # Load configuration
     from config import config
@@ -32,10 +41,17 @@ def create_app(config_name='default'):
     bcrypt.init_app(app)
     jwt.init_app(app)
     db.init_app(app)
+    init_sqlite_profile(app)
+    init_query_stats(app)
+    init_slow_query_log(app)
+    init_password_hasher(app)
+    init_revocation_store(app)
+    init_sparse_fieldsets(app)
 
     # create the main API object
     api = Api(app, version="1.0", title="HBnB API",
               description="HBnB RESTful API")
+    api.errorhandler(PasswordHasherBusy)(password_hasher_busy)
 
     # register namespaces (not blueprints)
     api.add_namespace(auth_ns, path="/api/v1/auth")
@@ -44,5 +60,9 @@ def create_app(config_name='default'):
     api.add_namespace(amenity_ns, path="/api/v1/amenities")
     api.add_namespace(place_ns, path="/api/v1/places")
     api.add_namespace(review_ns, path="/api/v1/reviews")
+    api.add_namespace(admin_ns, path="/api/v1/admin")
+
+    # Outermost WSGI layer, so a profiled request is sampled from end to end
+    init_profiler(app)
 
     return app
@@ -0,0 +1,128 @@
+"""
+Administration endpoints (admin only).
+"""
+from flask import Response
+from flask_restx import Namespace, Resource, reqparse
+from flask_jwt_extended import jwt_required
+from app.business.facade import HBnBFacade
+from app.persistence.slow_queries import slow_queries
+from app.services.password_hasher import password_hasher
+from app.services.revocation_store import revocation_store
+from app.utils.auth import admin_required
+from app.utils.profiler import folded_filename, profiler
+from app.utils.response_cache import response_cache_stats
+
+api = Namespace("admin", description="Administration and diagnostics (admin only)")
+facade = HBnBFacade()
+
+# Query parameters of the slow-query report
+slow_query_parser = reqparse.RequestParser()
+slow_query_parser.add_argument('limit', type=int, default=20, location='args',
+                               help='Number of statements to return')
+slow_query_parser.add_argument('sort', type=str, default='total', location='args',
+                               choices=('total', 'max', 'mean', 'count'),
+                               help='Order by total, max or mean time, or by count')
+
+# Query parameters of the profile download
+profile_parser = reqparse.RequestParser()
+profile_parser.add_argument('route', type=str, location='args',
+                            help='Only this route, e.g. PlaceList.get (default: all)')
+
+
+def _profiler():
+    current = profiler()
+    if current is None:
+        api.abort(404, "Profiler is disabled")
+    return current
+
+
+@api.route("/cache")
+class EntityCacheStats(Resource):
+    @jwt_required()
+    @admin_required()
+    def get(self):
+        """Hit/miss counters of the repository entity caches"""
+        return facade.get_cache_stats(), 200
+
+
+@api.route("/response-cache")
+class ResponseCacheStats(Resource):
+    @jwt_required()
+    @admin_required()
+    def get(self):
+        """Hit/stale/miss counters and hit ratio of the HTTP response caches"""
+        return response_cache_stats(), 200
+
+
+@api.route("/password-hasher")
+class PasswordHasherStats(Resource):
+    @jwt_required()
+    @admin_required()
+    def get(self):
+        """Queue depth and counters of the bcrypt worker pool"""
+        return password_hasher().stats(), 200
+
+
+@api.route("/users/<string:user_id>/revoke-tokens")
+class RevokeUserTokens(Resource):
+    @api.response(404, "User not found")
+    @jwt_required()
+    @admin_required()
+    def post(self, user_id):
+        """Revoke every access and refresh token issued to a user so far"""
+        if not facade.get_user(user_id):
+            api.abort(404, "User not found")
+        revocation_store().revoke_user(user_id)
+        return {"message": "Tokens revoked"}, 200
+
+
+@api.route("/revocations")
+class RevocationStats(Resource):
+    @jwt_required()
+    @admin_required()
+    def get(self):
+        """Size and lookup counters of the revoked token filter"""
+        return revocation_store().stats(), 200
+
+
+@api.route("/slow-queries")
+class SlowQueries(Resource):
+    @api.expect(slow_query_parser)
+    @jwt_required()
+    @admin_required()
+    def get(self):
+        """Slowest SQL statements by fingerprint, with their query plan"""
+        args = slow_query_parser.parse_args()
+        return slow_queries(max(1, args['limit']), args['sort']), 200
+
+
+@api.route("/profile")
+@api.response(404, "Profiler is disabled")
+class Profile(Resource):
+    @jwt_required()
+    @admin_required()
+    def get(self):
+        """Profiled requests and stack samples per route"""
+        return _profiler().summary(), 200
+
+    @jwt_required()
+    @admin_required()
+    def delete(self):
+        """Forget every stack sampled so far"""
+        _profiler().reset()
+        return {"message": "Profile reset"}, 200
+
+
+@api.route("/profile/collapsed")
+@api.response(404, "Profiler is disabled")
+class CollapsedProfile(Resource):
+    @api.expect(profile_parser)
+    @api.produces(["text/plain"])
+    @jwt_required()
+    @admin_required()
+    def get(self):
+        """Sampled stacks in collapsed format, for flamegraph.pl or speedscope"""
+        route = profile_parser.parse_args()['route']
+        name = folded_filename(route or 'hbnb')
+        return Response(_profiler().collapsed(route), mimetype='text/plain',
+                        headers={'Content-Disposition': f'attachment; filename="{name}"'})
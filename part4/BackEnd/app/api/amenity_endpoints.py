@@ -1,7 +1,12 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required
 from app.business.facade import HBnBFacade
+from app.utils.conditional import collection_validators, conditional, resource_validators
+from app.utils.response_cache import cached_response
+from app.utils.pagination import list_parser, paginate, requested_ids
 from app.utils.auth import admin_required
+from app.utils.batch import batch_items, batch_response, batch_result_model
+from app.utils.serializers import marshal_list_with
 
 api = Namespace("amenities", description="Amenity operations")
 facade = HBnBFacade()
@@ -11,12 +16,21 @@ amenity_model = api.model("Amenity", {
     "name": fields.String(required=True, description="Amenity name")
 })
 
+batch_model = batch_result_model(api)
+
 
 @api.route("/")
 class AmenityList(Resource):
-    @api.marshal_list_with(amenity_model)
+    @api.expect(list_parser)
+    @conditional(collection_validators('amenities'))
+    @cached_response('amenities', tables=('amenities',))
+    @marshal_list_with(amenity_model)
     def get(self):
-        return facade.get_all_amenities()
+        """List amenities, one page at a time, or fetch several by ID with ?ids="""
+        args = list_parser.parse_args()
+        if args['ids'] is not None:
+            return facade.get_amenities_by_ids(requested_ids(args['ids']))
+        return paginate(args, facade.get_amenities_page)
 
     @api.expect(amenity_model)
     @api.marshal_with(amenity_model, code=201)
@@ -30,9 +44,26 @@ class AmenityList(Resource):
             api.abort(400, str(e))
 
 
+@api.route("/batch")
+class AmenityBatch(Resource):
+    @api.expect([amenity_model])
+    @api.marshal_with(batch_model, code=201)
+    @api.response(207, "Some items were rejected", batch_model)
+    @jwt_required()
+    @admin_required()
+    def post(self):
+        """Create many amenities in one transaction (admin only)"""
+        items = batch_items(api.payload)
+        try:
+            return batch_response(facade.create_amenities_batch(items))
+        except ValueError as e:
+            api.abort(409, str(e))
+
+
 @api.route("/<string:amenity_id>")
 @api.response(404, "Amenity not found")
 class AmenityResource(Resource):
+    @conditional(lambda amenity_id: resource_validators(facade.get_amenity(amenity_id)))
     @api.marshal_with(amenity_model)
     def get(self, amenity_id):
         amenity = facade.get_amenity(amenity_id)
@@ -2,8 +2,10 @@
 Authentication endpoints for JWT-based login.
 """
 from flask_restx import Namespace, Resource, fields
-from flask_jwt_extended import create_access_token
+from flask_jwt_extended import (create_access_token, create_refresh_token, get_jwt,
+                                get_jwt_identity, jwt_required)
 from app.business.facade import HBnBFacade
+from app.services.revocation_store import revocation_store
 
 api = Namespace("auth", description="Authentication operations")
 facade = HBnBFacade()
@@ -16,20 +18,30 @@ login_model = api.model("Login", {
 
 # Model for login response
 token_model = api.model("Token", {
+    "access_token": fields.String(description="JWT access token"),
+    "refresh_token": fields.String(description="JWT refresh token, for /auth/refresh")
+})
+
+# Model for refresh response
+access_token_model = api.model("AccessToken", {
     "access_token": fields.String(description="JWT access token")
 })
 
+# Claims copied into every token of a user
+CLAIMS = ("is_admin",)
+
 
 @api.route("/login")
 class Login(Resource):
     @api.expect(login_model)
     @api.response(200, "Login successful", token_model)
     @api.response(401, "Invalid credentials")
+    @api.response(503, "Too many logins in progress, retry later")
     def post(self):
         """
-        Authenticate user and return a JWT token.
+        Authenticate user and return a JWT access token and refresh token.
         
-        The token includes user identity and claims (like is_admin).
+        The tokens include user identity and claims (like is_admin).
         """
         credentials = api.payload
         email = credentials.get("email")
@@ -38,18 +50,52 @@ class Login(Resource):
         if not email or not password:
             api.abort(400, "Email and password are required")
         
-        # Get user by email
-        user = facade.get_user_by_email(email)
+        # Check the password (and upgrade its hash if the bcrypt cost changed)
+        user = facade.authenticate(email, password)
         
-        if not user or not user.verify_password(password):
+        if not user:
             api.abort(401, "Invalid credentials")
         
-        # Create JWT token with additional claims
-        access_token = create_access_token(
-            identity=user.id,
-            additional_claims={
-                "is_admin": user.is_admin
-            }
-        )
+        # Create JWT tokens with additional claims
+        claims = {"is_admin": user.is_admin}
+        
+        return {
+            "access_token": create_access_token(identity=user.id, additional_claims=claims),
+            "refresh_token": create_refresh_token(identity=user.id, additional_claims=claims)
+        }, 200
+
+
+@api.route("/refresh")
+class Refresh(Resource):
+    @api.response(200, "New access token", access_token_model)
+    @api.response(401, "Missing, expired or revoked refresh token")
+    @jwt_required(refresh=True)
+    def post(self):
+        """
+        Exchange a refresh token for a new access token.
         
-        return {"access_token": access_token}, 200
+        Only the token's signature is checked: no password, no database.
+        The claims are copied from the refresh token; they stay current
+        because changing is_admin or deleting the user revokes it.
+        """
+        refresh = get_jwt()
+        claims = {claim: refresh[claim] for claim in CLAIMS if claim in refresh}
+        return {
+            "access_token": create_access_token(identity=get_jwt_identity(),
+                                                additional_claims=claims)
+        }, 200
+
+
+@api.route("/logout")
+class Logout(Resource):
+    @api.response(200, "Token revoked")
+    @jwt_required(verify_type=False)
+    def post(self):
+        """
+        Revoke the access or refresh token sent in the Authorization header.
+        
+        Call it once with each token to end the session everywhere.
+        """
+        token = get_jwt()
+        revocation_store().revoke(token["jti"], token["exp"], user_id=token["sub"])
+        return {"message": f"{token['type'].capitalize()} token revoked"}, 200
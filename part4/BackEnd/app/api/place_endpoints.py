@@ -1,11 +1,32 @@
-from flask_restx import Namespace, Resource, fields
+from flask import current_app
+from flask_restx import Namespace, Resource, fields, marshal, reqparse
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.business.facade import HBnBFacade
+from app.utils.conditional import collection_validators, conditional, place_validators
+from app.utils.response_cache import cached_response
+from app.utils.pagination import list_parser, page_limit, pagination_parser, paginate, requested_ids
 from app.utils.auth import is_admin
+from app.utils.fieldsets import fields_parser, requested_fields
+from app.utils.batch import batch_items, batch_response, batch_result_model
+from app.utils.streaming import add_stream_argument, streamable
+from app.utils.serializers import marshal_list_with
 
 api = Namespace("places", description="Place operations")
 facade = HBnBFacade()
 
+# Query parameters for listing/searching places
+place_list_parser = list_parser.copy()
+place_list_parser.add_argument('min_price', type=float, location='args',
+                               help='Minimum price per night')
+place_list_parser.add_argument('max_price', type=float, location='args',
+                               help='Maximum price per night')
+place_list_parser.add_argument('city', type=str, location='args',
+                               help='Only return places in this city')
+place_list_parser.add_argument('sort', type=str, location='args', default='created_at',
+                               choices=('created_at', 'price', '-price'),
+                               help='Sort order')
+add_stream_argument(place_list_parser)
+
 place_model = api.model("Place", {
     "id": fields.String(readonly=True, description="Place ID"),
     "name": fields.String(required=True, description="Place name"),
@@ -15,16 +36,86 @@ place_model = api.model("Place", {
     "latitude": fields.Float(description="Latitude coordinate"),
     "longitude": fields.Float(description="Longitude coordinate"),
     "owner_id": fields.String(description="Owner (User) ID"),
+    "review_count": fields.Integer(readonly=True, description="Number of reviews"),
+    "avg_rating": fields.Float(readonly=True, description="Average review rating"),
     "amenities": fields.List(fields.String, description="List of Amenity IDs")
 })
 
+nearby_place_model = api.inherit("NearbyPlace", place_model, {
+    "distance_km": fields.Float(description="Distance from the search point in km")
+})
+
+# GET /places/<id>/full: everything the place page needs in one response
+place_amenity_model = api.model("PlaceAmenity", {
+    "id": fields.String(description="Amenity ID"),
+    "name": fields.String(description="Amenity name")
+})
+
+place_review_model = api.model("PlaceReview", {
+    "id": fields.String(description="Review ID"),
+    "text": fields.String(description="Review text"),
+    "rating": fields.Integer(description="Rating from 1 to 5"),
+    "user_id": fields.String(description="Author User ID"),
+    "author_name": fields.String(description="Author display name"),
+    "created_at": fields.DateTime(description="When the review was written")
+})
+
+place_full_model = api.model("PlaceFull", dict(place_model, **{
+    "amenities": fields.List(fields.Nested(place_amenity_model), description="Amenities"),
+    "reviews": fields.List(fields.Nested(place_review_model),
+                           description="First page of reviews, newest first"),
+    "reviews_next_cursor": fields.String(
+        description="Cursor for /reviews/place/<place_id> to fetch the following reviews")
+}))
+
+full_parser = reqparse.RequestParser()
+full_parser.add_argument('reviews_limit', type=int, location='args',
+                         help='Maximum number of reviews to embed')
+
+# Query parameters for the nearby search
+nearby_parser = reqparse.RequestParser()
+nearby_parser.add_argument('lat', type=float, required=True, location='args',
+                           help='Latitude of the search point')
+nearby_parser.add_argument('lng', type=float, required=True, location='args',
+                           help='Longitude of the search point')
+nearby_parser.add_argument('radius_km', type=float, default=10.0, location='args',
+                           help='Search radius in kilometres')
+nearby_parser.add_argument('limit', type=int, location='args',
+                           help='Maximum number of places to return')
+
+# Query parameters for the keyword search
+search_parser = pagination_parser.copy()
+search_parser.add_argument('q', type=str, required=True, location='args',
+                           help='Words to look for in name, description and city')
+
+batch_model = batch_result_model(api)
+
+
+def _place_filters():
+    """The min_price/max_price/city filters and sort order of the current request."""
+    args = place_list_parser.parse_args()
+    return {key: args[key] for key in ('min_price', 'max_price', 'city', 'sort')}
+
 
 @api.route("/")
 class PlaceList(Resource):
-    @api.marshal_list_with(place_model)
+    @api.expect(place_list_parser)
+    @streamable(place_model, lambda fields: facade.iter_places(fields=fields, **_place_filters()))
+    @conditional(collection_validators('places', 'amenities'))
+    @cached_response('places', tables=('places', 'amenities'))
+    @marshal_list_with(place_model)
     def get(self):
-        """List all places"""
-        return facade.get_all_places()
+        """List places, optionally filtered by price/city, one page at a time, or by ?ids="""
+        args = place_list_parser.parse_args()
+        fields = requested_fields(args['fields'], place_model)
+        if args['ids'] is not None:
+            return facade.get_places_by_ids(requested_ids(args['ids']), fields)
+        filters = {key: args[key] for key in ('min_price', 'max_price', 'city', 'sort')}
+        filters['fields'] = fields
+        return paginate(
+            args,
+            lambda limit, cursor: facade.search_places(limit=limit, cursor=cursor, **filters)
+        )
 
     @api.expect(place_model)
     @api.marshal_with(place_model, code=201)
@@ -41,9 +132,72 @@ class PlaceList(Resource):
             api.abort(400, str(e))
 
 
+@api.route("/search")
+class PlaceSearch(Resource):
+    @api.expect(search_parser)
+    @conditional(collection_validators('places', 'amenities'))
+    @marshal_list_with(place_model)
+    def get(self):
+        """Search places by keyword, best matches first (BM25 on SQLite)"""
+        args = search_parser.parse_args()
+        terms = args['q']
+        fields = requested_fields(args['fields'], place_model)
+        try:
+            return paginate(
+                args,
+                lambda limit, cursor: facade.search_places_text(terms, limit, cursor, fields)
+            )
+        except ValueError as e:
+            api.abort(400, str(e))
+
+
+@api.route("/nearby")
+class PlacesNearby(Resource):
+    @api.expect(nearby_parser)
+    @conditional(collection_validators('places', 'amenities'))
+    @api.marshal_list_with(nearby_place_model)
+    def get(self):
+        """List places within radius_km of (lat, lng), closest first"""
+        args = nearby_parser.parse_args()
+        max_radius = current_app.config['NEARBY_MAX_RADIUS_KM']
+        if args['radius_km'] > max_radius:
+            api.abort(400, f"radius_km may not exceed {max_radius}")
+        try:
+            matches = facade.get_places_nearby(args['lat'], args['lng'], args['radius_km'],
+                                               page_limit(args['limit']))
+        except ValueError as e:
+            api.abort(400, str(e))
+        return [
+            dict(marshal(place, place_model), distance_km=round(distance, 3))
+            for place, distance in matches
+        ]
+
+
+@api.route("/batch")
+class PlaceBatch(Resource):
+    @api.expect([place_model])
+    @api.marshal_with(batch_model, code=201)
+    @api.response(207, "Some items were rejected", batch_model)
+    @jwt_required()
+    def post(self):
+        """Create many places in one transaction (admins may set owner_id)"""
+        items = batch_items(api.payload, id_fields=('owner_id',))
+        if not is_admin():
+            current_user_id = get_jwt_identity()
+            for item in items:
+                if isinstance(item, dict):
+                    item['owner_id'] = current_user_id
+        try:
+            return batch_response(facade.create_places_batch(items))
+        except ValueError as e:
+            api.abort(409, str(e))
+
+
 @api.route("/<string:place_id>")
 @api.response(404, "Place not found")
 class PlaceResource(Resource):
+    @api.expect(fields_parser)
+    @conditional(lambda place_id: place_validators(facade.get_place(place_id)))
     @api.marshal_with(place_model)
     def get(self, place_id):
         place = facade.get_place(place_id)
@@ -69,5 +223,24 @@ class PlaceResource(Resource):
             api.abort(403, "You do not have permission to update this place")
         
         # Update the place
-        updated_place = facade.update_place(place_id, api.payload)
-        return updated_place
+        try:
+            return facade.update_place(place_id, api.payload)
+        except ValueError as e:
+            api.abort(400, str(e))
+
+
+@api.route("/<string:place_id>/full")
+@api.response(404, "Place not found")
+class PlaceFull(Resource):
+    @api.expect(full_parser)
+    @conditional(collection_validators('places', 'amenities', 'reviews', 'users'))
+    @api.marshal_with(place_full_model)
+    def get(self, place_id):
+        """Get a place with its amenities, first page of reviews and their authors"""
+        args = full_parser.parse_args()
+        details = facade.get_place_details(place_id, page_limit(args['reviews_limit']))
+        if not details:
+            api.abort(404, "Place not found")
+        place, reviews, next_cursor = details
+        return dict(marshal(place, place_model), amenities=place.amenities,
+                    reviews=reviews, reviews_next_cursor=next_cursor)
@@ -1,7 +1,14 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.business.facade import HBnBFacade
+from app.utils.conditional import collection_validators, conditional, resource_validators
+from app.utils.fieldsets import fields_parser, requested_fields
+from app.utils.response_cache import cached_response
+from app.utils.pagination import list_parser, pagination_parser, paginate, requested_ids
 from app.utils.auth import is_admin
+from app.utils.batch import batch_items, batch_response, batch_result_model
+from app.utils.streaming import add_stream_argument, streamable
+from app.utils.serializers import marshal_list_with
 
 api = Namespace("reviews", description="Review operations")
 facade = HBnBFacade()
@@ -9,16 +16,32 @@ facade = HBnBFacade()
 review_model = api.model("Review", {
     "id": fields.String(readonly=True, description="Review ID"),
     "text": fields.String(required=True, description="Review text"),
+    "rating": fields.Integer(description="Rating from 1 to 5"),
     "user_id": fields.String(required=True, description="Author User ID"),
     "place_id": fields.String(required=True, description="Associated Place ID")
 })
 
+review_list_parser = add_stream_argument(list_parser.copy())
+
+batch_model = batch_result_model(api)
+
 
 @api.route("/")
 class ReviewList(Resource):
-    @api.marshal_list_with(review_model)
+    @api.expect(review_list_parser)
+    @streamable(review_model, lambda fields: facade.iter_reviews(fields))
+    @conditional(collection_validators('reviews'))
+    @marshal_list_with(review_model)
     def get(self):
-        return facade.get_all_reviews()
+        """List reviews, one page at a time, or fetch several by ID with ?ids="""
+        args = review_list_parser.parse_args()
+        fields = requested_fields(args['fields'], review_model)
+        if args['ids'] is not None:
+            return facade.get_reviews_by_ids(requested_ids(args['ids']), fields)
+        return paginate(
+            args,
+            lambda limit, cursor: facade.get_reviews_page(limit, cursor, fields)
+        )
 
     @api.expect(review_model)
     @api.marshal_with(review_model, code=201)
@@ -35,9 +58,31 @@ class ReviewList(Resource):
             api.abort(400, str(e))
 
 
+@api.route("/batch")
+class ReviewBatch(Resource):
+    @api.expect([review_model])
+    @api.marshal_with(batch_model, code=201)
+    @api.response(207, "Some items were rejected", batch_model)
+    @jwt_required()
+    def post(self):
+        """Create many reviews in one transaction (admins may set user_id)"""
+        items = batch_items(api.payload, id_fields=('user_id', 'place_id'))
+        if not is_admin():
+            current_user_id = get_jwt_identity()
+            for item in items:
+                if isinstance(item, dict):
+                    item['user_id'] = current_user_id
+        try:
+            return batch_response(facade.create_reviews_batch(items))
+        except ValueError as e:
+            api.abort(409, str(e))
+
+
 @api.route("/<string:review_id>")
 @api.response(404, "Review not found")
 class ReviewResource(Resource):
+    @api.expect(fields_parser)
+    @conditional(lambda review_id: resource_validators(facade.get_review(review_id)))
     @api.marshal_with(review_model)
     def get(self, review_id):
         review = facade.get_review(review_id)
@@ -63,8 +108,10 @@ class ReviewResource(Resource):
             api.abort(403, "You do not have permission to update this review")
         
         # Update the review
-        updated_review = facade.update_review(review_id, api.payload)
-        return updated_review
+        try:
+            return facade.update_review(review_id, api.payload)
+        except ValueError as e:
+            api.abort(400, str(e))
 
     @jwt_required()
     def delete(self, review_id):
@@ -90,6 +137,16 @@ class ReviewResource(Resource):
 
 @api.route("/place/<string:place_id>")
 class ReviewsByPlace(Resource):
-    @api.marshal_list_with(review_model)
+    @api.expect(pagination_parser)
+    @conditional(collection_validators('reviews'))
+    @cached_response('reviews_by_place', tables=('reviews',))
+    @marshal_list_with(review_model)
     def get(self, place_id):
-        return facade.get_reviews_by_place(place_id)
+        """List the reviews of a place, newest first, one page at a time"""
+        args = pagination_parser.parse_args()
+        fields = requested_fields(args['fields'], review_model)
+        return paginate(
+            args,
+            lambda limit, cursor: facade.get_reviews_by_place_page(place_id, limit, cursor,
+                                                                   fields)
+        )
@@ -1,7 +1,11 @@
 from flask_restx import Namespace, Resource, fields
 from flask_jwt_extended import jwt_required, get_jwt_identity
 from app.business.facade import HBnBFacade
+from app.utils.conditional import collection_validators, conditional, resource_validators
+from app.utils.fieldsets import fields_parser, requested_fields
+from app.utils.pagination import list_parser, paginate, requested_ids
 from app.utils.auth import admin_required, is_admin
+from app.utils.serializers import marshal_list_with
 
 api = Namespace("users", description="User related operations")
 facade = HBnBFacade()
@@ -34,10 +38,19 @@ admin_user_update_model = api.model("AdminUserUpdate", {
 
 @api.route("/")
 class UserList(Resource):
-    @api.marshal_list_with(user_model)
+    @api.expect(list_parser)
+    @conditional(collection_validators('users'))
+    @marshal_list_with(user_model)
     def get(self):
-        """List all users"""
-        return facade.get_all_users()
+        """List users, one page at a time, or fetch several by ID with ?ids="""
+        args = list_parser.parse_args()
+        fields = requested_fields(args['fields'], user_model)
+        if args['ids'] is not None:
+            return facade.get_users_by_ids(requested_ids(args['ids']), fields)
+        return paginate(
+            args,
+            lambda limit, cursor: facade.get_users_page(limit, cursor, fields)
+        )
 
     @api.expect(user_input_model)
     @api.marshal_with(user_model, code=201)
@@ -52,6 +65,8 @@ class UserList(Resource):
 @api.route("/<string:user_id>")
 @api.response(404, "User not found")
 class UserResource(Resource):
+    @api.expect(fields_parser)
+    @conditional(lambda user_id: resource_validators(facade.get_user(user_id)))
     @api.marshal_with(user_model)
     def get(self, user_id):
         """Retrieve a single user by ID"""
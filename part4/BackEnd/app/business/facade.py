@@ -1,8 +1,12 @@
+from sqlalchemy.exc import IntegrityError
 from app.persistence.repository_factory import get_repository
+from app.persistence.unit_of_work import transaction
 from app.models.amenity import Amenity
 from app.models.place import Place
 from app.models.user import User
 from app.models.review import Review
+from app.services.revocation_store import revocation_store
+from app.utils.geo import haversine_km
 
 
 class HBnBFacade:
@@ -31,6 +35,49 @@ class HBnBFacade:
             self.review_repo = self._review_repo
             self.amenity_repo = self._amenity_repo
 
+    def transaction(self):
+        """
+        Group several facade calls into a single database commit.
+        
+        Usage:
+            with facade.transaction():
+                facade.create_amenity(...)
+                facade.create_amenity(...)
+        
+        Constraint violations surface when the block exits.
+        """
+        return transaction()
+
+    def _save_batch(self, repo, objs, updated=()):
+        """
+        Insert the valid objects of a batch in a single transaction,
+        together with updates to related objects ((repo, obj) pairs).
+        """
+        if not objs:
+            return
+        try:
+            with self.transaction():
+                repo.save_all(objs)
+                for related_repo, obj in updated:
+                    related_repo.update(obj)
+        except IntegrityError:
+            # Another request inserted a conflicting row after validation
+            raise ValueError("Batch conflicts with existing data; nothing was created")
+
+    def get_cache_stats(self):
+        """Return the entity cache counters of each repository."""
+        repos = {
+            "user": self.user_repo,
+            "place": self.place_repo,
+            "review": self.review_repo,
+            "amenity": self.amenity_repo,
+        }
+        return {
+            name: repo.cache_stats()
+            for name, repo in repos.items()
+            if hasattr(repo, 'cache_stats')
+        }
+
     # -------------------------------
     # User methods
     # -------------------------------
@@ -63,8 +110,16 @@ class HBnBFacade:
     def get_user(self, user_id):
         return self.user_repo.get("User", user_id)
 
+    def get_users_by_ids(self, ids, fields=None):
+        """Return the users with the given IDs in one query, in the same order."""
+        return self.user_repo.get_many("User", self._string_ids(ids), fields)
+
     def get_all_users(self):
         return self.user_repo.all("User")
+
+    def get_users_page(self, limit, cursor=None, fields=None):
+        """Return one page of users and the cursor for the next one."""
+        return self.user_repo.paginate("User", limit, cursor, fields)
     
     def get_user_by_email(self, email):
         """Get a user by email address."""
@@ -78,6 +133,21 @@ class HBnBFacade:
                 return user
         return None
 
+    def authenticate(self, email, password):
+        """
+        Return the user if the password matches, else None.
+
+        A hash made with another bcrypt cost than the configured one is
+        replaced while the plain password is at hand.
+        """
+        user = self.get_user_by_email(email)
+        if not user or not user.verify_password(password):
+            return None
+        if user.password_needs_rehash():
+            user.hash_password(password)
+            self.user_repo.save(user)
+        return user
+
     def update_user(self, user_id, data):
         user = self.user_repo.get("User", user_id)
         if not user:
@@ -93,14 +163,25 @@ class HBnBFacade:
             user.hash_password(data['password'])
             data = {k: v for k, v in data.items() if k != 'password'}
         
+        # Tokens carry is_admin: after a change, the ones already issued
+        # (refresh tokens included) must not keep the old privileges
+        role_changed = 'is_admin' in data and bool(data['is_admin']) != bool(user.is_admin)
+        
         for key, value in data.items():
             if hasattr(user, key) and key != 'password':
                 setattr(user, key, value)
-        self.user_repo.save(user)
+        with self.transaction():
+            self.user_repo.save(user)
+            if role_changed:
+                revocation_store().revoke_user(user.id)
         return user
 
     def delete_user(self, user_id):
-        return self.user_repo.delete("User", user_id)
+        with self.transaction():
+            deleted = self.user_repo.delete("User", user_id)
+            if deleted:
+                revocation_store().revoke_user(user_id)
+        return deleted
 
     # -------------------------------
     # Amenity methods
@@ -111,12 +192,50 @@ class HBnBFacade:
         amenity = Amenity(**data)
         return self.amenity_repo.save(amenity)
 
+    def create_amenities_batch(self, items):
+        """
+        Create many amenities at once.
+        
+        Existing names are looked up with one IN (...) query and the valid
+        items are inserted together. Returns one {"index", "id"} or
+        {"index", "error"} entry per input item.
+        """
+        names = [item.get("name") for item in items if isinstance(item, dict)]
+        taken = self.amenity_repo.existing_values(
+            "Amenity", "name", [name for name in names if isinstance(name, str)])
+
+        results, amenities = [], []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append({"index": index, "error": "Item must be an object"})
+            elif not item.get("name"):
+                results.append({"index": index, "error": "Amenity name is required"})
+            elif not isinstance(item["name"], str):
+                results.append({"index": index, "error": "Amenity name must be a string"})
+            elif item["name"] in taken:
+                results.append({"index": index, "error": "Amenity name already exists"})
+            else:
+                taken.add(item["name"])
+                amenity = Amenity(name=item["name"])
+                amenities.append(amenity)
+                results.append({"index": index, "id": amenity.id})
+        self._save_batch(self.amenity_repo, amenities)
+        return results
+
     def get_amenity(self, amenity_id):
         return self.amenity_repo.get("Amenity", amenity_id)
 
+    def get_amenities_by_ids(self, ids, fields=None):
+        """Return the amenities with the given IDs in one query, in the same order."""
+        return self.amenity_repo.get_many("Amenity", self._string_ids(ids), fields)
+
     def get_all_amenities(self):
         return self.amenity_repo.all("Amenity")
 
+    def get_amenities_page(self, limit, cursor=None, fields=None):
+        """Return one page of amenities and the cursor for the next one."""
+        return self.amenity_repo.paginate("Amenity", limit, cursor, fields)
+
     def update_amenity(self, amenity_id, data):
         amenity = self.amenity_repo.get("Amenity", amenity_id)
         if not amenity:
@@ -139,6 +258,7 @@ class HBnBFacade:
         owner_id = data.get("owner_id")
         if not owner_id or not self.user_repo.get("User", owner_id):
             raise ValueError("Valid owner_id is required")
+        self._validate_place_fields(data)
 
         data.setdefault("price", 0)
         data.setdefault("latitude", 0.0)
@@ -147,18 +267,182 @@ class HBnBFacade:
         place = Place(**data)
         return self.place_repo.save(place)
 
+    # Attributes accepted for each item of a place batch
+    PLACE_BATCH_FIELDS = ("name", "description", "city", "price",
+                          "latitude", "longitude", "owner_id")
+
+    def create_places_batch(self, items):
+        """
+        Create many places at once.
+        
+        All owner_ids are checked with one IN (...) query and the valid
+        items are inserted together. Returns one {"index", "id"} or
+        {"index", "error"} entry per input item.
+        """
+        owner_ids = [item.get("owner_id") for item in items if isinstance(item, dict)]
+        known_owners = self.user_repo.existing_values(
+            "User", "id", [owner_id for owner_id in owner_ids if isinstance(owner_id, str)])
+
+        results, places = [], []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append({"index": index, "error": "Item must be an object"})
+            elif not item.get("name"):
+                results.append({"index": index, "error": "Place name is required"})
+            elif not item.get("city"):
+                results.append({"index": index, "error": "City is required"})
+            elif not isinstance(item.get("owner_id"), str) \
+                    or item["owner_id"] not in known_owners:
+                results.append({"index": index, "error": "Valid owner_id is required"})
+            else:
+                data = {k: v for k, v in item.items() if k in self.PLACE_BATCH_FIELDS}
+                try:
+                    self._validate_place_fields(data)
+                except ValueError as e:
+                    results.append({"index": index, "error": str(e)})
+                    continue
+                data.setdefault("price", 0)
+                data.setdefault("latitude", 0.0)
+                data.setdefault("longitude", 0.0)
+                place = Place(**data)
+                places.append(place)
+                results.append({"index": index, "id": place.id})
+        self._save_batch(self.place_repo, places)
+        return results
+
+    # Allowed range of each coordinate, in degrees
+    COORDINATE_RANGES = {"latitude": (-90, 90), "longitude": (-180, 180)}
+
+    @classmethod
+    def _validate_place_fields(cls, data):
+        """
+        Text fields must be strings and price/coordinates numbers, when
+        given; coordinates must also lie within COORDINATE_RANGES.
+        """
+        for key in ("name", "description", "city"):
+            if data.get(key) is not None and not isinstance(data[key], str):
+                raise ValueError(f"{key} must be a string")
+        for key in ("price", "latitude", "longitude"):
+            value = data.get(key)
+            if value is not None and (isinstance(value, bool)
+                                      or not isinstance(value, (int, float))):
+                raise ValueError(f"{key} must be a number")
+        for key, (low, high) in cls.COORDINATE_RANGES.items():
+            value = data.get(key)
+            if value is not None and not low <= value <= high:
+                raise ValueError(f"{key} must be between {low} and {high}")
+
     def get_place(self, place_id):
         return self.place_repo.get("Place", place_id)
 
+    def get_place_details(self, place_id, review_limit):
+        """
+        Gather everything the place page shows: the place with its amenities
+        and the first page of reviews with their authors.
+        
+        Returns (place, reviews, next_review_cursor), or None if the place
+        does not exist.
+        """
+        place = self.get_place(place_id)
+        if not place:
+            return None
+        # Use repository's author-joining query if available (SQLAlchemy)
+        if hasattr(self.review_repo, 'by_place'):
+            reviews, next_cursor = self.review_repo.by_place(place_id, review_limit,
+                                                             with_authors=True)
+        else:
+            reviews, next_cursor = self.get_reviews_by_place_page(place_id, review_limit)
+        return place, reviews, next_cursor
+
+    def get_places_by_ids(self, ids, fields=None):
+        """Return the places with the given IDs in one query, in the same order."""
+        return self.place_repo.get_many("Place", self._string_ids(ids), fields)
+
     def get_all_places(self):
         return self.place_repo.all("Place")
 
+    def get_places_page(self, limit, cursor=None, fields=None):
+        """Return one page of places and the cursor for the next one."""
+        return self.place_repo.paginate("Place", limit, cursor, fields)
+
+    def search_places(self, min_price=None, max_price=None, city=None,
+                      sort='created_at', limit=None, cursor=None, fields=None):
+        """Filter and sort places; returns (places, next_cursor)."""
+        # Use repository's search method if available (SQLAlchemy)
+        if hasattr(self.place_repo, 'search'):
+            return self.place_repo.search(min_price=min_price, max_price=max_price,
+                                          city=city, sort=sort,
+                                          limit=limit, cursor=cursor, fields=fields)
+        # Fallback for InMemoryRepository: filter everything, single page
+        places = [
+            p for p in self.place_repo.all("Place")
+            if (not city or p.city == city)
+            and (min_price is None or p.price >= min_price)
+            and (max_price is None or p.price <= max_price)
+        ]
+        if sort == 'created_at':
+            places.sort(key=lambda p: (p.created_at, p.id))
+        else:
+            places.sort(key=lambda p: (p.price, p.id), reverse=sort == '-price')
+        return places, None
+
+    def iter_places(self, min_price=None, max_price=None, city=None, sort='created_at',
+                    fields=None):
+        """Iterate over the matching places in batches, for streaming exports."""
+        # Use repository's batched iteration if available (SQLAlchemy)
+        if hasattr(self.place_repo, 'iter_search'):
+            return self.place_repo.iter_search(min_price=min_price, max_price=max_price,
+                                               city=city, sort=sort, fields=fields)
+        # Fallback for InMemoryRepository
+        return iter(self.search_places(min_price, max_price, city, sort)[0])
+
+    def search_places_text(self, terms, limit=None, cursor=None, fields=None):
+        """Keyword search over place name/description/city; returns (places, next_cursor)."""
+        # Use repository's full-text index if available (SQLAlchemy)
+        if hasattr(self.place_repo, 'full_text_search'):
+            return self.place_repo.full_text_search(terms, limit, cursor, fields)
+        # Fallback for InMemoryRepository: substring match, single page
+        words = terms.lower().split()
+        if not words:
+            raise ValueError("Search query must contain at least one word")
+        places = [
+            p for p in self.place_repo.all("Place")
+            if all(word in " ".join(filter(None, (p.name, p.description, p.city))).lower()
+                   for word in words)
+        ]
+        return places, None
+
+    def get_places_nearby(self, latitude, longitude, radius_km, limit):
+        """Return up to limit (place, distance_km) pairs within radius_km, closest first."""
+        if not -90 <= latitude <= 90 or not -180 <= longitude <= 180:
+            raise ValueError("Coordinates out of range")
+        if radius_km <= 0:
+            raise ValueError("radius_km must be positive")
+        # Use repository's geohash-indexed search if available (SQLAlchemy)
+        if hasattr(self.place_repo, 'nearby'):
+            return self.place_repo.nearby(latitude, longitude, radius_km, limit)
+        # Fallback for InMemoryRepository: measure every place
+        matches = []
+        for place in self.place_repo.all("Place"):
+            if place.latitude is None or place.longitude is None:
+                continue
+            distance = haversine_km(latitude, longitude, place.latitude, place.longitude)
+            if distance <= radius_km:
+                matches.append((place, distance))
+        matches.sort(key=lambda match: (match[1], match[0].id))
+        return matches[:limit]
+
+    # Place attributes derived by the application, never set from input
+    PLACE_DERIVED_FIELDS = ("geohash", "review_count", "rating_count", "rating_sum",
+                            "avg_rating")
+
     def update_place(self, place_id, data):
         place = self.place_repo.get("Place", place_id)
         if not place:
             return None
+        self._validate_place_fields(data)
         for key, value in data.items():
-            if hasattr(place, key):
+            if hasattr(place, key) and key not in self.PLACE_DERIVED_FIELDS:
                 setattr(place, key, value)
         self.place_repo.save(place)
         return place
@@ -189,32 +473,177 @@ class HBnBFacade:
         if self.has_user_reviewed_place(user_id, place_id):
             raise ValueError("You have already reviewed this place")
 
+        self._validate_rating(data.get("rating"))
+        if data.get("rating") is None:
+            # Let the column default apply instead of inserting NULL
+            data = {k: v for k, v in data.items() if k != "rating"}
+
         review = Review(**data)
-        return self.review_repo.save(review)
+        place = self.place_repo.get("Place", place_id)
+        try:
+            # The review and the place aggregates commit together
+            with self.transaction():
+                self.review_repo.save(review)
+                place.add_review_stats(1, *self._rating_stats(review.rating))
+                self.place_repo.update(place)
+        except IntegrityError:
+            # A concurrent request won the race past the check above
+            raise ValueError("You have already reviewed this place")
+        return review
+
+    @staticmethod
+    def _string_ids(ids):
+        """Check that every ID is a string before it is hashed or bound in IN (...)."""
+        ids = list(ids)
+        if not all(isinstance(obj_id, str) for obj_id in ids):
+            raise ValueError("IDs must be strings")
+        return ids
+
+    @staticmethod
+    def _validate_rating(rating):
+        """Ratings are optional, but must be an integer from 1 to 5 when given."""
+        if rating is None:
+            return
+        if isinstance(rating, bool) or not isinstance(rating, int) or not 1 <= rating <= 5:
+            raise ValueError("Rating must be an integer between 1 and 5")
+
+    @staticmethod
+    def _rating_stats(rating):
+        """(rated reviews, rating sum) a review adds to its place's aggregates."""
+        return (1, rating) if rating else (0, 0)
+
+    def create_reviews_batch(self, items):
+        """
+        Create many reviews at once.
+        
+        Authors, places (with their owners) and already-reviewed pairs are
+        each resolved with one IN (...) query, then the valid items are
+        inserted together. Returns one {"index", "id"} or {"index", "error"}
+        entry per input item.
+        """
+        dicts = [item for item in items if isinstance(item, dict)]
+        # Other JSON values can't go into a set; those items fail below
+        user_ids = {item["user_id"] for item in dicts if isinstance(item.get("user_id"), str)}
+        place_ids = {item["place_id"] for item in dicts if isinstance(item.get("place_id"), str)}
+        known_users = self.user_repo.existing_values("User", "id", user_ids)
+        places = {p.id: p for p in self.place_repo.get_many("Place", place_ids)}
+        if hasattr(self.review_repo, 'existing_pairs'):
+            reviewed = self.review_repo.existing_pairs(known_users, places)
+        else:
+            reviewed = {(r.user_id, r.place_id) for r in self.review_repo.all("Review")}
+
+        results, reviews = [], []
+        for index, item in enumerate(items):
+            if not isinstance(item, dict):
+                results.append({"index": index, "error": "Item must be an object"})
+                continue
+            user_id, place_id = item.get("user_id"), item.get("place_id")
+            if not isinstance(user_id, str) or user_id not in known_users:
+                error = "Valid user_id is required"
+            elif not isinstance(place_id, str) or place_id not in places:
+                error = "Valid place_id is required"
+            elif not item.get("text"):
+                error = "Review text is required"
+            elif not isinstance(item["text"], str):
+                error = "Review text must be a string"
+            elif places[place_id].owner_id == user_id:
+                error = "You cannot review your own place"
+            elif (user_id, place_id) in reviewed:
+                error = "You have already reviewed this place"
+            else:
+                try:
+                    self._validate_rating(item.get("rating"))
+                    error = None
+                except ValueError as e:
+                    error = str(e)
+            if error:
+                results.append({"index": index, "error": error})
+                continue
+            reviewed.add((user_id, place_id))
+            review = Review(text=item["text"], rating=item.get("rating") or 0,
+                            user_id=user_id, place_id=place_id)
+            reviews.append(review)
+            results.append({"index": index, "id": review.id})
+
+        # One aggregate update per reviewed place, in the same transaction
+        deltas = {}
+        for review in reviews:
+            count, rated, total = deltas.get(review.place_id, (0, 0, 0))
+            review_rated, review_total = self._rating_stats(review.rating)
+            deltas[review.place_id] = (count + 1, rated + review_rated, total + review_total)
+        for place_id, (count, rated, total) in deltas.items():
+            places[place_id].add_review_stats(count, rated, total)
+        self._save_batch(self.review_repo, reviews,
+                         updated=[(self.place_repo, places[place_id]) for place_id in deltas])
+        return results
 
     def get_review(self, review_id):
         return self.review_repo.get("Review", review_id)
 
+    def get_reviews_by_ids(self, ids, fields=None):
+        """Return the reviews with the given IDs in one query, in the same order."""
+        return self.review_repo.get_many("Review", self._string_ids(ids), fields)
+
     def get_all_reviews(self):
         return self.review_repo.all("Review")
 
+    def get_reviews_page(self, limit, cursor=None, fields=None):
+        """Return one page of reviews and the cursor for the next one."""
+        return self.review_repo.paginate("Review", limit, cursor, fields)
+
+    def iter_reviews(self, fields=None):
+        """Iterate over every review in batches, for streaming exports."""
+        return self.review_repo.iter_all("Review", fields)
+
     def update_review(self, review_id, data):
         review = self.review_repo.get("Review", review_id)
         if not review:
             return None
-        if "text" in data:
-            review.text = data["text"]
-        self.review_repo.save(review)
+        with self.transaction():
+            if "text" in data:
+                review.text = data["text"]
+            if "rating" in data:
+                self._validate_rating(data["rating"])
+                # None removes the rating; the review stays counted
+                rating = data["rating"] or 0
+                if rating != review.rating:
+                    old_rated, old_total = self._rating_stats(review.rating)
+                    new_rated, new_total = self._rating_stats(rating)
+                    place = self.place_repo.get("Place", review.place_id)
+                    place.add_review_stats(0, new_rated - old_rated, new_total - old_total)
+                    self.place_repo.update(place)
+                    review.rating = rating
+            self.review_repo.save(review)
         return review
 
     def delete_review(self, review_id):
-        return self.review_repo.delete("Review", review_id)
+        review = self.review_repo.get("Review", review_id)
+        if not review:
+            return None
+        with self.transaction():
+            place = self.place_repo.get("Place", review.place_id)
+            if place:
+                rated, total = self._rating_stats(review.rating)
+                place.add_review_stats(-1, -rated, -total)
+                self.place_repo.update(place)
+            self.review_repo.delete("Review", review_id)
+        return review
 
     def get_reviews_by_place(self, place_id):
-        return [
+        return self.get_reviews_by_place_page(place_id, None)[0]
+
+    def get_reviews_by_place_page(self, place_id, limit, cursor=None, fields=None):
+        """Return one page of a place's reviews, newest first, and the next cursor."""
+        # Use repository's indexed by_place method if available (SQLAlchemy)
+        if hasattr(self.review_repo, 'by_place'):
+            return self.review_repo.by_place(place_id, limit, cursor, fields=fields)
+        # Fallback for InMemoryRepository
+        reviews = [
             r for r in self.review_repo.all("Review")
             if getattr(r, "place_id", None) == place_id
         ]
+        reviews.sort(key=lambda r: (r.created_at, r.id), reverse=True)
+        return reviews, None
     
     # -------------------------------
     # Authorization helper methods
@@ -231,6 +660,10 @@ class HBnBFacade:
     
     def has_user_reviewed_place(self, user_id, place_id):
         """Check if a user has already reviewed a specific place."""
+        # Use repository's indexed EXISTS query if available (SQLAlchemy)
+        if hasattr(self.review_repo, 'exists_for_user_and_place'):
+            return self.review_repo.exists_for_user_and_place(user_id, place_id)
+        # Fallback for InMemoryRepository
         reviews = self.review_repo.all("Review")
         for review in reviews:
             if (getattr(review, 'user_id', None) == user_id and 
@@ -12,9 +12,15 @@ class BaseModel(db.Model):
     __abstract__ = True  # This makes it an abstract base class
     
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    created_at = db.Column(db.DateTime, nullable=False, index=True, default=lambda: datetime.now(timezone.utc))
     updated_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
+    def __init__(self, **kwargs):
+        """Assign the id up front so it is known before the row is flushed."""
+        super().__init__(**kwargs)
+        if self.id is None:
+            self.id = str(uuid.uuid4())
+
     def to_dict(self):
         """Convert instance to dictionary."""
         return {
@@ -1,5 +1,8 @@
+from datetime import datetime, timezone
+from sqlalchemy import DDL, event, inspect
 from .base_model import BaseModel
 from app.extensions import db
+from app.utils.geo import geohash_encode
 
 # Association table for many-to-many relationship between Place and Amenity
 place_amenity = db.Table('place_amenity',
@@ -12,6 +15,11 @@ class Place(BaseModel):
     """Represents a place in the HBnB application."""
     
     __tablename__ = 'places'
+    __table_args__ = (
+        db.Index('idx_places_city_price', 'city', 'price'),
+        db.Index('idx_places_price', 'price'),
+        db.Index('idx_places_geohash', 'geohash'),
+    )
     
     name = db.Column(db.String(100), nullable=False)
     description = db.Column(db.String(500), nullable=True)
@@ -19,15 +27,58 @@ class Place(BaseModel):
     price = db.Column(db.Float, nullable=False, default=0.0)
     latitude = db.Column(db.Float, nullable=True)
     longitude = db.Column(db.Float, nullable=True)
+    # Derived from latitude/longitude on every insert/update (see below)
+    geohash = db.Column(db.String(12), nullable=True)
+    # Review aggregates, maintained incrementally by the facade. Ratings are
+    # optional: rating_count and rating_sum only cover rated reviews.
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     
     # Foreign key to User
     owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
     
+    # Columns behind computed fields, for partial loads (?fields=)
+    FIELD_COLUMNS = {'avg_rating': ('rating_count', 'rating_sum')}
+    
     # Relationships
     owner = db.relationship('User', backref='places')
     reviews = db.relationship('Review', backref='place', cascade='all, delete-orphan')
     amenities = db.relationship('Amenity', secondary=place_amenity, backref='places')
 
+    @property
+    def avg_rating(self):
+        """Average rating of the rated reviews, or None if there are none."""
+        if not self.rating_count:
+            return None
+        return round(self.rating_sum / self.rating_count, 2)
+
+    def add_review_stats(self, count_delta, rated_delta, rating_delta):
+        """
+        Adjust the review aggregates.
+        
+        On a place loaded from the database the new values are SQL
+        expressions, so the UPDATE is computed by the database and concurrent
+        reviews can't overwrite each other's change; the session is flushed
+        at once so the attributes read back as numbers. Other places (new,
+        detached or held by the in-memory repository) are updated in Python.
+        
+        Args:
+            count_delta: Change in the number of reviews
+            rated_delta: Change in the number of rated reviews
+            rating_delta: Change in the sum of their ratings
+        """
+        state = inspect(self)
+        if not state.persistent:
+            self.review_count = (self.review_count or 0) + count_delta
+            self.rating_count = (self.rating_count or 0) + rated_delta
+            self.rating_sum = (self.rating_sum or 0) + rating_delta
+            return
+        self.review_count = Place.review_count + count_delta
+        self.rating_count = Place.rating_count + rated_delta
+        self.rating_sum = Place.rating_sum + rating_delta
+        state.session.flush()
+
     def to_dict(self):
         """Convert place to dictionary."""
         data = super().to_dict()
@@ -39,6 +90,55 @@ class Place(BaseModel):
             "latitude": self.latitude,
             "longitude": self.longitude,
             "owner_id": self.owner_id,
+            "review_count": self.review_count,
+            "avg_rating": self.avg_rating,
             "amenities": [amenity.name for amenity in self.amenities] if self.amenities else []
         })
         return data
+
+
+@event.listens_for(Place, 'before_insert')
+@event.listens_for(Place, 'before_update')
+def _sync_geohash(mapper, connection, place):
+    """Keep the indexed geohash column in step with the coordinates."""
+    if place.latitude is None or place.longitude is None:
+        place.geohash = None
+    else:
+        place.geohash = geohash_encode(place.latitude, place.longitude)
+
+
+@event.listens_for(Place.amenities, 'append')
+@event.listens_for(Place.amenities, 'remove')
+def _touch_on_amenity_change(place, amenity, initiator):
+    """The payload lists the amenity ids, so the place is modified too."""
+    place.updated_at = datetime.now(timezone.utc)
+
+
+# Full-text index over places (SQLite FTS5), kept in sync by triggers so any
+# writer, ORM or raw SQL, updates it. It is an external-content table keyed
+# on places.rowid; VACUUM may renumber those rowids, so run
+# "python init_db.py --upgrade" afterwards to rebuild it.
+PLACES_FTS_DDL = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS places_fts USING fts5(
+        name, description, city, content='places', content_rowid='rowid'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS places_fts_ai AFTER INSERT ON places BEGIN
+        INSERT INTO places_fts(rowid, name, description, city)
+        VALUES (new.rowid, new.name, new.description, new.city);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS places_fts_ad AFTER DELETE ON places BEGIN
+        INSERT INTO places_fts(places_fts, rowid, name, description, city)
+        VALUES ('delete', old.rowid, old.name, old.description, old.city);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS places_fts_au AFTER UPDATE OF name, description, city ON places BEGIN
+        INSERT INTO places_fts(places_fts, rowid, name, description, city)
+        VALUES ('delete', old.rowid, old.name, old.description, old.city);
+        INSERT INTO places_fts(rowid, name, description, city)
+        VALUES (new.rowid, new.name, new.description, new.city);
+    END""",
+)
+
+for _statement in PLACES_FTS_DDL:
+    event.listen(Place.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(Place.__table__, 'before_drop',
+             DDL("DROP TABLE IF EXISTS places_fts").execute_if(dialect='sqlite'))
@@ -6,6 +6,13 @@ class Review(BaseModel):
     """Represents a review for a place."""
     
     __tablename__ = 'reviews'
+    __table_args__ = (
+        # One review per user and place; also indexes lookups by user_id
+        db.UniqueConstraint('user_id', 'place_id', name='uq_reviews_user_place'),
+        # Serves "reviews of a place, newest first" without a sort step;
+        # id is the tie-break of the keyset order
+        db.Index('idx_reviews_place_id', 'place_id', 'created_at', 'id'),
+    )
     
     text = db.Column(db.String(500), nullable=False)
     rating = db.Column(db.Integer, nullable=False, default=0)
@@ -17,6 +24,13 @@ class Review(BaseModel):
     # Relationships (backref already defined in User and Place models)
     user = db.relationship('User', backref='reviews')
 
+    @property
+    def author_name(self):
+        """Display name of the author, e.g. "Alice Johnson"."""
+        if self.user is None:
+            return None
+        return f"{self.user.first_name} {self.user.last_name}"
+
     def to_dict(self):
         """Convert review to dictionary."""
         data = super().to_dict()
@@ -0,0 +1,20 @@
+from datetime import datetime, timezone
+from app.extensions import db
+
+
+class RevokedToken(db.Model):
+    """
+    A revoked JWT, or every token of a user issued before revoked_at.
+
+    Rows with a jti revoke that one token; rows without one revoke all the
+    tokens of user_id issued before revoked_at. Either kind can be deleted
+    once expires_at has passed, as the tokens it covers have expired too.
+    """
+    
+    __tablename__ = 'revoked_tokens'
+    
+    id = db.Column(db.Integer, primary_key=True, autoincrement=True)
+    jti = db.Column(db.String(36), unique=True)
+    user_id = db.Column(db.String(36), index=True)
+    revoked_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    expires_at = db.Column(db.DateTime, nullable=False, index=True)
@@ -0,0 +1,12 @@
+from datetime import datetime, timezone
+from app.extensions import db
+
+
+class TableVersion(db.Model):
+    """Change counter of one table, bumped by every transaction writing to it."""
+    
+    __tablename__ = 'table_versions'
+    
+    name = db.Column(db.String(64), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+    updated_at = db.Column(db.DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
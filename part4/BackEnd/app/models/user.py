@@ -1,5 +1,6 @@
 from .base_model import BaseModel
-from app.extensions import bcrypt, db
+from app.extensions import db
+from app.services.password_hasher import password_hasher
 
 
 class User(BaseModel):
@@ -15,11 +16,15 @@ class User(BaseModel):
 
     def hash_password(self, password):
         """Hash the password before storing it."""
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password = password_hasher().hash(password)
 
     def verify_password(self, password):
         """Verify a password against the hashed password."""
-        return bcrypt.check_password_hash(self.password, password)
+        return password_hasher().verify(self.password, password)
+
+    def password_needs_rehash(self):
+        """True if the stored hash was made with another bcrypt cost than configured."""
+        return password_hasher().needs_rehash(self.password)
 
     def to_dict(self):
         """Convert user to dictionary, excluding password."""
@@ -0,0 +1,209 @@
+"""
+Read-through entity cache in front of the SQLAlchemy repositories.
+
+Entities are cached per process as detached snapshots of their column
+values and handed back to callers with session.merge(load=False), which
+attaches a copy to the current session without a database round trip. Writes through the repository evict the
+entry once their transaction commits (evicting earlier would let a
+concurrent reader cache the old row again); the TTL bounds staleness for
+writes made by other processes.
+"""
+import threading
+import time
+from collections import OrderedDict
+from flask import current_app
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+from app.extensions import db
+from app.persistence.unit_of_work import in_transaction
+
+# Key under which the (cache, id) pairs written by the current transaction
+# are collected in the session's info dict until it commits or rolls back
+_EVICT_KEY = 'hbnb_cache_evictions'
+
+
+class LRUCache:
+    """Thread-safe, size-bounded LRU cache whose entries expire after a TTL."""
+
+    def __init__(self, maxsize=1024, ttl=60):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """Return the cached value, or None if absent or expired."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] < now:
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key, value):
+        """Store a value, evicting the least recently used entry if full."""
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key):
+        """Drop a single entry."""
+        with self._lock:
+            if self._data.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def clear(self):
+        """Drop every entry."""
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        """Return the counters as a dict."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+def _snapshot(obj):
+    """
+    Build a detached copy of an ORM object holding only its column values.
+    
+    Relationships are left unloaded on purpose: they load lazily from the
+    caller's session, so a cached Place can't carry stale Amenity rows.
+    """
+    state = inspect(obj)
+    copy = state.mapper.class_manager.new_instance()
+    for attr in state.mapper.column_attrs:
+        set_committed_value(copy, attr.key, state.dict.get(attr.key))
+    make_transient_to_detached(copy)
+    return copy
+
+
+def _cacheable(obj):
+    """Only clean, persistent objects with every column loaded are cached."""
+    state = inspect(obj)
+    if state.modified or state.pending:
+        return False
+    # A partial load (?fields=) would otherwise cache None for the rest
+    return not state.unloaded.intersection(attr.key for attr in state.mapper.column_attrs)
+
+
+class CachedRepository:
+    """
+    Wrap a repository with a read-through cache on get().
+    
+    Every other method is delegated to the wrapped repository. Whether the
+    cache is used, its size and its TTL come from the ENTITY_CACHE setting
+    of the current app, keyed by entity type ('user', 'place', ...).
+    """
+
+    def __init__(self, repository, entity_type):
+        self.repository = repository
+        self.entity_type = entity_type
+        self._cache = None
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    def _settings(self):
+        return current_app.config.get('ENTITY_CACHE', {}).get(self.entity_type, {})
+
+    @property
+    def cache(self):
+        """The LRU cache, created on first use from the app configuration."""
+        if self._cache is None:
+            settings = self._settings()
+            self._cache = LRUCache(maxsize=settings.get('maxsize', 1024),
+                                   ttl=settings.get('ttl', 60))
+        return self._cache
+
+    def _enabled(self):
+        # Inside a unit of work the session may hold uncommitted rows that
+        # must never reach the shared cache, so bypass it entirely.
+        return self._settings().get('enabled', False) and not in_transaction()
+
+    def get(self, obj_type, obj_id):
+        """Return the object from the session, the cache or the database."""
+        if not self._enabled():
+            return self.repository.get(obj_type, obj_id)
+
+        # An instance already attached to this session wins: it may carry
+        # changes the cached snapshot doesn't have.
+        attached = db.session.identity_map.get(identity_key(self.repository.model, obj_id))
+        if attached is not None:
+            return attached
+
+        cached = self.cache.get(obj_id)
+        if cached is not None:
+            return db.session.merge(cached, load=False)
+
+        obj = self.repository.get(obj_type, obj_id)
+        if obj is not None and _cacheable(obj):
+            self.cache.put(obj_id, _snapshot(obj))
+        return obj
+
+    def save(self, obj):
+        self._invalidate(obj)
+        return self.repository.save(obj)
+
+    def save_all(self, objs):
+        for obj in objs:
+            self._invalidate(obj)
+        return self.repository.save_all(objs)
+
+    def update(self, obj):
+        self._invalidate(obj)
+        return self.repository.update(obj)
+
+    def delete(self, obj_type, obj_id):
+        self._evict_on_commit(obj_id)
+        return self.repository.delete(obj_type, obj_id)
+
+    def _invalidate(self, obj):
+        if getattr(obj, 'id', None) is not None:
+            self._evict_on_commit(obj.id)
+
+    def _evict_on_commit(self, obj_id):
+        """Drop the entry once the current transaction commits."""
+        if self._cache is not None:
+            db.session.info.setdefault(_EVICT_KEY, set()).add((self._cache, obj_id))
+
+    def cache_stats(self):
+        """Return hit/miss counters, or None if the cache was never used."""
+        return self._cache.stats() if self._cache is not None else None
+
+
+@event.listens_for(db.session, 'after_commit')
+def _evict_committed(session):
+    """Evict the entries of the objects written by the committed transaction."""
+    for cache, obj_id in session.info.pop(_EVICT_KEY, ()):
+        cache.invalidate(obj_id)
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_evictions(session):
+    """Nothing was written: the cached rows are still current."""
+    session.info.pop(_EVICT_KEY, None)
@@ -1,3 +1,6 @@
+from app.persistence.pagination import decode_cursor, encode_cursor, sort_key
+
+
 class InMemoryRepository:
     """Simple in-memory storage for models."""
 
@@ -20,6 +23,37 @@ class InMemoryRepository:
         """Return all objects of a given class."""
         return list(self.storage.get(cls_name, {}).values())
 
+    def paginate(self, cls_name, limit, cursor=None, fields=None):
+        """Return one page of objects ordered by (created_at, id); fields is ignored."""
+        objs = sorted(self.all(cls_name), key=sort_key)
+        if cursor:
+            position = decode_cursor(cursor)
+            objs = [obj for obj in objs if sort_key(obj) > position]
+        next_cursor = None
+        if len(objs) > limit:
+            next_cursor = encode_cursor(objs[limit - 1].created_at, objs[limit - 1].id)
+        return objs[:limit], next_cursor
+
+    def get_many(self, cls_name, obj_ids, fields=None):
+        """Retrieve several objects, in the order of obj_ids, skipping missing ones."""
+        cls_storage = self.storage.get(cls_name, {})
+        return [cls_storage[obj_id] for obj_id in dict.fromkeys(obj_ids) if obj_id in cls_storage]
+
+    def iter_all(self, cls_name, fields=None):
+        """Iterate over every object ordered by (created_at, id); fields is ignored."""
+        return iter(sorted(self.all(cls_name), key=sort_key))
+
+    def existing_values(self, cls_name, attr_name, values):
+        """Return the subset of values already used for an attribute."""
+        present = {getattr(obj, attr_name, None) for obj in self.all(cls_name)}
+        return {value for value in values if value is not None and value in present}
+
+    def save_all(self, objs):
+        """Save several objects."""
+        for obj in objs:
+            self.save(obj)
+        return objs
+
     def delete(self, cls_name, obj_id):
         """Delete an object by its id."""
         cls_storage = self.storage.get(cls_name, {})
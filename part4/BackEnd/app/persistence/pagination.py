@@ -0,0 +1,64 @@
+"""
+Cursor helpers for keyset pagination.
+
+A cursor encodes the sort value and id of the last object of a page so the
+next page can resume with an indexed range scan instead of an OFFSET.
+"""
+import base64
+import json
+from datetime import datetime, timezone
+
+
+def _naive_utc(value):
+    """Normalize a datetime to naive UTC, the form SQLite hands back."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def encode_cursor(value, obj_id):
+    """
+    Build an opaque cursor pointing just after the given position.
+
+    Args:
+        value: Sort column value of the last object of the page
+        obj_id: ID of the last object of the page (tie-breaker)
+
+    Returns:
+        URL-safe cursor string
+    """
+    if isinstance(value, datetime):
+        value = _naive_utc(value).isoformat()
+    raw = json.dumps([value, obj_id])
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, value_type=datetime):
+    """
+    Decode a cursor produced by encode_cursor.
+
+    Args:
+        cursor: The cursor string sent by the client
+        value_type: Python type of the sort column
+
+    Returns:
+        Tuple of (sort value, id)
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode('ascii')).decode('utf-8')
+        value, obj_id = json.loads(raw)
+        if value_type is datetime:
+            value = datetime.fromisoformat(value)
+        else:
+            value = value_type(value)
+        return value, str(obj_id)
+    except (ValueError, TypeError, UnicodeError):
+        raise ValueError("Invalid cursor")
+
+
+def sort_key(obj):
+    """Key used to order objects the same way the database does."""
+    return _naive_utc(obj.created_at), obj.id
@@ -1,7 +1,15 @@
 """
 Place-specific repository for database operations.
 """
-from app.models.place import Place
+import re
+import weakref
+from sqlalchemy import and_, func, inspect, or_, select, text, update
+from sqlalchemy.orm import selectinload
+from app.extensions import db
+from app.models.place import PLACES_FTS_DDL, Place
+from app.models.review import Review
+from app.persistence.pagination import decode_cursor, encode_cursor
+from app.utils.geo import covering_cells, haversine_km
 from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
 
 
@@ -14,3 +22,221 @@ class PlaceRepository(SQLAlchemyRepository):
     def __init__(self):
         """Initialize PlaceRepository with Place model."""
         super().__init__(Place)
+        # Whether each engine has the places_fts table, checked once per engine
+        self._fts_engines = weakref.WeakKeyDictionary()
+    
+    def _query(self, fields=None):
+        """
+        Load amenities for a whole page of places with one extra SELECT ... IN
+        query instead of one lazy load per place during serialization, unless
+        the caller asked for a set of fields without them.
+        """
+        query = super()._query(fields)
+        if fields is None or 'amenities' in fields:
+            query = query.options(selectinload(Place.amenities))
+        return query
+    
+    # Accepted values for the sort argument of search()
+    SORT_OPTIONS = {
+        'created_at': ('created_at', False),
+        'price': ('price', False),
+        '-price': ('price', True),
+    }
+    
+    def search(self, min_price=None, max_price=None, city=None, sort='created_at',
+               limit=None, cursor=None, fields=None):
+        """
+        Filter and sort places in a single SQL query.
+        
+        The city/price filters are served by the idx_places_city_price and
+        idx_places_price indexes declared on the Place model.
+        
+        Args:
+            min_price: Lowest price per night to include
+            max_price: Highest price per night to include
+            city: Exact city name to match
+            sort: One of 'created_at', 'price' or '-price'
+            limit: Maximum number of places to return, or None for all
+            cursor: Cursor returned with the previous page, or None
+            fields: Names of the fields to load, or None for all
+            
+        Returns:
+            Tuple of (list of places, next cursor or None)
+        """
+        query, column, descending = self._sorted_query(min_price, max_price, city, sort, fields)
+        return self._keyset_page(query, limit, cursor, sort_column=column, descending=descending)
+    
+    def iter_search(self, min_price=None, max_price=None, city=None, sort='created_at',
+                    fields=None):
+        """
+        Iterate over the places matching the filters of search(), in the
+        same order, in batches (see _stream).
+        
+        Returns:
+            Generator of places
+        """
+        query, column, descending = self._sorted_query(min_price, max_price, city, sort, fields)
+        return self._stream(query, sort_column=column, descending=descending)
+    
+    def _sorted_query(self, min_price, max_price, city, sort, fields):
+        """
+        Build the filtered query of search() and resolve its sort option.
+        
+        Returns:
+            Tuple of (query, sort column, descending)
+        
+        Raises:
+            ValueError: If sort is not one of SORT_OPTIONS
+        """
+        if sort not in self.SORT_OPTIONS:
+            raise ValueError(f"Invalid sort: {sort}")
+        column_name, descending = self.SORT_OPTIONS[sort]
+        if fields is not None:
+            # The sort column is needed to build the next cursor
+            fields = set(fields) | {column_name}
+        query = self._filtered(self._query(fields), min_price, max_price, city)
+        return query, getattr(Place, column_name), descending
+    
+    @staticmethod
+    def _filtered(query, min_price=None, max_price=None, city=None):
+        """Apply the city/price filters of search() to a query."""
+        if city:
+            query = query.filter(Place.city == city)
+        if min_price is not None:
+            query = query.filter(Place.price >= min_price)
+        if max_price is not None:
+            query = query.filter(Place.price <= max_price)
+        return query
+    
+    def nearby(self, latitude, longitude, radius_km, limit):
+        """
+        Find the places within a radius of a point, closest first.
+        
+        Candidates are selected with range scans on idx_places_geohash over
+        the geohash cells covering the circle, then filtered exactly with
+        the haversine distance.
+        
+        Args:
+            latitude: Latitude of the center, in degrees
+            longitude: Longitude of the center, in degrees
+            radius_km: Search radius in kilometres
+            limit: Maximum number of places to return
+            
+        Returns:
+            List of (place, distance_km) tuples sorted by distance
+        """
+        query = self._query().filter(Place.geohash.isnot(None))
+        cells = covering_cells(latitude, longitude, radius_km)
+        if cells is not None:
+            # '~' sorts after every geohash character, so each pair of
+            # bounds selects exactly the hashes starting with the prefix
+            query = query.filter(or_(*(
+                and_(Place.geohash >= cell, Place.geohash < cell + '~')
+                for cell in cells
+            )))
+        
+        matches = []
+        for place in query:
+            distance = haversine_km(latitude, longitude, place.latitude, place.longitude)
+            if distance <= radius_km:
+                matches.append((place, distance))
+        matches.sort(key=lambda match: (match[1], match[0].id))
+        return matches[:limit]
+    
+    def _has_fts(self):
+        """Return True if the current engine can serve FTS5 queries."""
+        engine = db.engine
+        if engine not in self._fts_engines:
+            self._fts_engines[engine] = (
+                engine.dialect.name == 'sqlite' and inspect(engine).has_table('places_fts')
+            )
+        return self._fts_engines[engine]
+    
+    def full_text_search(self, terms, limit=None, cursor=None, fields=None):
+        """
+        Search places by keyword in name, description and city.
+        
+        On SQLite the places_fts FTS5 index is queried and results are
+        ranked by BM25 (name matches weigh most). Other backends fall back
+        to case-insensitive LIKE matching, newest first. Every term must
+        match; the last one also matches as a prefix.
+        
+        Pages are keyset-paginated on (BM25 score, id), or (created_at, id)
+        for the fallback, instead of OFFSET. BM25 scores depend on the whole
+        index, so writes between two pages can still reorder the results.
+        
+        Args:
+            terms: The search string typed by the user
+            limit: Maximum number of places to return, or None for all
+            cursor: Cursor returned with the previous page, or None
+            fields: Names of the fields to load, or None for all
+            
+        Returns:
+            Tuple of (list of places, next cursor or None)
+        """
+        words = re.findall(r'\w+', terms)
+        if not words:
+            raise ValueError("Search query must contain at least one word")
+        
+        if not self._has_fts():
+            query = self._query(None if fields is None else set(fields) | {'created_at'})
+            for word in words:
+                pattern = "%" + word.replace("_", "\\_") + "%"
+                query = query.filter(or_(Place.name.ilike(pattern, escape="\\"),
+                                         Place.description.ilike(pattern, escape="\\"),
+                                         Place.city.ilike(pattern, escape="\\")))
+            return self._keyset_page(query, limit, cursor, descending=True)
+        
+        score, after_id = decode_cursor(cursor, float) if cursor else (None, None)
+        # Quote every word so user input can't inject FTS5 syntax
+        match = ' '.join(f'"{word}"' for word in words) + '*'
+        # Fetch one extra row to know whether there is a next page
+        rows = db.session.execute(text(
+            "SELECT id, score FROM ("
+            "  SELECT places.id AS id, bm25(places_fts, 3.0, 1.0, 2.0) AS score"
+            "  FROM places_fts JOIN places ON places.rowid = places_fts.rowid"
+            "  WHERE places_fts MATCH :match"
+            ") WHERE :score IS NULL OR score > :score OR (score = :score AND id > :after_id) "
+            "ORDER BY score, id LIMIT :fetch"
+        ), {"match": match, "score": score, "after_id": after_id,
+            "fetch": -1 if limit is None else limit + 1}).all()
+        
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(rows[-1].score, rows[-1].id)
+        return self.get_many("Place", [row.id for row in rows], fields), next_cursor
+    
+    def rebuild_search_index(self):
+        """Rebuild places_fts from the places table (SQLite only)."""
+        if db.engine.dialect.name != 'sqlite':
+            return
+        for statement in PLACES_FTS_DDL:
+            db.session.execute(text(statement))
+        db.session.execute(text("INSERT INTO places_fts(places_fts) VALUES ('rebuild')"))
+        db.session.commit()
+        self._fts_engines.pop(db.engine, None)
+    
+    def recompute_rating_stats(self):
+        """
+        Recompute review_count, rating_count and rating_sum of every place
+        from reviews; unrated reviews (rating 0) only count in review_count.
+        
+        Runs as one UPDATE with correlated subqueries served by the
+        idx_reviews_place_id index.
+        
+        Returns:
+            int: Number of places updated
+        """
+        of_place = Review.place_id == Place.id
+        count = select(func.count(Review.id)).where(of_place).scalar_subquery()
+        rated = select(func.count(Review.id)).where(of_place, Review.rating > 0).scalar_subquery()
+        total = select(func.coalesce(func.sum(Review.rating), 0)).where(
+            of_place, Review.rating > 0
+        ).scalar_subquery()
+        result = db.session.execute(
+            update(Place).values(review_count=count, rating_count=rated, rating_sum=total),
+            execution_options={"synchronize_session": False}
+        )
+        self._commit()
+        return result.rowcount
@@ -0,0 +1,126 @@
+"""
+Per-request SQL statistics.
+
+Cursor execute events on the app's engines count the statements run while
+handling a request and add up their time. The totals are sent back in a
+Server-Timing header (shown by browser dev tools next to the request) and
+written to the app's logger as one JSON line per request, which makes N+1
+query patterns easy to spot.
+
+Settings come from the QUERY_STATS config:
+{'enabled': bool, 'server_timing': bool, 'log': bool}. When disabled no
+event listener is registered at all, so it costs nothing.
+
+Statements run by a streamed response body happen after the headers have
+been sent and are not counted.
+
+The cursor timing itself is shared: time_statements() registers a single
+set of listeners per engine, and every feature that needs statement
+durations (these counters, the slow-query log) subscribes a callback to it,
+so each statement is timed once.
+"""
+import json
+import weakref
+from time import perf_counter
+from flask import g, has_request_context, request
+from sqlalchemy import event
+from app.extensions import db
+
+# Key under which the start times of the running statements are stacked
+# in the connection's info dict
+_START_KEY = 'hbnb_query_start'
+
+# engine -> callbacks receiving each statement's duration
+_subscribers = weakref.WeakKeyDictionary()
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault(_START_KEY, []).append(perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = perf_counter() - conn.info[_START_KEY].pop()
+    for callback in _subscribers.get(conn.engine, ()):
+        callback(conn, statement, parameters, executemany, elapsed)
+
+
+def _handle_error(exception_context):
+    connection = exception_context.connection
+    if connection is not None and connection.info.get(_START_KEY):
+        connection.info[_START_KEY].pop()
+
+
+def time_statements(engine, callback):
+    """
+    Call callback(conn, statement, parameters, executemany, seconds) after
+    every statement run on an engine.
+
+    The timing listeners are registered on the engine the first time only.
+    """
+    if engine not in _subscribers:
+        _subscribers[engine] = []
+        event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', _after_cursor_execute)
+        event.listen(engine, 'handle_error', _handle_error)
+    _subscribers[engine].append(callback)
+
+
+def _count_statement(conn, statement, parameters, executemany, elapsed):
+    if has_request_context() and 'query_count' in g:
+        g.query_count += 1
+        g.query_time += elapsed
+
+
+def _start_request():
+    g.query_count = 0
+    g.query_time = 0.0
+    g.request_start = perf_counter()
+
+
+def request_query_stats():
+    """Return (statements, seconds in the database) for the current request."""
+    return g.get('query_count', 0), g.get('query_time', 0.0)
+
+
+def init_query_stats(app):
+    """
+    Register the query counters on the app's engines and requests.
+
+    Args:
+        app: The Flask application, after db.init_app()
+    """
+    settings = app.config.get('QUERY_STATS', {})
+    if not settings.get('enabled', False):
+        return
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        time_statements(engine, _count_statement)
+
+    server_timing = settings.get('server_timing', True)
+    log = settings.get('log', True)
+
+    app.before_request(_start_request)
+
+    @app.after_request
+    def _report(response):
+        if 'request_start' not in g:
+            return response
+        count, db_time = request_query_stats()
+        total = perf_counter() - g.request_start
+        if server_timing:
+            response.headers.add(
+                'Server-Timing',
+                f'db;dur={db_time * 1000:.2f};desc="{count} queries", app;dur={total * 1000:.2f}'
+            )
+        if log:
+            app.logger.info(json.dumps({
+                "method": request.method,
+                "path": request.path,
+                "endpoint": request.endpoint,
+                "status": response.status_code,
+                "queries": count,
+                "db_ms": round(db_time * 1000, 3),
+                "total_ms": round(total * 1000, 3),
+            }))
+        return response
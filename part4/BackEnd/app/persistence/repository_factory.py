@@ -7,6 +7,7 @@ from app.persistence.user_repository import UserRepository
 from app.persistence.place_repository import PlaceRepository
 from app.persistence.review_repository import ReviewRepository
 from app.persistence.amenity_repository import AmenityRepository
+from app.persistence.entity_cache import CachedRepository
 
 
 def get_repository(repository_type='user', use_database=None):
@@ -17,7 +18,8 @@ def get_repository(repository_type='user', use_database=None):
         repository_type: Type of repository ('user', 'place', etc.)
         use_database: Boolean to determine repository type.
                      If None, checks USE_DATABASE environment variable.
-                     If True, returns SQLAlchemy-based repository.
+                     If True, returns SQLAlchemy-based repository
+                     behind a CachedRepository.
                      If False, returns InMemoryRepository.
     
     Returns:
@@ -29,14 +31,15 @@ def get_repository(repository_type='user', use_database=None):
     
     if use_database:
         # Return appropriate SQLAlchemy repository based on type
+        # Wrapped in a read-through cache, enabled per type by ENTITY_CACHE
         if repository_type == 'user':
-            return UserRepository()
+            return CachedRepository(UserRepository(), 'user')
         elif repository_type == 'place':
-            return PlaceRepository()
+            return CachedRepository(PlaceRepository(), 'place')
         elif repository_type == 'review':
-            return ReviewRepository()
+            return CachedRepository(ReviewRepository(), 'review')
         elif repository_type == 'amenity':
-            return AmenityRepository()
+            return CachedRepository(AmenityRepository(), 'amenity')
         # Fallback to InMemoryRepository for unknown types
         return InMemoryRepository()
     else:
@@ -21,3 +21,23 @@ class RepositoryInterface(ABC):
     @abstractmethod
     def all(self, obj_type):
         pass
+
+    @abstractmethod
+    def paginate(self, obj_type, limit, cursor=None, fields=None):
+        pass
+
+    @abstractmethod
+    def get_many(self, obj_type, obj_ids, fields=None):
+        pass
+
+    @abstractmethod
+    def iter_all(self, obj_type, fields=None):
+        pass
+
+    @abstractmethod
+    def existing_values(self, obj_type, attr_name, values):
+        pass
+
+    @abstractmethod
+    def save_all(self, objs):
+        pass
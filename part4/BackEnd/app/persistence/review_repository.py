@@ -1,6 +1,8 @@
 """
 Review-specific repository for database operations.
 """
+from sqlalchemy.orm import contains_eager
+from app.extensions import db
 from app.models.review import Review
 from app.persistence.sqlalchemy_repository import SQLAlchemyRepository
 
@@ -14,3 +16,62 @@ class ReviewRepository(SQLAlchemyRepository):
     def __init__(self):
         """Initialize ReviewRepository with Review model."""
         super().__init__(Review)
+    
+    def by_place(self, place_id, limit=None, cursor=None, with_authors=False, fields=None):
+        """
+        Retrieve the reviews of a place, most recent first.
+        
+        Served by the (place_id, created_at, id) index, in the keyset order
+        itself, so the cost depends on the size of the page rather than on
+        the size of the reviews table.
+        
+        Args:
+            place_id: The ID of the reviewed place
+            limit: Maximum number of reviews to return, or None for all
+            cursor: Cursor returned with the previous page, or None
+            with_authors: Join the authors in the same query so that
+                review.user needs no extra SELECT per review
+            fields: Names of the fields to load, or None for all
+            
+        Returns:
+            Tuple of (list of reviews, next cursor or None)
+        """
+        query = self._query(fields).filter(Review.place_id == place_id)
+        if with_authors:
+            query = query.join(Review.user).options(contains_eager(Review.user))
+        return self._keyset_page(query, limit, cursor, descending=True)
+    
+    def exists_for_user_and_place(self, user_id, place_id):
+        """
+        Check whether a user has already reviewed a place.
+        
+        Runs a single EXISTS query against the uq_reviews_user_place index.
+        
+        Args:
+            user_id: The ID of the author
+            place_id: The ID of the reviewed place
+            
+        Returns:
+            True if such a review exists, False otherwise
+        """
+        query = Review.query.filter_by(user_id=user_id, place_id=place_id)
+        return db.session.query(query.exists()).scalar()
+    
+    def existing_pairs(self, user_ids, place_ids):
+        """
+        Find the (user_id, place_id) pairs that already have a review.
+        
+        Args:
+            user_ids: Iterable of author IDs
+            place_ids: Iterable of place IDs
+            
+        Returns:
+            Set of (user_id, place_id) tuples
+        """
+        user_ids, place_ids = set(user_ids), set(place_ids)
+        if not user_ids or not place_ids:
+            return set()
+        rows = db.session.query(Review.user_id, Review.place_id).filter(
+            Review.user_id.in_(user_ids), Review.place_id.in_(place_ids)
+        )
+        return {(row.user_id, row.place_id) for row in rows}
@@ -0,0 +1,196 @@
+"""
+Slow-query log.
+
+Every statement run on the app's engines that takes longer than the
+configured threshold is written, as one JSON line, to a rotating log file:
+its SQL, the shape of its parameters (types only, never values), how long
+it took, the facade method (or endpoint) it came from and, on SQLite, the
+EXPLAIN QUERY PLAN output. A "SCAN <table>" step in the plan, as opposed to
+"SEARCH <table> USING INDEX", usually means an index is missing.
+
+Statements are also grouped by fingerprint (the SQL with literals and IN
+lists folded) in memory, for GET /api/v1/admin/slow-queries.
+
+Settings come from the SLOW_QUERY_LOG config:
+{'enabled': bool, 'threshold_ms': ms, 'path': file (default: in the
+instance folder), 'max_bytes': bytes per file, 'backup_count': files,
+'max_fingerprints': statements kept in memory}.
+"""
+import json
+import logging
+import os
+import re
+import sys
+import threading
+from datetime import datetime, timezone
+from functools import partial
+from logging.handlers import RotatingFileHandler
+from flask import current_app, has_request_context, request
+from app.extensions import db
+from app.persistence.query_stats import time_statements
+
+_EXPLAINABLE = re.compile(r'^\s*(SELECT|WITH|INSERT|UPDATE|DELETE)\b', re.IGNORECASE)
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*\?\s*,)*\s*\?\s*\)', re.IGNORECASE)
+_SPACES = re.compile(r'\s+')
+
+_FACADE_FILE = os.path.join('business', 'facade.py')
+
+
+def fingerprint(statement):
+    """The statement with literals replaced by ? and IN (?, ?, ...) folded."""
+    text = _STRING.sub('?', statement)
+    text = _NUMBER.sub('?', text)
+    text = _IN_LIST.sub('IN (...)', text)
+    return _SPACES.sub(' ', text).strip()
+
+
+def parameter_shape(parameters, executemany):
+    """Type names of the bound parameters, e.g. ['str', 'int']."""
+    if executemany:
+        rows = list(parameters)
+        return {"rows": len(rows), "row": parameter_shape(rows[0], False) if rows else []}
+    if isinstance(parameters, dict):
+        return {key: type(value).__name__ for key, value in parameters.items()}
+    return [type(value).__name__ for value in parameters or ()]
+
+
+def _caller():
+    """The facade method running the statement, else the request endpoint."""
+    frame = sys._getframe(2)
+    while frame is not None:
+        if frame.f_code.co_filename.endswith(_FACADE_FILE):
+            owner = frame.f_locals.get('self')
+            prefix = f"{type(owner).__name__}." if owner is not None else ""
+            return prefix + frame.f_code.co_name
+        frame = frame.f_back
+    if has_request_context():
+        return request.endpoint
+    return None
+
+
+def _explain(connection, statement, parameters, executemany):
+    """EXPLAIN QUERY PLAN lines on SQLite, else None."""
+    if connection.dialect.name != 'sqlite' or not _EXPLAINABLE.match(statement):
+        return None
+    if executemany:
+        parameters = next(iter(parameters), ())
+    # A separate DB-API cursor: the statement's own rows may not be fetched
+    # yet, and going through SQLAlchemy would fire these events again
+    cursor = connection.connection.cursor()
+    try:
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        rows = cursor.fetchall()
+    except Exception as exc:
+        return [f"(EXPLAIN failed: {exc})"]
+    finally:
+        cursor.close()
+    depth = {0: -1}
+    plan = []
+    for node, parent, _, detail in rows:
+        depth[node] = depth.get(parent, -1) + 1
+        plan.append("  " * depth[node] + detail)
+    return plan
+
+
+class SlowQueryLog:
+    """Slow statements, written to a rotating file and grouped by fingerprint."""
+
+    def __init__(self, path, threshold_ms=100, max_bytes=1024 * 1024, backup_count=5,
+                 max_fingerprints=500):
+        self.threshold = threshold_ms / 1000
+        self.max_fingerprints = max_fingerprints
+        self._stats = {}
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._handler = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backup_count,
+                                            encoding='utf-8', delay=True)
+        # A private logger, so several apps (tests) never share handlers
+        self._logger = logging.Logger('hbnb.slow_queries', logging.INFO)
+        self._logger.addHandler(self._handler)
+        self.path = path
+
+    def record(self, statement, shape, duration, caller, plan):
+        """Log one slow statement and add it to its fingerprint's totals."""
+        key = fingerprint(statement)
+        self._logger.info(json.dumps({
+            "at": datetime.now(timezone.utc).isoformat(),
+            "duration_ms": round(duration * 1000, 3),
+            "caller": caller,
+            "sql": statement,
+            "parameters": shape,
+            "plan": plan,
+        }))
+        with self._lock:
+            entry = self._stats.get(key)
+            if entry is None:
+                if len(self._stats) >= self.max_fingerprints:
+                    # Forget the fingerprint that cost the least so far
+                    del self._stats[min(self._stats, key=lambda k: self._stats[k]['total'])]
+                entry = self._stats[key] = {'count': 0, 'total': 0.0, 'max': 0.0,
+                                            'callers': set(), 'plan': None}
+            entry['count'] += 1
+            entry['total'] += duration
+            entry['max'] = max(entry['max'], duration)
+            if caller:
+                entry['callers'].add(caller)
+            entry['plan'] = plan
+
+    def top(self, limit=20, sort='total'):
+        """The slowest fingerprints, by total, max or mean time, or count."""
+        with self._lock:
+            rows = [{
+                "fingerprint": key,
+                "count": entry['count'],
+                "total_ms": round(entry['total'] * 1000, 3),
+                "mean_ms": round(entry['total'] / entry['count'] * 1000, 3),
+                "max_ms": round(entry['max'] * 1000, 3),
+                "callers": sorted(entry['callers']),
+                "plan": entry['plan'],
+                "full_scan": any(step.strip().startswith('SCAN ')
+                                 for step in entry['plan'] or ()),
+            } for key, entry in self._stats.items()]
+        rows.sort(key=lambda row: row[f"{sort}_ms" if sort != 'count' else 'count'],
+                  reverse=True)
+        return rows[:limit]
+
+    def close(self):
+        self._handler.close()
+
+
+def _record_if_slow(slow_log, conn, statement, parameters, executemany, elapsed):
+    if elapsed < slow_log.threshold:
+        return
+    slow_log.record(statement, parameter_shape(parameters, executemany), elapsed, _caller(),
+                    _explain(conn, statement, parameters, executemany))
+
+
+def init_slow_query_log(app):
+    """
+    Register the slow-query log on the app's engines.
+
+    Args:
+        app: The Flask application, after db.init_app()
+    """
+    settings = app.config.get('SLOW_QUERY_LOG', {})
+    if not settings.get('enabled', False):
+        return
+    slow_log = SlowQueryLog(
+        settings.get('path') or os.path.join(app.instance_path, 'slow_queries.log'),
+        threshold_ms=settings.get('threshold_ms', 100),
+        max_bytes=settings.get('max_bytes', 1024 * 1024),
+        backup_count=settings.get('backup_count', 5),
+        max_fingerprints=settings.get('max_fingerprints', 500),
+    )
+    app.extensions['slow_query_log'] = slow_log
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        time_statements(engine, partial(_record_if_slow, slow_log))
+
+
+def slow_queries(limit=20, sort='total'):
+    """Top slow statement fingerprints of the current app ([] when disabled)."""
+    slow_log = current_app.extensions.get('slow_query_log')
+    return slow_log.top(limit, sort) if slow_log is not None else []
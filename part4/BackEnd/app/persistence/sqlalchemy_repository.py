@@ -2,8 +2,14 @@
 SQLAlchemy-based repository implementation.
 This repository uses SQLAlchemy for database persistence.
 """
+from flask import current_app
+from sqlalchemy import and_, inspect, or_
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import load_only
 from app.extensions import db
+from app.persistence.pagination import decode_cursor, encode_cursor
 from app.persistence.repository_interface import RepositoryInterface
+from app.persistence.unit_of_work import in_transaction
 
 
 class SQLAlchemyRepository(RepositoryInterface):
@@ -23,18 +29,71 @@ class SQLAlchemyRepository(RepositoryInterface):
         """
         self.model = model_class
     
+    def _query(self, fields=None):
+        """
+        Base query used by every read method.
+        
+        Subclasses override this to attach loader options (eager loading).
+        
+        Args:
+            fields: Names of the fields the caller will read, or None for
+                all of them; other columns are left out of the SELECT
+        """
+        query = self.model.query
+        if fields is not None:
+            query = query.options(load_only(*self._columns_for(fields)))
+        return query
+    
+    def _columns_for(self, fields):
+        """
+        Map requested field names to the column attributes to load.
+        
+        id and created_at are always loaded (identity and pagination key).
+        Computed fields listed in the model's FIELD_COLUMNS mapping pull in
+        the columns they are derived from; unknown names are ignored.
+        """
+        derived = getattr(self.model, 'FIELD_COLUMNS', {})
+        names = {'id', 'created_at'}
+        for field in fields:
+            names.add(field)
+            names.update(derived.get(field, ()))
+        columns = inspect(self.model).column_attrs
+        return [getattr(self.model, name) for name in sorted(names) if name in columns]
+    
+    def _commit(self):
+        """
+        Commit the session unless a unit of work is in progress.
+        
+        Raises:
+            IntegrityError: If a database constraint is violated; the
+                session is rolled back before re-raising
+        """
+        if in_transaction():
+            return
+        try:
+            db.session.commit()
+        except IntegrityError:
+            db.session.rollback()
+            raise
+    
     def save(self, obj):
         """
         Save or update an object in the database.
         
+        Inside a unit of work the commit is deferred to the end of the block.
+        
         Args:
             obj: The object to save
             
         Returns:
             The saved object
+            
+        Raises:
+            IntegrityError: If a database constraint is violated; the
+                session is rolled back before re-raising
         """
         db.session.add(obj)
-        db.session.commit()
+        self._commit()
         return obj
     
     def get(self, obj_type, obj_id):
@@ -50,7 +109,7 @@ class SQLAlchemyRepository(RepositoryInterface):
         """
         # For now, obj_type is passed but we use self.model
         # In a multi-model setup, you'd map obj_type to the correct model
-        return self.model.query.get(obj_id)
+        return self._query().get(obj_id)
     
     def all(self, obj_type):
         """
@@ -62,7 +121,101 @@ class SQLAlchemyRepository(RepositoryInterface):
         Returns:
             List of all objects of the specified type
         """
-        return self.model.query.all()
+        return self._query().all()
+    
+    def paginate(self, obj_type, limit, cursor=None, fields=None):
+        """
+        Retrieve one page of objects using keyset pagination.
+        
+        Objects are ordered by (created_at, id), so pages stay stable while
+        new rows are inserted and each page is a single indexed range scan.
+        
+        Args:
+            obj_type: The class name (string) of the objects
+            limit: Maximum number of objects to return
+            cursor: Cursor returned with the previous page, or None
+            fields: Names of the fields to load, or None for all
+            
+        Returns:
+            Tuple of (list of objects, next cursor or None)
+        """
+        return self._keyset_page(self._query(fields), limit, cursor)
+    
+    def iter_all(self, obj_type, fields=None):
+        """
+        Iterate over every object without loading them all at once.
+        
+        Args:
+            obj_type: The class name (string) of the objects
+            fields: Names of the fields to load, or None for all
+            
+        Returns:
+            Generator of objects ordered by (created_at, id)
+        """
+        return self._stream(self._query(fields))
+    
+    def _stream(self, query, sort_column=None, descending=False):
+        """
+        Run a query in batches of STREAM_BATCH_SIZE rows.
+        
+        Each batch is the next keyset page on (sort_column, id), created_at
+        unless another column is given (see _keyset_page): an indexed
+        range scan whose eager loads run for that batch only. Rows of
+        earlier batches are not referenced any more, so memory stays
+        bounded by the batch size rather than by the size of the table.
+        (ORM yield_per is not used: SQLAlchemy rejects it together with the
+        amenities eager load of PlaceRepository._query().)
+        """
+        batch_size = current_app.config.get('STREAM_BATCH_SIZE', 500)
+        cursor = None
+        while True:
+            items, cursor = self._keyset_page(query, batch_size, cursor,
+                                              sort_column=sort_column, descending=descending)
+            yield from items
+            if cursor is None:
+                return
+    
+    def _keyset_page(self, query, limit, cursor=None, sort_column=None, descending=False):
+        """
+        Apply keyset pagination on (sort_column, id) to a query.
+        
+        Args:
+            query: The base query to paginate
+            limit: Maximum number of objects to return, or None for all
+            cursor: Cursor returned with the previous page, or None
+            sort_column: Column to order by (defaults to created_at)
+            descending: Whether to walk the sort column downwards
+            
+        Returns:
+            Tuple of (list of objects, next cursor or None)
+        """
+        column = sort_column if sort_column is not None else self.model.created_at
+        if cursor:
+            value, obj_id = decode_cursor(cursor, column.type.python_type)
+            if descending:
+                query = query.filter(or_(
+                    column < value,
+                    and_(column == value, self.model.id < obj_id)
+                ))
+            else:
+                query = query.filter(or_(
+                    column > value,
+                    and_(column == value, self.model.id > obj_id)
+                ))
+        if descending:
+            query = query.order_by(column.desc(), self.model.id.desc())
+        else:
+            query = query.order_by(column, self.model.id)
+        if limit is None:
+            return query.all(), None
+        
+        items = query.limit(limit + 1).all()
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = encode_cursor(getattr(last, column.key), last.id)
+        return items, next_cursor
     
     def delete(self, obj_type, obj_id):
         """
@@ -78,9 +231,65 @@ class SQLAlchemyRepository(RepositoryInterface):
         obj = self.get(obj_type, obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            self._commit()
         return obj
     
+    def get_many(self, obj_type, obj_ids, fields=None):
+        """
+        Retrieve several objects with a single WHERE id IN (...) query.
+        
+        Args:
+            obj_type: The class name (string) of the objects
+            obj_ids: Iterable of IDs
+            fields: Names of the fields to load, or None for all
+            
+        Returns:
+            List of the objects found, in the order of obj_ids
+            (missing IDs are skipped)
+        """
+        obj_ids = list(dict.fromkeys(obj_ids))
+        if not obj_ids:
+            return []
+        found = {obj.id: obj for obj in self._query(fields).filter(self.model.id.in_(obj_ids))}
+        return [found[obj_id] for obj_id in obj_ids if obj_id in found]
+    
+    def existing_values(self, obj_type, attr_name, values):
+        """
+        Find which of the given values already exist for an attribute.
+        
+        Only the attribute column is selected, in a single IN (...) query.
+        
+        Args:
+            obj_type: The class name (string) of the objects
+            attr_name: The attribute/column name (e.g. 'id', 'name')
+            values: Iterable of values to look up
+            
+        Returns:
+            Set of the values present in the database
+        """
+        values = {value for value in values if value is not None}
+        if not values:
+            return set()
+        column = getattr(self.model, attr_name)
+        rows = db.session.query(column).filter(column.in_(values))
+        return {row[0] for row in rows}
+    
+    def save_all(self, objs):
+        """
+        Insert or update several objects with a single commit.
+        
+        New objects are written with batched INSERT statements.
+        
+        Args:
+            objs: List of objects to save
+            
+        Returns:
+            The saved objects
+        """
+        db.session.add_all(objs)
+        self._commit()
+        return objs
+    
     def get_by_attribute(self, attr_name, attr_value):
         """
         Retrieve an object by a specific attribute.
@@ -92,7 +301,7 @@ class SQLAlchemyRepository(RepositoryInterface):
         Returns:
             The first object matching the criteria, None otherwise
         """
-        return self.model.query.filter_by(**{attr_name: attr_value}).first()
+        return self._query().filter_by(**{attr_name: attr_value}).first()
     
     def update(self, obj):
         """
@@ -104,5 +313,5 @@ class SQLAlchemyRepository(RepositoryInterface):
         Returns:
             The updated object
         """
-        db.session.commit()
+        self._commit()
         return obj
@@ -0,0 +1,37 @@
+"""
+SQLite performance profile.
+
+Applies the PRAGMAs from the SQLITE_PRAGMAS setting to every new SQLite
+connection through a SQLAlchemy "connect" event. Other backends are left
+untouched.
+"""
+from functools import partial
+from sqlalchemy import event
+from app.extensions import db
+
+
+def _apply_pragmas(pragmas, dbapi_connection, connection_record):
+    """Run each PRAGMA on a freshly opened DB-API connection."""
+    cursor = dbapi_connection.cursor()
+    try:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+    finally:
+        cursor.close()
+
+
+def init_sqlite_profile(app):
+    """
+    Register the SQLite PRAGMA profile on the app's engines.
+    
+    Args:
+        app: The Flask application, after db.init_app()
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS')
+    if not pragmas:
+        return
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        if engine.dialect.name == 'sqlite':
+            event.listen(engine, 'connect', partial(_apply_pragmas, dict(pragmas)))
@@ -0,0 +1,133 @@
+"""
+Per-table version counters.
+
+Every flush that inserts, updates or deletes ORM objects, and every ORM
+bulk UPDATE/DELETE, increments the counter of the tables involved in the
+same transaction, so the new version becomes visible exactly when the
+data does (and disappears with it on rollback). Readers compare versions
+to tell whether a table changed, e.g. to build collection ETags.
+
+Each process also keeps local counters, bumped after a commit for the
+tables that commit wrote to. They cost nothing to read and back the
+in-process response cache; they don't see other processes' writes.
+
+Raw SQL writes (sql/data.sql, sqlite3 shell) bypass the counters.
+"""
+import threading
+from datetime import datetime, timezone
+from sqlalchemy import event, insert, select, update
+from app.extensions import db
+from app.models.table_version import TableVersion
+
+_versions = TableVersion.__table__
+
+# Key under which the tables written by the current transaction are
+# collected in the session's info dict until it commits or rolls back
+_CHANGED_KEY = 'hbnb_changed_tables'
+# Tables noted by before_flush, bumped by after_flush once the flush went through
+_FLUSHING_KEY = 'hbnb_flushing_tables'
+
+_local_versions = {}
+_local_lock = threading.Lock()
+
+
+def _bump(connection, names):
+    """Increment the counters of the given tables on a connection."""
+    now = datetime.now(timezone.utc)
+    for name in sorted(names):
+        result = connection.execute(
+            update(_versions).where(_versions.c.name == name)
+            .values(version=_versions.c.version + 1, updated_at=now)
+        )
+        if result.rowcount == 0:
+            connection.execute(insert(_versions).values(name=name, version=1, updated_at=now))
+
+
+@event.listens_for(db.session, 'before_flush')
+def _collect_flushed_tables(session, flush_context, instances):
+    """
+    Note the tables of the objects this flush will write.
+
+    This runs before the flush because attributes assigned a SQL
+    expression (e.g. Place.review_count + 1) are expired once their UPDATE
+    is emitted, and is_modified() no longer sees them afterwards.
+    """
+    names = {
+        obj.__table__.name
+        for obj in (*session.new, *session.dirty, *session.deleted)
+        if session.is_modified(obj) or obj not in session.dirty
+    }
+    if names:
+        session.info.setdefault(_FLUSHING_KEY, set()).update(names)
+
+
+@event.listens_for(db.session, 'after_flush')
+def _bump_flushed_tables(session, flush_context):
+    """Bump the tables of the objects written by this flush."""
+    names = session.info.pop(_FLUSHING_KEY, None)
+    if names:
+        _bump(session.connection(), names)
+        session.info.setdefault(_CHANGED_KEY, set()).update(names)
+
+
+@event.listens_for(db.session, 'do_orm_execute')
+def _bump_bulk_write(orm_execute_state):
+    """Bump the table targeted by an ORM bulk UPDATE or DELETE."""
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) \
+            and orm_execute_state.bind_mapper is not None:
+        session = orm_execute_state.session
+        names = {orm_execute_state.bind_mapper.local_table.name}
+        _bump(session.connection(), names)
+        session.info.setdefault(_CHANGED_KEY, set()).update(names)
+
+
+@event.listens_for(db.session, 'after_commit')
+def _bump_local_versions(session):
+    """Publish the tables written by the committed transaction locally."""
+    names = session.info.pop(_CHANGED_KEY, None)
+    if names:
+        with _local_lock:
+            for name in names:
+                _local_versions[name] = _local_versions.get(name, 0) + 1
+
+
+@event.listens_for(db.session, 'after_rollback')
+def _forget_changes(session):
+    """Nothing was written after all."""
+    session.info.pop(_CHANGED_KEY, None)
+    session.info.pop(_FLUSHING_KEY, None)
+
+
+def local_versions(names):
+    """
+    Return this process's counters for some tables, in the given order.
+    
+    Args:
+        names: Iterable of table names
+        
+    Returns:
+        tuple: One counter per name (0 for tables not written yet)
+    """
+    with _local_lock:
+        return tuple(_local_versions.get(name, 0) for name in names)
+
+
+def get_versions(names):
+    """
+    Read the current version of some tables.
+    
+    Args:
+        names: Iterable of table names
+        
+    Returns:
+        dict: {name: (version, updated_at)}; tables never written have
+        version 0 and updated_at None
+    """
+    names = sorted(set(names))
+    rows = db.session.execute(
+        select(_versions.c.name, _versions.c.version, _versions.c.updated_at)
+        .where(_versions.c.name.in_(names))
+    )
+    versions = {name: (0, None) for name in names}
+    versions.update({row.name: (row.version, row.updated_at) for row in rows})
+    return versions
@@ -0,0 +1,40 @@
+"""
+Unit-of-work support for the SQLAlchemy repositories.
+
+Inside a transaction() block, repository writes are only flushed to the
+session; a single commit is issued when the outermost block exits.
+"""
+from contextlib import contextmanager
+from app.extensions import db
+
+# Key under which the nesting depth is stored in the session's info dict.
+# The session is scoped per app context, so each request/thread has its own.
+_DEPTH_KEY = 'hbnb_uow_depth'
+
+
+def in_transaction():
+    """Return True if the current session is inside a transaction() block."""
+    return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+
+@contextmanager
+def transaction():
+    """
+    Postpone repository commits until the block exits.
+    
+    Nested blocks join the outermost one. On error everything done in the
+    outermost block is rolled back and the exception is re-raised.
+    """
+    info = db.session.info
+    depth = info.get(_DEPTH_KEY, 0)
+    info[_DEPTH_KEY] = depth + 1
+    try:
+        yield
+        if depth == 0:
+            db.session.commit()
+    except Exception:
+        if depth == 0:
+            db.session.rollback()
+        raise
+    finally:
+        info[_DEPTH_KEY] = depth
@@ -0,0 +1,233 @@
+"""
+Password hashing service.
+
+bcrypt is slow on purpose, so hashing and checking passwords inline ties
+up the request thread (and, for CPU-bound work, the GIL) for the whole
+computation. The hasher runs bcrypt in a bounded process pool instead.
+At most `max_pending` calls may be queued or running; a caller that cannot
+get a slot within `timeout` seconds gets PasswordHasherBusy, which the API
+turns into a 503, rather than piling up behind a login burst.
+
+Hashes are the ones Flask-Bcrypt produces (same prefix, same encoding,
+same BCRYPT_HANDLE_LONG_PASSWORDS option), so existing passwords keep
+working. The cost factor comes from BCRYPT_LOG_ROUNDS; a hash made with a
+different cost still verifies, and needs_rehash() tells the caller to
+replace it.
+
+The workers are started with the forkserver method (spawn where it is not
+available), never by forking the server process: a fork taken while
+request threads, the connection pool or the profiler thread hold a lock
+would leave the child deadlocked on it.
+
+The pool only exists once start() is called, which run.py does for the app
+it serves. Until then hashes run on the calling thread. Worker processes
+re-import the __main__ module, so a script that created an app and hashed
+passwords at import time would otherwise start a pool from inside a worker
+and fail; scripts (seed_data.py, init_db.py, ad-hoc ones) therefore never
+spawn workers, __main__ guard or not.
+
+Settings come from the PASSWORD_HASHER config:
+{'workers': processes (0 = hash on the calling thread), 'max_pending': calls,
+ 'timeout': s}.
+"""
+import hashlib
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from flask import current_app
+import bcrypt
+
+
+class PasswordHasherBusy(RuntimeError):
+    """Raised when too many hashing calls are already queued."""
+
+
+def _encode(password, handle_long_passwords):
+    """Password bytes exactly as Flask-Bcrypt feeds them to bcrypt."""
+    password = password.encode('utf-8') if isinstance(password, str) else password
+    if handle_long_passwords:
+        password = hashlib.sha256(password).hexdigest().encode('utf-8')
+    return password
+
+
+def _hash(password, rounds, prefix, handle_long_passwords):
+    salt = bcrypt.gensalt(rounds=rounds, prefix=prefix.encode('utf-8'))
+    return bcrypt.hashpw(_encode(password, handle_long_passwords), salt).decode('utf-8')
+
+
+def _check(hashed, password, handle_long_passwords):
+    try:
+        return bcrypt.checkpw(_encode(password, handle_long_passwords), hashed.encode('utf-8'))
+    except ValueError:
+        # Not a bcrypt hash: it cannot match anything
+        return False
+
+
+def _mp_context():
+    """forkserver (started from a clean interpreter) where available, else spawn."""
+    if 'forkserver' not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context('spawn')
+    context = multiprocessing.get_context('forkserver')
+    # The server only needs bcrypt; by default it would also import the
+    # __main__ module (run.py), which creates a whole app
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _in_worker():
+    """
+    True in a worker process, including while it imports the __main__
+    module (e.g. run.py, which creates an app) before running any task:
+    starting a pool from there would fail.
+    """
+    return (multiprocessing.parent_process() is not None
+            or getattr(multiprocessing.current_process(), '_inheriting', False))
+
+
+def hash_rounds(hashed):
+    """Cost factor of a bcrypt hash ("$2b$12$..." -> 12), or None."""
+    parts = (hashed or '').split('$')
+    if len(parts) < 4 or not parts[2].isdigit():
+        return None
+    return int(parts[2])
+
+
+class PasswordHasher:
+    """bcrypt in a bounded process pool, with queue-depth counters."""
+
+    def __init__(self, rounds=12, prefix='2b', handle_long_passwords=False,
+                 workers=2, max_pending=32, timeout=5.0):
+        self.rounds = rounds
+        self.prefix = prefix
+        self.handle_long_passwords = handle_long_passwords
+        self.workers = workers
+        self.max_pending = max_pending
+        self.timeout = timeout
+        self._slots = threading.BoundedSemaphore(max_pending)
+        self._lock = threading.Lock()
+        self._executor = None
+        self._started = False
+        self.pending = 0
+        self.peak_pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    def hash(self, password):
+        """Hash a password with the configured cost."""
+        if not password:
+            raise ValueError('Password must be non-empty.')
+        return self._run(_hash, password, self.rounds, self.prefix, self.handle_long_passwords)
+
+    def verify(self, hashed, password):
+        """Check a password against a stored hash."""
+        if not hashed or not password:
+            return False
+        return self._run(_check, hashed, password, self.handle_long_passwords)
+
+    def needs_rehash(self, hashed):
+        """True if a valid hash was made with another cost than the configured one."""
+        rounds = hash_rounds(hashed)
+        return rounds is not None and rounds != self.rounds
+
+    def _run(self, func, *args):
+        if not self._slots.acquire(timeout=self.timeout):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy("Too many password checks in progress, retry later")
+        with self._lock:
+            self.pending += 1
+            self.peak_pending = max(self.peak_pending, self.pending)
+        try:
+            result = self._submit(func, args) if self._started else func(*args)
+        except Exception:
+            with self._lock:
+                self.failed += 1
+            raise
+        finally:
+            with self._lock:
+                self.pending -= 1
+            self._slots.release()
+        with self._lock:
+            self.completed += 1
+        return result
+
+    def _submit(self, func, args):
+        try:
+            return self._pool().submit(func, *args).result()
+        except BrokenProcessPool:
+            # A worker died; start a fresh pool for the next call
+            with self._lock:
+                self._executor = None
+            raise
+
+    def _pool(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                     mp_context=_mp_context())
+            return self._executor
+
+    def start(self):
+        """
+        Hash in worker processes from now on, and start them at once.
+
+        Does nothing without workers, or inside a worker process itself
+        (while it re-imports the __main__ module, e.g. run.py).
+        """
+        if not self.workers or _in_worker():
+            return
+        pool = self._pool()
+        for future in [pool.submit(int) for _ in range(self.workers)]:
+            future.result()
+        self._started = True
+
+    def shutdown(self):
+        """Stop the worker processes; later calls hash on the calling thread."""
+        with self._lock:
+            self._started = False
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def stats(self):
+        """Return the counters as a dict."""
+        with self._lock:
+            return {
+                "rounds": self.rounds,
+                "workers": self.workers,
+                "max_pending": self.max_pending,
+                "pending": self.pending,
+                "queued": max(0, self.pending - self.workers) if self.workers else 0,
+                "peak_pending": self.peak_pending,
+                "completed": self.completed,
+                "failed": self.failed,
+                "rejected": self.rejected,
+            }
+
+
+def init_password_hasher(app):
+    """
+    Create the app's password hasher from its configuration. Its workers
+    are started by whoever serves the app (see start()).
+    """
+    settings = app.config.get('PASSWORD_HASHER', {})
+    app.extensions['password_hasher'] = PasswordHasher(
+        rounds=app.config.get('BCRYPT_LOG_ROUNDS', 12),
+        prefix=app.config.get('BCRYPT_HASH_PREFIX', '2b'),
+        handle_long_passwords=app.config.get('BCRYPT_HANDLE_LONG_PASSWORDS', False),
+        workers=settings.get('workers', 2),
+        max_pending=settings.get('max_pending', 32),
+        timeout=settings.get('timeout', 5.0),
+    )
+
+
+def password_hasher_busy(error):
+    """API error handler: a saturated hasher is a temporary 503."""
+    return {"message": str(error)}, 503, {"Retry-After": "1"}
+
+
+def password_hasher():
+    """Return the password hasher of the current app."""
+    return current_app.extensions['password_hasher']
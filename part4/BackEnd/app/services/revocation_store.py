@@ -0,0 +1,248 @@
+"""
+Revoked JWT store.
+
+Revocations are persisted in the revoked_tokens table, so they survive
+restarts and reach every process, but every request carrying a token asks
+whether it was revoked, and that check must not cost a query. Each process
+keeps in memory:
+
+- a Bloom filter of the revoked token IDs (jti) read from the table; a
+  token it has never seen, the common case, is accepted without any I/O;
+- a small exact set of the tokens revoked by this process since the filter
+  was built, and of the filter's hits confirmed by the table;
+- the per-user cutoffs ("every token issued before t is revoked").
+
+Only a Bloom filter hit that is not in the exact set (a false positive, at
+about error_rate) is checked against the table. The filter and cutoffs are
+rebuilt from the table every rebuild_interval seconds, which is how a
+revocation made by another process reaches this one. Until the first
+rebuild has finished every check waits for it, since an empty filter would
+accept revoked tokens. Later rebuilds run on a background thread; requests
+keep using the current filter until the new one is swapped in.
+
+Settings come from the TOKEN_BLOCKLIST config:
+{'rebuild_interval': s, 'error_rate': Bloom filter false positive rate}.
+"""
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from flask import current_app
+from sqlalchemy import delete, select
+from app.extensions import db, jwt
+from app.models.revoked_token import RevokedToken
+from app.persistence.unit_of_work import in_transaction
+from app.utils.bloom import BloomFilter
+
+_table = RevokedToken.__table__
+
+
+def _utc(timestamp):
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+def _timestamp(value):
+    """Unix time of a datetime read back from the database (naive = UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class RevocationStore:
+    """Revoked tokens, persisted in a table and checked in memory."""
+
+    def __init__(self, max_token_lifetime, rebuild_interval=60, error_rate=0.01, app=None):
+        """
+        Args:
+            max_token_lifetime: Longest lifetime of any token, in seconds;
+                a user-wide revocation is kept that long
+            rebuild_interval: Seconds between two reloads of the table
+            error_rate: False positive rate of the Bloom filter
+            app: The Flask application, whose context background rebuilds
+                run in; without it every rebuild runs on the caller
+        """
+        self.app = app
+        self.max_token_lifetime = max_token_lifetime
+        self.rebuild_interval = rebuild_interval
+        self.error_rate = error_rate
+        self._bloom = BloomFilter(0, error_rate)
+        self._exact = {}  # jti -> exp
+        self._cutoffs = {}  # user id -> revoked_at (Unix time)
+        self._next_rebuild = 0.0
+        self._rebuild_lock = threading.Lock()
+        self._rebuilding = False
+        # Set once a rebuild has completed: the filter reflects the table
+        self._built = threading.Event()
+        self._lock = threading.Lock()
+        self.checks = 0
+        self.table_lookups = 0
+        self.false_positives = 0
+        self.rebuilds = 0
+
+    # -------------------------------
+    # Revoking
+    # -------------------------------
+    def revoke(self, jti, expires_at, user_id=None):
+        """
+        Revoke one token.
+
+        Args:
+            jti: The token's unique ID (its "jti" claim)
+            expires_at: Its "exp" claim (Unix time)
+            user_id: Its subject, kept for the record
+        """
+        if db.session.execute(select(_table.c.id).where(_table.c.jti == jti)).first() is None:
+            self._write(RevokedToken(jti=jti, user_id=user_id, expires_at=_utc(expires_at)))
+        with self._lock:
+            self._exact[jti] = expires_at
+
+    def revoke_user(self, user_id):
+        """Revoke every token of a user issued until now."""
+        now = time.time()
+        self._write(RevokedToken(user_id=user_id, revoked_at=_utc(now),
+                                 expires_at=_utc(now + self.max_token_lifetime)))
+        with self._lock:
+            self._cutoffs[user_id] = max(self._cutoffs.get(user_id, 0), now)
+
+    def _write(self, row):
+        """Insert a row, dropping expired ones in the same commit."""
+        db.session.execute(delete(_table).where(_table.c.expires_at <= datetime.now(timezone.utc)))
+        db.session.add(row)
+        if not in_transaction():
+            db.session.commit()
+
+    # -------------------------------
+    # Checking
+    # -------------------------------
+    def is_revoked(self, payload):
+        """True if the token with these claims was revoked."""
+        if time.time() >= self._next_rebuild:
+            self._refresh()
+        self.checks += 1
+        # iat has a one-second resolution: a token issued in the second
+        # of a user-wide revocation counts as issued before it
+        cutoff = self._cutoffs.get(payload.get('sub'))
+        if cutoff is not None and payload.get('iat', 0) <= cutoff:
+            return True
+        jti = payload['jti']
+        if jti in self._exact:
+            return True
+        if jti not in self._bloom:
+            return False
+        self.table_lookups += 1
+        if db.session.execute(select(_table.c.id).where(_table.c.jti == jti)).first() is None:
+            self.false_positives += 1
+            return False
+        with self._lock:
+            self._exact[jti] = payload.get('exp')
+        return True
+
+    def _refresh(self):
+        """Rebuild when due: on this thread the first time, then in the background."""
+        if self.app is None or not self._built.is_set():
+            self.rebuild()
+            return
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild_in_background, name='hbnb-revocations',
+                         daemon=True).start()
+
+    def _rebuild_in_background(self):
+        try:
+            with self.app.app_context():
+                try:
+                    self.rebuild()
+                finally:
+                    db.session.remove()
+        finally:
+            with self._lock:
+                self._rebuilding = False
+                # A failed rebuild is retried after an interval, not per request
+                self._next_rebuild = max(self._next_rebuild, time.time() + self.rebuild_interval)
+
+    def rebuild(self):
+        """
+        Reload the filter and cutoffs from the table.
+
+        Only one thread rebuilds. Once a filter has been built, the others
+        keep using it; before that they wait for the first rebuild to
+        finish (and run it themselves if it failed).
+        """
+        if self._built.is_set():
+            if not self._rebuild_lock.acquire(blocking=False):
+                return
+        else:
+            self._rebuild_lock.acquire()
+            if self._built.is_set():
+                # Built by the thread we waited for
+                self._rebuild_lock.release()
+                return
+        try:
+            now = time.time()
+            rows = db.session.execute(
+                select(_table.c.jti, _table.c.user_id, _table.c.revoked_at)
+                .where(_table.c.expires_at > _utc(now))
+            ).all()
+            bloom = BloomFilter(max(1024, 2 * len(rows)), self.error_rate)
+            cutoffs = {}
+            for jti, user_id, revoked_at in rows:
+                if jti is not None:
+                    bloom.add(jti)
+                else:
+                    cutoffs[user_id] = max(cutoffs.get(user_id, 0), _timestamp(revoked_at))
+            with self._lock:
+                # Keep revocations made since the read above, drop the rest
+                self._exact = {jti: exp for jti, exp in self._exact.items()
+                               if jti not in bloom and (exp is None or exp > now)}
+                for user_id, cutoff in self._cutoffs.items():
+                    cutoffs[user_id] = max(cutoffs.get(user_id, 0), cutoff)
+                self._cutoffs = {user_id: cutoff for user_id, cutoff in cutoffs.items()
+                                 if cutoff + self.max_token_lifetime > now}
+                self._bloom = bloom
+                self.rebuilds += 1
+            self._next_rebuild = now + self.rebuild_interval
+            self._built.set()
+        finally:
+            self._rebuild_lock.release()
+
+    def stats(self):
+        """Return the counters as a dict."""
+        with self._lock:
+            return {
+                "filtered_tokens": len(self._bloom),
+                "exact_tokens": len(self._exact),
+                "revoked_users": len(self._cutoffs),
+                "checks": self.checks,
+                "table_lookups": self.table_lookups,
+                "false_positives": self.false_positives,
+                "rebuilds": self.rebuilds,
+                "rebuild_interval": self.rebuild_interval,
+            }
+
+
+def _seconds(value):
+    return value.total_seconds() if isinstance(value, timedelta) else value
+
+
+def init_revocation_store(app):
+    """Create the app's revoked token store; the table is read on first use."""
+    settings = app.config.get('TOKEN_BLOCKLIST', {})
+    lifetime = max(_seconds(app.config.get('JWT_ACCESS_TOKEN_EXPIRES', 0)),
+                   _seconds(app.config.get('JWT_REFRESH_TOKEN_EXPIRES', 0)))
+    app.extensions['revocation_store'] = RevocationStore(
+        max_token_lifetime=lifetime,
+        rebuild_interval=settings.get('rebuild_interval', 60),
+        error_rate=settings.get('error_rate', 0.01),
+        app=app,
+    )
+
+
+def revocation_store():
+    """Return the revoked token store of the current app."""
+    return current_app.extensions['revocation_store']
+
+
+@jwt.token_in_blocklist_loader
+def _token_is_revoked(jwt_header, jwt_payload):
+    return revocation_store().is_revoked(jwt_payload)
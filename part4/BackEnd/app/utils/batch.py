@@ -0,0 +1,62 @@
+"""
+Helpers shared by the bulk (/batch) create endpoints.
+"""
+from flask import current_app
+from flask_restx import abort, fields
+
+
+def batch_result_model(api):
+    """
+    Register the batch response models on a namespace.
+    
+    Args:
+        api: The flask_restx Namespace
+        
+    Returns:
+        The BatchResult model
+    """
+    item_model = api.model("BatchItemResult", {
+        "index": fields.Integer(description="Position of the item in the request"),
+        "id": fields.String(description="ID of the created object"),
+        "error": fields.String(description="Why the item was rejected")
+    })
+    return api.model("BatchResult", {
+        "created": fields.Integer(description="Number of objects created"),
+        "failed": fields.Integer(description="Number of rejected items"),
+        "results": fields.List(fields.Nested(item_model, skip_none=True))
+    })
+
+
+def batch_items(payload, id_fields=()):
+    """
+    Validate the body of a batch request.
+    
+    Args:
+        payload: The decoded JSON body
+        id_fields: Names of the item keys holding IDs; when present they
+            must be strings
+        
+    Returns:
+        list: The items to create
+    """
+    if not isinstance(payload, list) or not payload:
+        abort(400, "Expected a non-empty JSON array")
+    limit = current_app.config['BATCH_MAX_ITEMS']
+    if len(payload) > limit:
+        abort(413, f"A batch may contain at most {limit} items")
+    for index, item in enumerate(payload):
+        for name in id_fields:
+            if isinstance(item, dict) and not isinstance(item.get(name, ''), str):
+                abort(400, f"Item {index}: {name} must be a string")
+    return payload
+
+
+def batch_response(results):
+    """
+    Build the response of a batch request.
+    
+    Returns 201 when every item was created, 207 when some were rejected.
+    """
+    failed = sum(1 for result in results if "error" in result)
+    body = {"created": len(results) - failed, "failed": failed, "results": results}
+    return body, 201 if not failed else 207
@@ -0,0 +1,50 @@
+"""
+A small Bloom filter for string keys.
+
+"Is this key in the set?" answers either "definitely not" or "maybe":
+there are no false negatives, and false positives happen at about the
+error rate the filter was sized for. Keys can be added, never removed;
+rebuild the filter to forget some.
+"""
+import math
+from hashlib import blake2b
+
+
+class BloomFilter:
+    """Fixed-size bit array probed with k double-hashed positions per key."""
+
+    def __init__(self, capacity, error_rate=0.01):
+        """
+        Args:
+            capacity: Number of keys the filter is sized for
+            error_rate: Target false positive rate at that many keys
+        """
+        capacity = max(1, capacity)
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key):
+        digest = blake2b(key.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def add(self, key):
+        """Add a key."""
+        bits = self._bits
+        for position in self._positions(key):
+            bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, key):
+        bits = self._bits
+        for position in self._positions(key):
+            if not bits[position >> 3] & (1 << (position & 7)):
+                return False
+        return True
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,115 @@
+"""
+Conditional GET support (ETag / Last-Modified).
+
+Validators are computed before the view runs, so a matching
+If-None-Match or If-Modified-Since is answered with an empty 304 without
+serializing anything.
+"""
+import hashlib
+from datetime import timezone
+from functools import wraps
+from flask import request
+from flask_restx.utils import unpack
+from werkzeug.http import http_date, is_resource_modified, quote_etag
+from werkzeug.wrappers import Response
+from app.persistence.table_versions import get_versions
+
+
+def make_etag(*parts):
+    """
+    Build an ETag value from the parts identifying a representation.
+
+    The request path and query string are mixed in, since ?fields=,
+    ?limit=, ?cursor= and friends change the body.
+    """
+    digest = hashlib.md5(usedforsecurity=False)
+    for part in (*parts, request.full_path):
+        digest.update(str(part).encode())
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _as_utc(value):
+    """Timestamps come back from SQLite without tzinfo; they are UTC."""
+    if value is not None and value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value
+
+
+def resource_validators(obj):
+    """
+    Validators for a single entity: its id and updated_at.
+
+    Returns:
+        tuple: (etag, last_modified, obj), or None if obj is None
+    """
+    if obj is None:
+        return None
+    return make_etag(obj.id, obj.updated_at.isoformat()), _as_utc(obj.updated_at), obj
+
+
+def place_validators(place):
+    """
+    Validators for a place, whose payload lists its amenity ids.
+
+    The place_amenity rows are not versioned with the place row, so the
+    amenity ids are part of the ETag.
+
+    Returns:
+        tuple: (etag, last_modified, place), or None if place is None
+    """
+    if place is None:
+        return None
+    amenity_ids = sorted(amenity.id for amenity in place.amenities)
+    etag = make_etag(place.id, place.updated_at.isoformat(), *amenity_ids)
+    return etag, _as_utc(place.updated_at), place
+
+
+def collection_validators(*tables):
+    """
+    Return a validators function for a listing built from some tables.
+
+    The ETag changes whenever one of the tables' version counters does.
+    """
+    def validators(**kwargs):
+        versions = get_versions(tables)
+        etag = make_etag(*(f"{name}:{version}" for name, (version, _) in versions.items()))
+        stamps = [_as_utc(stamp) for _, stamp in versions.values() if stamp is not None]
+        return etag, max(stamps) if stamps else None, None
+    return validators
+
+
+def conditional(validators):
+    """
+    Decorate a GET method to honour If-None-Match / If-Modified-Since.
+
+    Put it above @api.marshal_with so a 304 skips serialization.
+
+    Args:
+        validators: Callable taking the URL parameters and returning
+            (etag, last_modified, source), or None to let the view run
+            unchanged (e.g. to answer 404). source is the entity the
+            validators were read from, if any.
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            found = validators(**kwargs)
+            if found is None:
+                return func(*args, **kwargs)
+            # Holding on to the source entity keeps it in the session's
+            # (weakly referenced) identity map, so the view's own lookup of
+            # the same row doesn't go back to the database.
+            etag, last_modified, source = found
+            headers = {'ETag': quote_etag(etag, weak=True), 'Cache-Control': 'no-cache'}
+            if last_modified is not None:
+                headers['Last-Modified'] = http_date(last_modified)
+
+            if not is_resource_modified(request.environ, etag=etag,
+                                        last_modified=last_modified):
+                return Response(status=304, headers=headers)
+
+            data, code, extra = unpack(func(*args, **kwargs))
+            return data, code, {**headers, **(extra or {})}
+        return wrapper
+    return decorator
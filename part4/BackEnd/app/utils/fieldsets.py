@@ -0,0 +1,55 @@
+"""
+Sparse fieldsets: ?fields=id,name,price on read endpoints.
+
+The response is trimmed by flask-restx's field masks (the same mechanism
+as the X-Fields header), and list endpoints also pass the requested names
+down to the repositories so unused columns and relationships are never
+loaded.
+"""
+from flask import request
+from flask_restx import abort, reqparse
+from flask_restx.mask import Mask, MaskError
+
+# Query parameter accepted by the single-item endpoints
+fields_parser = reqparse.RequestParser()
+fields_parser.add_argument('fields', type=str, location='args',
+                           help='Comma-separated fields to return, e.g. id,name,price')
+
+
+def requested_fields(value, model):
+    """
+    Parse the fields query parameter against a response model.
+
+    Args:
+        value: The raw "a,b,c" string sent by the client, or None
+        model: The flask-restx model the response is marshalled with
+
+    Returns:
+        set: The top-level field names requested, or None for every field
+    """
+    if value is None:
+        return None
+    try:
+        names = set(Mask(value))
+    except MaskError as e:
+        abort(400, f'Invalid fields: {e}')
+    unknown = sorted(names - set(model))
+    if unknown:
+        abort(400, f'Unknown fields: {", ".join(unknown)}')
+    return names
+
+
+def init_sparse_fieldsets(app):
+    """
+    Let ?fields= act as the field mask header for every endpoint.
+
+    flask-restx only reads masks from a header (X-Fields by default), which
+    browsers can't set on a plain link; copy the query parameter into it.
+    """
+    header = 'HTTP_' + app.config.get('RESTX_MASK_HEADER', 'X-Fields').upper().replace('-', '_')
+
+    @app.before_request
+    def _fields_as_mask():
+        fields = request.args.get('fields')
+        if fields and header not in request.environ:
+            request.environ[header] = fields
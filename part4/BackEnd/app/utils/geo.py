@@ -0,0 +1,93 @@
+"""
+Geospatial helpers: geohash encoding and great-circle distances.
+"""
+import math
+
+_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+# Precision stored in places.geohash (~4.8m x 4.8m cells)
+GEOHASH_PRECISION = 9
+
+
+def geohash_encode(latitude, longitude, precision=GEOHASH_PRECISION):
+    """
+    Encode a coordinate as a geohash string.
+    
+    Args:
+        latitude: Latitude in degrees (-90..90)
+        longitude: Longitude in degrees (-180..180)
+        precision: Number of characters
+        
+    Returns:
+        str: The geohash
+    """
+    lat_range, lng_range = [-90.0, 90.0], [-180.0, 180.0]
+    chars, bits, bit_count, even = [], 0, 0, True
+    while len(chars) < precision:
+        rng, value = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits, bit_count = 0, 0
+    return ''.join(chars)
+
+
+def cell_size(precision):
+    """Return the (latitude, longitude) size in degrees of a geohash cell."""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def covering_cells(latitude, longitude, radius_km):
+    """
+    Find geohash prefixes whose cells cover a circle.
+    
+    Uses the finest precision whose cells are at least as large as the
+    radius, so the center cell and its 8 neighbours contain the circle.
+    
+    Returns:
+        list: Geohash prefixes, or None if the circle is too large for any
+        precision (the caller should then scan without a prefix filter)
+    """
+    lat_radius = radius_km / KM_PER_DEGREE
+    cos_lat = max(math.cos(math.radians(latitude)), 1e-6)
+    lng_radius = radius_km / (KM_PER_DEGREE * cos_lat)
+
+    precision = 0
+    for candidate in range(1, GEOHASH_PRECISION + 1):
+        lat_size, lng_size = cell_size(candidate)
+        if lat_size < lat_radius or lng_size < lng_radius:
+            break
+        precision = candidate
+    if precision == 0:
+        return None
+
+    lat_size, lng_size = cell_size(precision)
+    cells = set()
+    for d_lat in (-lat_size, 0, lat_size):
+        for d_lng in (-lng_size, 0, lng_size):
+            lat = min(max(latitude + d_lat, -90.0), 90.0)
+            lng = (longitude + d_lng + 180.0) % 360.0 - 180.0
+            cells.add(geohash_encode(lat, lng, precision))
+    return sorted(cells)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Great-circle distance between two coordinates, in kilometres."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
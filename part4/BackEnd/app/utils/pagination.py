@@ -0,0 +1,93 @@
+"""
+Pagination utilities for list endpoints.
+"""
+from urllib.parse import urlencode
+from flask import current_app, request
+from flask_restx import abort, inputs, reqparse
+
+# Query parameters shared by every paginated list endpoint
+pagination_parser = reqparse.RequestParser()
+pagination_parser.add_argument('limit', type=int, location='args',
+                               help='Maximum number of items to return')
+pagination_parser.add_argument('cursor', type=str, location='args',
+                               help='Cursor taken from the X-Next-Cursor header of the previous page')
+pagination_parser.add_argument('all', type=inputs.boolean, location='args', default=False,
+                               help='Return up to LIST_ALL_MAX items (1000) in one page; '
+                                    'X-Next-Cursor is set if more remain')
+pagination_parser.add_argument('fields', type=str, location='args',
+                               help='Comma-separated fields to return, e.g. id,name,price')
+
+# Collection endpoints also accept ?ids=a,b,c to fetch specific items
+list_parser = pagination_parser.copy()
+list_parser.add_argument('ids', type=str, location='args',
+                         help='Comma-separated IDs to fetch, in this order (overrides pagination)')
+
+
+def requested_ids(value):
+    """
+    Split the ids query parameter into a list of IDs.
+    
+    Args:
+        value: The raw "a,b,c" string sent by the client
+        
+    Returns:
+        list: The IDs in request order, without blanks or duplicates
+    """
+    ids = list(dict.fromkeys(part.strip() for part in value.split(',') if part.strip()))
+    max_ids = current_app.config['MULTI_GET_MAX_IDS']
+    if len(ids) > max_ids:
+        abort(400, f'At most {max_ids} ids may be requested at once')
+    return ids
+
+
+def page_limit(limit):
+    """
+    Clamp a requested page size to the configured bounds.
+    
+    Args:
+        limit: The limit sent by the client, or None
+        
+    Returns:
+        int: A page size between 1 and PAGE_SIZE_MAX
+    """
+    if limit is None:
+        limit = current_app.config['PAGE_SIZE_DEFAULT']
+    if limit < 1:
+        abort(400, 'limit must be a positive integer')
+    return min(limit, current_app.config['PAGE_SIZE_MAX'])
+
+
+def paginate(args, fetch_page):
+    """
+    Run a list query honouring the limit, cursor and all parameters.
+    
+    The response body stays a plain list; the cursor for the next page is
+    returned in the X-Next-Cursor header (and as a Link rel="next").
+    all=true asks for one page of LIST_ALL_MAX items instead of limit: it
+    is still bounded, and still sets the cursor if more items remain.
+    
+    Args:
+        args: Parsed arguments from pagination_parser (or a copy of it)
+        fetch_page: Callable (limit, cursor) -> (items, next_cursor)
+        
+    Returns:
+        tuple: (items, status code, headers) for marshal_list_with
+    """
+    if args.get('all'):
+        limit = current_app.config['LIST_ALL_MAX']
+    else:
+        limit = page_limit(args.get('limit'))
+    
+    try:
+        items, next_cursor = fetch_page(limit, args.get('cursor'))
+    except ValueError as e:
+        abort(400, str(e))
+    
+    headers = {}
+    if next_cursor:
+        query = request.args.to_dict()
+        query['cursor'] = next_cursor
+        next_url = f"{request.base_url}?{urlencode(query)}"
+        headers['X-Next-Cursor'] = next_cursor
+        headers['Link'] = f'<{next_url}>; rel="next"'
+    return items, 200, headers
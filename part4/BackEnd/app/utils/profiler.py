@@ -0,0 +1,246 @@
+"""
+Sampling request profiler.
+
+A WSGI middleware picks sample_rate of the requests at random. While a
+picked request runs (its streamed body included), a background thread
+takes the Python stack of the thread serving it every interval_ms. Stacks
+are counted per flask-restx route ("PlaceList.get", "Login.post", ...) in
+the collapsed format read by flamegraph.pl and speedscope:
+
+    Login.post;app.api.auth_endpoints:Login.post;...;bcrypt:... 12
+
+so the time spent marshalling, hashing passwords or in SQL shows up under
+real traffic, without a debugger. Requests that are not picked cost one
+random() call.
+
+The stacks are downloaded from GET /api/v1/admin/profile/collapsed and,
+if dump_dir is set, written there (one .folded file per route) when the
+process exits.
+
+Settings come from the PROFILER config:
+{'enabled': bool, 'sample_rate': 0..1, 'interval_ms': ms between samples,
+'max_depth': frames kept per stack, 'max_stacks': distinct stacks kept per
+route, 'dump_dir': directory or None}.
+"""
+import atexit
+import os
+import random
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from flask import current_app
+from werkzeug.exceptions import HTTPException
+
+UNMATCHED = '<unmatched>'
+TRUNCATED = '<other stacks>'
+
+
+def folded_filename(route):
+    """File name of the collapsed stacks of a route."""
+    return re.sub(r'[^\w.-]', '_', route) + '.folded'
+
+
+def _frame_name(code, module):
+    return f"{module}:{getattr(code, 'co_qualname', code.co_name)}"
+
+
+class SamplingProfiler:
+    """WSGI middleware sampling the stacks of a fraction of the requests."""
+
+    def __init__(self, app, wsgi_app, sample_rate=0.01, interval_ms=5, max_depth=64,
+                 max_stacks=5000):
+        """
+        Args:
+            app: The Flask application, to name the route of a request
+            wsgi_app: The WSGI callable to wrap (app.wsgi_app)
+            sample_rate: Fraction of the requests profiled
+            interval_ms: Milliseconds between two samples of a request
+            max_depth: Frames kept per stack, counted from the innermost
+            max_stacks: Distinct stacks kept per route; later ones are
+                counted together as TRUNCATED
+        """
+        self.app = app
+        self.wsgi_app = wsgi_app
+        self.sample_rate = sample_rate
+        self.interval = interval_ms / 1000
+        self.max_depth = max_depth
+        self.max_stacks = max_stacks
+        self._active = {}  # thread id -> route of the request it serves
+        self._stacks = {}  # route -> Counter(collapsed stack -> samples)
+        self._requests = Counter()  # route -> profiled requests
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = False
+        self._thread = None
+        # Frames at or above these belong to the WSGI server, not the request
+        self._roots = {SamplingProfiler.__call__.__code__,
+                       SamplingProfiler._iterate.__code__}
+
+    # -------------------------------
+    # Middleware
+    # -------------------------------
+    def __call__(self, environ, start_response):
+        if self._stopped or random.random() >= self.sample_rate:
+            return self.wsgi_app(environ, start_response)
+        route = self.route_name(environ)
+        thread_id = threading.get_ident()
+        self._start(thread_id, route)
+        try:
+            body = self.wsgi_app(environ, start_response)
+        except BaseException:
+            self._stop(thread_id)
+            raise
+        return self._iterate(body, thread_id)
+
+    def _iterate(self, body, thread_id):
+        # Still sampled while the server reads the body (streamed responses)
+        try:
+            yield from body
+        finally:
+            if hasattr(body, 'close'):
+                body.close()
+            self._stop(thread_id)
+
+    def route_name(self, environ):
+        """"Resource.method" of the flask-restx route a request goes to."""
+        try:
+            endpoint, _ = self.app.url_map.bind_to_environ(environ).match()
+        except HTTPException:
+            return UNMATCHED
+        view = self.app.view_functions.get(endpoint)
+        view_class = getattr(view, 'view_class', None)
+        if view_class is None:
+            return endpoint
+        return f"{view_class.__name__}.{environ.get('REQUEST_METHOD', 'GET').lower()}"
+
+    def _start(self, thread_id, route):
+        with self._lock:
+            self._active[thread_id] = route
+            self._requests[route] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name='hbnb-profiler',
+                                                daemon=True)
+                self._thread.start()
+            self._wakeup.set()
+
+    def _stop(self, thread_id):
+        with self._lock:
+            self._active.pop(thread_id, None)
+            if not self._active:
+                self._wakeup.clear()
+
+    # -------------------------------
+    # Sampling
+    # -------------------------------
+    def _run(self):
+        while not self._stopped:
+            self._wakeup.wait()
+            if self._stopped:
+                return
+            time.sleep(self.interval)
+            self.sample()
+
+    def sample(self):
+        """Record one stack of every thread serving a profiled request."""
+        frames = sys._current_frames()
+        with self._lock:
+            active = list(self._active.items())
+        stacks = [(route, self._collapse(route, frames[thread_id]))
+                  for thread_id, route in active if thread_id in frames]
+        with self._lock:
+            for route, stack in stacks:
+                counter = self._stacks.setdefault(route, Counter())
+                if stack not in counter and len(counter) >= self.max_stacks:
+                    stack = f"{route};{TRUNCATED}"
+                counter[stack] += 1
+
+    def _collapse(self, route, frame):
+        names = []
+        while frame is not None and frame.f_code not in self._roots:
+            names.append(_frame_name(frame.f_code, frame.f_globals.get('__name__', '?')))
+            frame = frame.f_back
+        names = names[:self.max_depth]
+        names.append(route)
+        # Collapsed stacks list frames outermost first, separated by ;
+        return ';'.join(re.sub(r'[;\s]', '_', name) for name in reversed(names))
+
+    # -------------------------------
+    # Reporting
+    # -------------------------------
+    def collapsed(self, route=None):
+        """The stacks in collapsed format, for one route or all of them."""
+        with self._lock:
+            counters = [self._stacks.get(route, Counter())] if route else self._stacks.values()
+            lines = [f"{stack} {count}" for counter in counters
+                     for stack, count in counter.most_common()]
+        return '\n'.join(lines) + '\n' if lines else ''
+
+    def summary(self):
+        """Profiled requests and samples per route, busiest route first."""
+        with self._lock:
+            rows = [{
+                "route": route,
+                "requests": requests,
+                "samples": sum(self._stacks.get(route, Counter()).values()),
+                "stacks": len(self._stacks.get(route, ())),
+            } for route, requests in self._requests.items()]
+        rows.sort(key=lambda row: row["samples"], reverse=True)
+        return {
+            "sample_rate": self.sample_rate,
+            "interval_ms": self.interval * 1000,
+            "routes": rows,
+        }
+
+    def dump(self, directory):
+        """Write one <route>.folded file per route; return the paths."""
+        os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            routes = list(self._stacks)
+        paths = []
+        for route in routes:
+            path = os.path.join(directory, folded_filename(route))
+            with open(path, 'w', encoding='utf-8') as out:
+                out.write(self.collapsed(route))
+            paths.append(path)
+        return paths
+
+    def reset(self):
+        """Forget every stack recorded so far."""
+        with self._lock:
+            self._stacks = {}
+            self._requests = Counter()
+
+    def close(self):
+        """Stop profiling and the sampling thread."""
+        self._stopped = True
+        self._wakeup.set()
+
+
+def init_profiler(app):
+    """
+    Wrap the app's WSGI callable in the sampling profiler.
+
+    Args:
+        app: The Flask application, after its routes are registered
+    """
+    settings = app.config.get('PROFILER', {})
+    if not settings.get('enabled', False):
+        return
+    profiler = SamplingProfiler(
+        app, app.wsgi_app,
+        sample_rate=settings.get('sample_rate', 0.01),
+        interval_ms=settings.get('interval_ms', 5),
+        max_depth=settings.get('max_depth', 64),
+        max_stacks=settings.get('max_stacks', 5000),
+    )
+    app.wsgi_app = profiler
+    app.extensions['profiler'] = profiler
+    if settings.get('dump_dir'):
+        atexit.register(profiler.dump, settings['dump_dir'])
+
+
+def profiler():
+    """Return the profiler of the current app, or None when disabled."""
+    return current_app.extensions.get('profiler')
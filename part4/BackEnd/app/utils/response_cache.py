@@ -0,0 +1,184 @@
+"""
+In-process cache of marshalled GET responses.
+
+Entries are keyed on path, query string, field mask and (optionally) some
+JWT claims, and remember the local version of every table the response
+was built from (see app.persistence.table_versions). A commit writing to
+one of those tables makes the entry invalid at once. Otherwise an entry is
+fresh for `ttl` seconds. After that it may still be served for
+`stale_while_revalidate` seconds while a single request rebuilds it, so a
+burst of readers never recomputes the same page at the same time.
+
+Settings come from the RESPONSE_CACHE config, one dict per cache name:
+{'enabled': bool, 'maxsize': entries, 'ttl': s, 'stale_while_revalidate': s}.
+"""
+import threading
+import time
+from collections import OrderedDict
+from functools import wraps
+from flask import current_app, request
+from flask_jwt_extended import get_jwt, verify_jwt_in_request
+from flask_restx.utils import unpack
+from app.persistence.table_versions import local_versions
+
+
+class _Entry:
+    __slots__ = ('versions', 'fresh_until', 'stale_until', 'value', 'refreshing')
+
+    def __init__(self, versions, fresh_until, stale_until, value):
+        self.versions = versions
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+        self.value = value
+        self.refreshing = False
+
+
+class ResponseCache:
+    """Thread-safe LRU store of responses with TTL and stale-while-revalidate."""
+
+    def __init__(self, maxsize=512, ttl=30, stale_while_revalidate=0):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_while_revalidate = stale_while_revalidate
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def lookup(self, key, versions):
+        """
+        Find a usable response.
+
+        Returns:
+            tuple: (value, state) where state is 'fresh' or 'stale', or
+            (None, None) when the caller must build the response; in the
+            stale window exactly one caller gets (None, None).
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and entry.versions != versions:
+                del self._data[key]
+                self.invalidations += 1
+                entry = None
+            if entry is None or now >= entry.stale_until:
+                self.misses += 1
+                return None, None
+            self._data.move_to_end(key)
+            if now < entry.fresh_until:
+                self.hits += 1
+                return entry.value, 'fresh'
+            if entry.refreshing:
+                self.stale_hits += 1
+                return entry.value, 'stale'
+            # This caller revalidates; the others keep getting the stale copy
+            entry.refreshing = True
+            self.misses += 1
+            return None, None
+
+    def store(self, key, versions, value):
+        """Store a freshly built response."""
+        now = time.monotonic()
+        with self._lock:
+            self._data[key] = _Entry(versions, now + self.ttl,
+                                     now + self.ttl + self.stale_while_revalidate, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def release(self, key):
+        """Let another request revalidate after this one failed to."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                entry.refreshing = False
+
+    def stats(self):
+        """Return the counters as a dict."""
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "stale_while_revalidate": self.stale_while_revalidate,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_ratio": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+                "invalidations": self.invalidations,
+            }
+
+
+def _cache_for(name, settings):
+    """Return the app's cache for an endpoint, creating it on first use."""
+    caches = current_app.extensions.setdefault('response_cache', {})
+    if name not in caches:
+        caches[name] = ResponseCache(maxsize=settings.get('maxsize', 512),
+                                     ttl=settings.get('ttl', 30),
+                                     stale_while_revalidate=settings.get('stale_while_revalidate', 0))
+    return caches[name]
+
+
+def _claim_values(claims):
+    """Values of some JWT claims of the caller, or None for anonymous callers."""
+    try:
+        verify_jwt_in_request(optional=True)
+        token = get_jwt()
+    except Exception:
+        # The endpoint is public; an unusable token just means anonymous
+        return None
+    return tuple(token.get(claim) for claim in claims) if token else None
+
+
+def cached_response(name, tables, claims=()):
+    """
+    Decorate a GET method to serve its response from the cache.
+
+    Put it above @api.marshal_with so hits skip the query and serialization,
+    and below @conditional so 304s don't touch the cache.
+
+    Args:
+        name: Key of the endpoint's settings in RESPONSE_CACHE
+        tables: Names of the tables the response is built from
+        claims: JWT claims the response depends on (part of the key)
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            settings = current_app.config.get('RESPONSE_CACHE', {}).get(name, {})
+            if not settings.get('enabled', False):
+                return func(*args, **kwargs)
+
+            cache = _cache_for(name, settings)
+            mask_header = current_app.config.get('RESTX_MASK_HEADER', 'X-Fields')
+            key = (request.path, request.query_string, request.headers.get(mask_header),
+                   _claim_values(claims) if claims else None)
+            versions = local_versions(tables)
+
+            value, state = cache.lookup(key, versions)
+            if value is not None:
+                data, code, headers = value
+                return data, code, {**headers, 'X-Cache': 'HIT' if state == 'fresh' else 'STALE'}
+
+            try:
+                data, code, headers = unpack(func(*args, **kwargs))
+            except Exception:
+                cache.release(key)
+                raise
+            headers = dict(headers or {})
+            if code == 200:
+                cache.store(key, versions, (data, code, headers))
+            else:
+                cache.release(key)
+            return data, code, {**headers, 'X-Cache': 'MISS'}
+        return wrapper
+    return decorator
+
+
+def response_cache_stats():
+    """Return the counters of every response cache used by the current app."""
+    caches = current_app.extensions.get('response_cache', {})
+    return {name: cache.stats() for name, cache in caches.items()}
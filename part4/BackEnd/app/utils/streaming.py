@@ -0,0 +1,64 @@
+"""
+Streaming (NDJSON) mode for collection endpoints.
+
+With ?stream=1 or "Accept: application/x-ndjson" a collection is written
+as one JSON object per line, from a generator over a batched query, so
+memory use does not grow with the size of the table. Pagination
+parameters are ignored; filters and ?fields= still apply.
+"""
+import json
+from functools import wraps
+from flask import Response, request, stream_with_context
+from flask_restx import inputs, marshal
+from app.utils.fieldsets import requested_fields
+from app.utils.serializers import compile_model
+
+NDJSON = 'application/x-ndjson'
+
+
+def add_stream_argument(parser):
+    """Document the stream query parameter on a request parser."""
+    parser.add_argument('stream', type=inputs.boolean, location='args', default=False,
+                        help=f'Stream every item as {NDJSON}, one JSON object per line')
+    return parser
+
+
+def wants_stream():
+    """Return True if the client asked for a streamed response."""
+    if request.args.get('stream', '').lower() in ('1', 'true', 'yes'):
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON]) == NDJSON
+
+
+def streamable(model, fetch_iter):
+    """
+    Decorate a collection GET to serve NDJSON when asked to.
+
+    Put it above @conditional/@cached_response/@marshal_list_with:
+    a stream is neither cached nor marshalled as a list.
+
+    Args:
+        model: The flask-restx model each item is marshalled with
+        fetch_iter: Callable (fields, **view_kwargs) returning an iterable
+            of objects; fields is the set from ?fields= or None
+    """
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if not wants_stream():
+                return func(*args, **kwargs)
+
+            mask = request.args.get('fields')
+            items = fetch_iter(requested_fields(mask, model), **kwargs)
+            serialize = compile_model(model) if not mask else None
+
+            def generate():
+                for item in items:
+                    data = serialize(item) if serialize else marshal(item, model, mask=mask)
+                    yield json.dumps(data) + '\n'
+
+            # The generator runs after the view returns; keep the request
+            # (and its database session) alive until the last row is sent
+            return Response(stream_with_context(generate()), mimetype=NDJSON)
+        return wrapper
+    return decorator
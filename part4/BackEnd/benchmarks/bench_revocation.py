@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cost of "is this JWT revoked?" per request.
+
+Compares the RevocationStore check (Bloom filter + exact set, falling back
+to the revoked_tokens table on a filter hit) with a plain primary-key
+lookup in the table on every request, for blocklists of increasing size.
+The common case is a token that was never revoked.
+
+Usage (from the BackEnd directory):
+    python benchmarks/bench_revocation.py [revoked ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import timeit
+import uuid
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert, select  # noqa: E402
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.revoked_token import RevokedToken  # noqa: E402
+from app.services.revocation_store import RevocationStore  # noqa: E402
+from config import DevelopmentConfig, config  # noqa: E402
+
+CHECKS = 20000
+
+
+def make_app():
+    db_path = os.path.join(tempfile.mkdtemp(prefix="hbnb-bench-"), "bench.db")
+    config['bench-revocation'] = type('BenchRevocation', (DevelopmentConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{db_path}",
+    })
+    return create_app('bench-revocation')
+
+
+def per_check(func, payloads):
+    """Best time of one check, in microseconds."""
+    runs = timeit.repeat(lambda: [func(p) for p in payloads], number=1, repeat=3)
+    return min(runs) / len(payloads) * 1e6
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+    app = make_app()
+    table = RevokedToken.__table__
+    expires = datetime.fromtimestamp(time.time() + 3600, timezone.utc)
+    with app.app_context():
+        db.create_all()
+        revoked = []
+        for size in sizes:
+            new = [str(uuid.uuid4()) for _ in range(size - len(revoked))]
+            if new:
+                db.session.execute(insert(table), [{"jti": jti, "expires_at": expires}
+                                                   for jti in new])
+                db.session.commit()
+            revoked += new
+
+            store = RevocationStore(max_token_lifetime=3600, rebuild_interval=3600)
+            start = time.perf_counter()
+            store.rebuild()
+            rebuild_ms = (time.perf_counter() - start) * 1000
+
+            def lookup(payload):
+                query = select(table.c.id).where(table.c.jti == payload["jti"])
+                return db.session.execute(query).first() is not None
+
+            fresh = [{"jti": str(uuid.uuid4()), "sub": "u", "iat": 0} for _ in range(CHECKS)]
+            hits = [{"jti": jti, "sub": "u", "iat": 0} for jti in revoked[:CHECKS]]
+            store.table_lookups = store.false_positives = 0
+            print(f"{size:7,d} revoked  (rebuild {rebuild_ms:6.1f} ms)")
+            print(f"    not revoked: store {per_check(store.is_revoked, fresh):6.2f} us  "
+                  f"table {per_check(lookup, fresh):6.2f} us  "
+                  f"(false positives {store.false_positives / 3 / len(fresh):.2%})")
+            print(f"    revoked:     store {per_check(store.is_revoked, hits):6.2f} us  "
+                  f"table {per_check(lookup, hits):6.2f} us")
+
+
+if __name__ == '__main__':
+    main()
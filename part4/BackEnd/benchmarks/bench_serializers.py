@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Benchmark: flask-restx marshal() vs. the compiled serializers of
+app.utils.serializers, on lists of model objects.
+
+Each model is serialized as one list of N objects (as a list endpoint
+does), best of several runs. The objects are plain, unsaved model
+instances so only serialization is measured.
+
+Usage (from the BackEnd directory):
+    python benchmarks/bench_serializers.py [objects]
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask_restx import marshal  # noqa: E402
+from app import create_app  # noqa: E402
+from app.api.amenity_endpoints import amenity_model  # noqa: E402
+from app.api.place_endpoints import place_model  # noqa: E402
+from app.api.review_endpoints import review_model  # noqa: E402
+from app.api.user_endpoints import user_model  # noqa: E402
+from app.models.amenity import Amenity  # noqa: E402
+from app.models.place import Place  # noqa: E402
+from app.models.review import Review  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.utils.serializers import serialize_list  # noqa: E402
+
+REPEAT = 5
+
+
+def make_objects(count):
+    """One list of count instances per model."""
+    return {
+        "Place": (place_model, [Place(name=f"Place {i}", description="x" * 200, city="Paris",
+                                      price=i, latitude=48.85, longitude=2.35,
+                                      owner_id="owner", review_count=3, rating_count=3,
+                                      rating_sum=12)
+                                for i in range(count)]),
+        "Review": (review_model, [Review(text="Great stay", rating=4, user_id="user",
+                                         place_id="place") for _ in range(count)]),
+        "User": (user_model, [User(first_name="Ann", last_name="Lee",
+                                   email=f"user{i}@x.com", password="x")
+                              for i in range(count)]),
+        "Amenity": (amenity_model, [Amenity(name=f"Amenity {i}") for i in range(count)]),
+    }
+
+
+def best(func):
+    return min(timeit.repeat(func, number=1, repeat=REPEAT))
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    app = create_app('testing')
+    with app.test_request_context():
+        for name, (model, objects) in make_objects(count).items():
+            assert serialize_list(objects, model) == marshal(objects, model)
+            restx = best(lambda: marshal(objects, model))
+            compiled = best(lambda: serialize_list(objects, model))
+            print(f"{name:8s} x{count:,d}: marshal {restx * 1000:7.1f} ms  "
+                  f"compiled {compiled * 1000:7.1f} ms  ({restx / compiled:4.1f}x)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent reads and writes with SQLite defaults vs. the
+SQLITE_PRAGMAS profile (WAL, synchronous=NORMAL, mmap, cache, busy_timeout).
+
+Each run uses a fresh on-disk database. Writer threads create amenities
+(one commit each) while reader threads list places, for a fixed duration.
+
+Usage (from the BackEnd directory):
+    python benchmarks/bench_sqlite_profile.py [seconds] [writers] [readers]
+"""
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.business.facade import HBnBFacade  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.place import Place  # noqa: E402
+from config import DevelopmentConfig, config  # noqa: E402
+
+
+def make_app(name, pragmas):
+    db_path = os.path.join(tempfile.mkdtemp(prefix="hbnb-bench-"), "bench.db")
+    config[name] = type(name, (DevelopmentConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{db_path}",
+        'SQLITE_PRAGMAS': pragmas,
+        'ENTITY_CACHE': {},
+    })
+    app = create_app(name)
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name="B", last_name="M", email="bench@x.com", password="x")
+        db.session.add(owner)
+        db.session.add_all(Place(name=f"P{i}", city="Paris", price=i, owner_id=owner.id)
+                           for i in range(200))
+        db.session.commit()
+    return app
+
+
+def run(app, seconds, writers, readers):
+    facade = HBnBFacade()
+    stop = time.monotonic() + seconds
+    counts = {"writes": 0, "reads": 0, "locked": 0}
+    lock = threading.Lock()
+
+    def bump(key):
+        with lock:
+            counts[key] += 1
+
+    def writer(n):
+        with app.app_context():
+            i = 0
+            while time.monotonic() < stop:
+                try:
+                    facade.create_amenity({"name": f"w{n}-{i}"})
+                    bump("writes")
+                except OperationalError:
+                    db.session.rollback()
+                    bump("locked")
+                i += 1
+            db.session.remove()
+
+    def reader():
+        with app.app_context():
+            while time.monotonic() < stop:
+                try:
+                    facade.get_places_page(50)
+                    bump("reads")
+                except OperationalError:
+                    db.session.rollback()
+                    bump("locked")
+                db.session.remove()
+
+    threads = [threading.Thread(target=writer, args=(n,)) for n in range(writers)]
+    threads += [threading.Thread(target=reader) for _ in range(readers)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return counts
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    writers = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    readers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+
+    for label, pragmas in (("defaults", {}), ("profile", DevelopmentConfig.SQLITE_PRAGMAS)):
+        app = make_app(f"bench-{label}", pragmas)
+        counts = run(app, seconds, writers, readers)
+        print(f"{label:9s}: {counts['writes'] / seconds:8,.0f} writes/s  "
+              f"{counts['reads'] / seconds:8,.0f} reads/s  "
+              f"{counts['locked']} 'database is locked' errors")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak Python memory of exporting every place with ?all=true
+(one marshalled list) vs. ?stream=1 (NDJSON generator, batched reads).
+
+Peak memory is measured with tracemalloc while the response body is
+consumed, for tables of increasing size. The streamed peak should stay
+flat; the list peak grows with the table.
+
+Usage (from the BackEnd directory):
+    python benchmarks/bench_streaming.py [rows ...]
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app import create_app  # noqa: E402
+from app.extensions import db  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.place import Place  # noqa: E402
+from config import DevelopmentConfig, config  # noqa: E402
+
+
+def make_app(rows):
+    db_path = os.path.join(tempfile.mkdtemp(prefix="hbnb-bench-"), "bench.db")
+    config['bench-streaming'] = type('BenchStreaming', (DevelopmentConfig,), {
+        'SQLALCHEMY_DATABASE_URI': f"sqlite:///{db_path}",
+        'ENTITY_CACHE': {},
+        'RESPONSE_CACHE': {},
+    })
+    app = create_app('bench-streaming')
+    with app.app_context():
+        db.create_all()
+        owner = User(first_name="B", last_name="M", email="bench@x.com", password="x")
+        db.session.add(owner)
+        db.session.add_all(Place(name=f"Place {i}", description="x" * 200, city="Paris",
+                                 price=i, owner_id=owner.id)
+                           for i in range(rows))
+        db.session.commit()
+    return app
+
+
+def measure(app, url):
+    client = app.test_client()
+    with app.app_context():
+        tracemalloc.start()
+        start = time.perf_counter()
+        res = client.get(url)
+        size = sum(len(chunk) for chunk in res.response)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        db.session.remove()
+    return peak, size, elapsed
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 5000, 20000]
+    for rows in sizes:
+        app = make_app(rows)
+        for label, url in (("all=true", "/api/v1/places/?all=true"),
+                           ("stream=1", "/api/v1/places/?stream=1")):
+            peak, size, elapsed = measure(app, url)
+            print(f"{rows:7,d} places  {label}: peak {peak / 2**20:7.1f} MiB  "
+                  f"body {size / 2**20:6.1f} MiB  {elapsed:6.2f}s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Benchmark: amenity inserts with one commit per row vs. one unit of work.
+
+Runs against a temporary on-disk SQLite file so that every commit pays a
+real fsync, like the development database does.
+
+Usage (from the BackEnd directory):
+    python benchmarks/bench_unit_of_work.py [rows]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DB_DIR = tempfile.mkdtemp(prefix="hbnb-bench-")
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(DB_DIR, 'bench.db')}"
+
+from app import create_app  # noqa: E402  (DATABASE_URL must be set first)
+from app.extensions import db  # noqa: E402
+from app.business.facade import HBnBFacade  # noqa: E402
+
+
+def insert_rows(facade, prefix, rows):
+    for i in range(rows):
+        facade.create_amenity({"name": f"{prefix}-{i}"})
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    app = create_app('development')
+    facade = HBnBFacade()
+
+    with app.app_context():
+        db.create_all()
+
+        start = time.perf_counter()
+        insert_rows(facade, "per-row", rows)
+        per_row = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with facade.transaction():
+            insert_rows(facade, "batched", rows)
+        batched = time.perf_counter() - start
+
+    print(f"{rows} inserts, one commit per row : {per_row:.3f}s ({rows / per_row:,.0f} rows/s)")
+    print(f"{rows} inserts, one unit of work   : {batched:.3f}s ({rows / batched:,.0f} rows/s)")
+    print(f"speed-up: {per_row / batched:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
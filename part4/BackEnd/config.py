@@ -13,21 +13,128 @@ class Config:
     # JWT Configuration
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or SECRET_KEY
     JWT_ACCESS_TOKEN_EXPIRES = 3600  # 1 hour in seconds
+    # 7 days; POST /auth/refresh for a new access token. Changing a user's
+    # is_admin flag or deleting the user revokes the tokens already issued.
+    JWT_REFRESH_TOKEN_EXPIRES = 7 * 24 * 3600
+    # flask-restx answers exceptions it has no handler for with a 500 unless
+    # they propagate; then flask-jwt-extended's app error handlers turn
+    # expired, revoked and invalid tokens into 401/422 (which is what makes
+    # the frontend refresh its access token)
+    PROPAGATE_EXCEPTIONS = True
+    
+    # Revoked tokens are stored in the revoked_tokens table and checked
+    # against an in-memory Bloom filter with this false positive rate,
+    # reloaded every rebuild_interval seconds (how long a revocation made
+    # by another process takes to reach this one).
+    TOKEN_BLOCKLIST = {'rebuild_interval': 60, 'error_rate': 0.01}
+    
+    # bcrypt cost factor (2^rounds iterations). Stored hashes made with
+    # another cost are replaced at the next successful login.
+    BCRYPT_LOG_ROUNDS = int(os.environ.get('BCRYPT_LOG_ROUNDS', 12))
+    
+    # bcrypt runs in a pool of worker processes. At most max_pending hashes
+    # are queued or running; a request that cannot get a slot within
+    # timeout seconds is answered 503. workers = 0 hashes in the request.
+    PASSWORD_HASHER = {'workers': min(4, os.cpu_count() or 1), 'max_pending': 64, 'timeout': 5}
     
     # SQLAlchemy Configuration
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///hbnb_dev.db'
+    
+    # SQLite tuning, applied to every new connection (other backends ignore it).
+    # busy_timeout comes first so the journal_mode switch can wait for locks.
+    SQLITE_PRAGMAS = {
+        'busy_timeout': 5000,        # ms to wait on a locked database
+        'journal_mode': 'WAL',       # readers no longer block behind writers
+        'synchronous': 'NORMAL',     # fsync at checkpoints only (safe with WAL)
+        'cache_size': -65536,        # page cache, negative = KiB (64 MiB)
+        'mmap_size': 268435456,      # memory-map up to 256 MiB of the file
+        'temp_store': 'MEMORY',      # temp tables and sort spills in RAM
+    }
+    
+    # Per-request SQL statistics: statement count and database time in a
+    # Server-Timing header and a JSON log line. Off: no overhead at all.
+    QUERY_STATS = {'enabled': False, 'server_timing': True, 'log': True}
+    
+    # Statements slower than threshold_ms are logged with their EXPLAIN QUERY
+    # PLAN to a rotating file (path None = instance/slow_queries.log) and
+    # summed per fingerprint for GET /api/v1/admin/slow-queries.
+    SLOW_QUERY_LOG = {
+        'enabled': True,
+        'threshold_ms': 100,
+        'path': None,
+        'max_bytes': 1024 * 1024,
+        'backup_count': 5,
+        'max_fingerprints': 500,
+    }
+    
+    # Sampling profiler: the Python stack of sample_rate of the requests is
+    # recorded every interval_ms, per route, for GET
+    # /api/v1/admin/profile/collapsed (and dump_dir at exit, if set).
+    PROFILER = {
+        'enabled': False,
+        'sample_rate': 0.01,
+        'interval_ms': 5,
+        'max_depth': 64,
+        'max_stacks': 5000,
+        'dump_dir': None,
+    }
+    
+    # Pagination (keyset/cursor based) for list endpoints
+    PAGE_SIZE_DEFAULT = 20
+    PAGE_SIZE_MAX = 100  # Hard upper bound, whatever the client asks for
+    LIST_ALL_MAX = 1000  # Items returned by ?all=true; X-Next-Cursor covers the rest
+    
+    # Maximum number of IDs accepted by ?ids= on the list endpoints
+    MULTI_GET_MAX_IDS = 100
+    
+    # Rows fetched per round trip when streaming a collection (?stream=1)
+    STREAM_BATCH_SIZE = 500
+    
+    # Largest radius accepted by GET /api/v1/places/nearby, in km
+    NEARBY_MAX_RADIUS_KM = 500
+    
+    # Maximum number of items accepted by the /batch create endpoints
+    BATCH_MAX_ITEMS = 1000
+    
+    # Read-through LRU cache in front of repository get(), per entity type.
+    # maxsize is a number of entries, ttl is in seconds.
+    ENTITY_CACHE = {
+        'user': {'enabled': True, 'maxsize': 1024, 'ttl': 60},
+        'place': {'enabled': True, 'maxsize': 2048, 'ttl': 60},
+        'amenity': {'enabled': True, 'maxsize': 256, 'ttl': 300},
+        'review': {'enabled': False, 'maxsize': 1024, 'ttl': 60},
+    }
+    
+    # In-process cache of marshalled GET responses, per endpoint. Entries are
+    # dropped as soon as this process commits to a table they depend on; ttl
+    # bounds staleness for other processes' writes. After ttl an entry is
+    # still served for stale_while_revalidate seconds while one request
+    # rebuilds it. Times are in seconds, maxsize is a number of entries.
+    RESPONSE_CACHE = {
+        'places': {'enabled': True, 'maxsize': 512, 'ttl': 30, 'stale_while_revalidate': 30},
+        'amenities': {'enabled': True, 'maxsize': 64, 'ttl': 300, 'stale_while_revalidate': 60},
+        'reviews_by_place': {'enabled': True, 'maxsize': 1024, 'ttl': 30,
+                             'stale_while_revalidate': 30},
+    }
 
 
 class DevelopmentConfig(Config):
     """Development environment configuration."""
     DEBUG = True
+    QUERY_STATS = dict(Config.QUERY_STATS, enabled=True)
+    PROFILER = dict(Config.PROFILER, enabled=True)
 
 
 class TestingConfig(Config):
     """Testing environment configuration."""
     TESTING = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///:memory:'  # In-memory database for tests
+    ENTITY_CACHE = {}  # Tests read the database directly unless they opt in
+    RESPONSE_CACHE = {}
+    SLOW_QUERY_LOG = {}
+    BCRYPT_LOG_ROUNDS = 4  # The minimum; tests don't need slow hashes
+    PASSWORD_HASHER = {'workers': 0, 'max_pending': 64, 'timeout': 5}
 
 
 class ProductionConfig(Config):
@@ -2,7 +2,16 @@
 """
 Database initialization script.
 Creates all database tables based on SQLAlchemy models.
+
+Usage:
+    python init_db.py            Drop and recreate every table
+    python init_db.py --upgrade  Add missing tables, columns, indexes and unique
+                                 constraints to an existing database and
+                                 backfill derived data
+    python init_db.py --repair   Recompute the place review aggregates
 """
+import argparse
+from sqlalchemy import UniqueConstraint, delete, func, inspect, select, text
 from app import create_app
 from app.extensions import db
 # Import all models to ensure they're registered
@@ -10,6 +19,8 @@ from app.models.user import User
 from app.models.place import Place
 from app.models.review import Review
 from app.models.amenity import Amenity
+from app.persistence.place_repository import PlaceRepository
+from app.utils.geo import geohash_encode
 
 def init_database():
     """Initialize the database and create all tables."""
@@ -41,5 +52,120 @@ def init_database():
         else:
             print("Admin user already exists")
 
+def add_missing_schema():
+    """Create missing tables, columns and indexes without dropping anything."""
+    inspector = inspect(db.engine)
+    for table in db.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            print(f"Creating table {table.name}...")
+            table.create(db.engine)
+            continue
+        existing = {column['name'] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(db.engine.dialect)}"
+            if column.server_default is not None:
+                ddl += f" NOT NULL DEFAULT {column.server_default.arg}"
+            print(f"Adding column {table.name}.{column.name}...")
+            db.session.execute(text(ddl))
+        db.session.commit()
+        existing = {index['name']: index['column_names']
+                    for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            columns = [column.name for column in index.columns]
+            if index.name in existing and existing[index.name] != columns:
+                # Same name, other columns: the definition changed
+                print(f"Rebuilding index {index.name}...")
+                index.drop(db.engine)
+            index.create(db.engine, checkfirst=True)
+        for constraint in table.constraints:
+            if isinstance(constraint, UniqueConstraint) and constraint.name:
+                add_unique_constraint(inspector, table, constraint)
+
+
+def add_unique_constraint(inspector, table, constraint):
+    """
+    Enforce a named unique constraint missing from an existing table.
+    
+    SQLite can't add a constraint to a table, so a unique index with the
+    same name is created instead. Rows that would violate it are deleted
+    first, keeping the oldest of each group, and reported.
+    """
+    columns = [column.name for column in constraint.columns]
+    present = [c['column_names'] for c in inspector.get_unique_constraints(table.name)]
+    present += [i['column_names'] for i in inspector.get_indexes(table.name) if i['unique']]
+    if columns in present:
+        return
+    rank = func.row_number().over(partition_by=[table.c[name] for name in columns],
+                                  order_by=[table.c.created_at, table.c.id]).label('rank')
+    ranked = select(table.c.id, rank).subquery()
+    duplicates = db.session.scalars(select(ranked.c.id).where(ranked.c.rank > 1)).all()
+    if duplicates:
+        print(f"Deleting {len(duplicates)} {table.name} rows duplicating "
+              f"({', '.join(columns)}): {', '.join(duplicates)}")
+        db.session.execute(delete(table).where(table.c.id.in_(duplicates)))
+    print(f"Creating unique index {constraint.name}...")
+    db.session.execute(text(f"CREATE UNIQUE INDEX IF NOT EXISTS {constraint.name} "
+                            f"ON {table.name}({', '.join(columns)})"))
+    db.session.commit()
+
+
+def backfill_geohash():
+    """Compute places.geohash for rows written before the column existed."""
+    places = Place.query.filter(
+        Place.geohash.is_(None),
+        Place.latitude.isnot(None),
+        Place.longitude.isnot(None)
+    ).all()
+    for place in places:
+        place.geohash = geohash_encode(place.latitude, place.longitude)
+    db.session.commit()
+    print(f"Backfilled geohash for {len(places)} places")
+
+
+def rebuild_place_search_index():
+    """Create (if needed) and repopulate the places_fts full-text index."""
+    PlaceRepository().rebuild_search_index()
+    print("Rebuilt place full-text index")
+
+
+def repair_rating_stats():
+    """Recompute the review aggregates of every place from its reviews."""
+    updated = PlaceRepository().recompute_rating_stats()
+    print(f"Recomputed review aggregates for {updated} places")
+
+
+def upgrade_database():
+    """Bring an existing database up to date with the models."""
+    app = create_app()
+    
+    with app.app_context():
+        add_missing_schema()
+        backfill_geohash()
+        rebuild_place_search_index()
+        repair_rating_stats()
+        print("Database upgraded successfully!")
+
+
+def repair_database():
+    """Recompute denormalized data that may have drifted."""
+    app = create_app()
+    
+    with app.app_context():
+        repair_rating_stats()
+
+
 if __name__ == '__main__':
-    init_database()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--upgrade', action='store_true',
+                        help='upgrade an existing database instead of recreating it')
+    parser.add_argument('--repair', action='store_true',
+                        help='recompute place review aggregates from the reviews table')
+    args = parser.parse_args()
+    if args.upgrade:
+        upgrade_database()
+    elif args.repair:
+        repair_database()
+    else:
+        init_database()
@@ -8,6 +8,8 @@ import os
 # Get configuration from environment variable, default to 'development'
 config_name = os.environ.get('FLASK_ENV', 'development')
 app = create_app(config_name)
+# Served: hash passwords in worker processes, started before any request thread
+app.extensions['password_hasher'].start()
 
 if __name__ == "__main__":
     app.run(debug=True)
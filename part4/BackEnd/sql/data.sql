@@ -48,6 +48,13 @@ INSERT INTO reviews (id, created_at, updated_at, text, rating, user_id, place_id
     ('review-sample-004', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Very peaceful and relaxing. Highly recommend!', 4, 'user-sample-003', 'place-sample-004'),
     ('review-sample-005', CURRENT_TIMESTAMP, CURRENT_TIMESTAMP, 'Good value for money. Clean and convenient.', 4, 'user-sample-001', 'place-sample-005');
 
+-- Refresh the denormalized review aggregates on places
+UPDATE places SET
+    review_count = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id),
+    rating_count = (SELECT COUNT(*) FROM reviews WHERE reviews.place_id = places.id AND rating > 0),
+    rating_sum = (SELECT COALESCE(SUM(rating), 0) FROM reviews WHERE reviews.place_id = places.id AND rating > 0)
+WHERE id LIKE 'place-sample-%';
+
 -- Display summary of inserted data
 SELECT 'Summary of Sample Data:' AS '';
 SELECT '========================' AS '';
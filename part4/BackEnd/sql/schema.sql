@@ -2,6 +2,9 @@
 -- This script creates all tables for the HBnB application
 
 -- Drop tables if they exist (in correct order due to foreign key constraints)
+DROP TABLE IF EXISTS places_fts;
+DROP TABLE IF EXISTS revoked_tokens;
+DROP TABLE IF EXISTS table_versions;
 DROP TABLE IF EXISTS place_amenity;
 DROP TABLE IF EXISTS reviews;
 DROP TABLE IF EXISTS places;
@@ -31,6 +34,10 @@ CREATE TABLE places (
     price FLOAT NOT NULL DEFAULT 0.0,
     latitude FLOAT,
     longitude FLOAT,
+    geohash VARCHAR(12),
+    review_count INTEGER NOT NULL DEFAULT 0,
+    rating_count INTEGER NOT NULL DEFAULT 0,
+    rating_sum INTEGER NOT NULL DEFAULT 0,
     owner_id CHAR(36) NOT NULL,
     FOREIGN KEY (owner_id) REFERENCES users(id) ON DELETE CASCADE
 );
@@ -44,6 +51,7 @@ CREATE TABLE reviews (
     rating INTEGER NOT NULL DEFAULT 0,
     user_id CHAR(36) NOT NULL,
     place_id CHAR(36) NOT NULL,
+    CONSTRAINT uq_reviews_user_place UNIQUE (user_id, place_id),
     FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE,
     FOREIGN KEY (place_id) REFERENCES places(id) ON DELETE CASCADE
 );
@@ -65,8 +73,58 @@ CREATE TABLE place_amenity (
     FOREIGN KEY (amenity_id) REFERENCES amenities(id) ON DELETE CASCADE
 );
 
+-- Create table_versions table (change counter per table, for ETags)
+CREATE TABLE table_versions (
+    name VARCHAR(64) PRIMARY KEY,
+    version INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Create revoked_tokens table (JWT blocklist: one token by jti, or all
+-- of a user's tokens issued before revoked_at when jti is NULL)
+CREATE TABLE revoked_tokens (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    jti VARCHAR(36) UNIQUE,
+    user_id VARCHAR(36),
+    revoked_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    expires_at TIMESTAMP NOT NULL
+);
+
 -- Create indexes for better query performance
 CREATE INDEX idx_places_owner_id ON places(owner_id);
+CREATE INDEX idx_places_city_price ON places(city, price);
+CREATE INDEX idx_places_price ON places(price);
+CREATE INDEX idx_places_geohash ON places(geohash);
 CREATE INDEX idx_reviews_user_id ON reviews(user_id);
-CREATE INDEX idx_reviews_place_id ON reviews(place_id);
+CREATE INDEX idx_reviews_place_id ON reviews(place_id, created_at, id);
 CREATE INDEX idx_users_email ON users(email);
+CREATE INDEX ix_revoked_tokens_user_id ON revoked_tokens(user_id);
+CREATE INDEX ix_revoked_tokens_expires_at ON revoked_tokens(expires_at);
+
+-- Keyset pagination walks every list in (created_at, id) order
+CREATE INDEX ix_users_created_at ON users(created_at);
+CREATE INDEX ix_places_created_at ON places(created_at);
+CREATE INDEX ix_reviews_created_at ON reviews(created_at);
+CREATE INDEX ix_amenities_created_at ON amenities(created_at);
+
+-- Full-text index over places (SQLite FTS5), kept in sync by triggers
+CREATE VIRTUAL TABLE places_fts USING fts5(
+    name, description, city, content='places', content_rowid='rowid'
+);
+
+CREATE TRIGGER places_fts_ai AFTER INSERT ON places BEGIN
+    INSERT INTO places_fts(rowid, name, description, city)
+    VALUES (new.rowid, new.name, new.description, new.city);
+END;
+
+CREATE TRIGGER places_fts_ad AFTER DELETE ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, name, description, city)
+    VALUES ('delete', old.rowid, old.name, old.description, old.city);
+END;
+
+CREATE TRIGGER places_fts_au AFTER UPDATE OF name, description, city ON places BEGIN
+    INSERT INTO places_fts(places_fts, rowid, name, description, city)
+    VALUES ('delete', old.rowid, old.name, old.description, old.city);
+    INSERT INTO places_fts(rowid, name, description, city)
+    VALUES (new.rowid, new.name, new.description, new.city);
+END;
@@ -0,0 +1,46 @@
+# tests/base.py
+import unittest
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+
+
+@contextmanager
+def count_queries():
+    """
+    Count SQL statements executed on the engine inside the block.
+
+    The table_versions lookup done once per request for ETags is left out.
+    """
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        if "FROM table_versions" not in statement:
+            statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", before_cursor_execute)
+
+
+class AppTestCase(unittest.TestCase):
+    """A testing app with a pushed app context and a fresh schema per test"""
+
+    def create_app(self):
+        """Build the app under test; override to change config or init extras."""
+        return create_app('testing')
+
+    def setUp(self):
+        self.app = self.create_app()
+        self.client = self.app.test_client()
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
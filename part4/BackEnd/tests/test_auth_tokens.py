@@ -0,0 +1,236 @@
+# tests/test_auth_tokens.py
+import unittest
+import threading
+import time
+from datetime import timedelta
+from unittest import mock
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.business.facade import HBnBFacade
+from app.extensions import db
+from app.models.revoked_token import RevokedToken
+from app.services.revocation_store import RevocationStore, revocation_store
+from app.utils.bloom import BloomFilter
+from config import TestingConfig, config
+from tests.base import AppTestCase, count_queries
+
+
+class TestRefreshTokens(AppTestCase):
+    """Refresh and logout endpoints"""
+
+    def setUp(self):
+        super().setUp()
+        HBnBFacade().create_user({"first_name": "Ann", "last_name": "Lee", "email": "ann@x.com",
+                                  "password": "secret", "is_admin": True})
+        res = self.client.post("/api/v1/auth/login",
+                               json={"email": "ann@x.com", "password": "secret"})
+        self.tokens = res.get_json()
+
+    def _post(self, url, token):
+        return self.client.post(url, headers={"Authorization": f"Bearer {token}"})
+
+    def _get(self, url, token):
+        return self.client.get(url, headers={"Authorization": f"Bearer {token}"})
+
+    def test_refresh_skips_password_and_database(self):
+        # The first check loads the revoked token filter; later ones use it
+        self._get("/api/v1/protected/test", self.tokens["access_token"])
+        with mock.patch("app.services.password_hasher.PasswordHasher._run") as run, \
+                count_queries() as statements:
+            res = self._post("/api/v1/auth/refresh", self.tokens["refresh_token"])
+        self.assertEqual(res.status_code, 200)
+        run.assert_not_called()
+        self.assertEqual(statements, [])
+        access = res.get_json()["access_token"]
+        res = self._get("/api/v1/protected/admin-only", access)
+        self.assertEqual(res.status_code, 200)
+
+    def test_token_types_are_not_interchangeable(self):
+        self.assertEqual(self._post("/api/v1/auth/refresh", self.tokens["access_token"])
+                         .status_code, 422)
+        self.assertEqual(self._get("/api/v1/protected/test", self.tokens["refresh_token"])
+                         .status_code, 422)
+
+    def test_logout_revokes_each_token(self):
+        self.assertEqual(self._post("/api/v1/auth/logout", self.tokens["access_token"])
+                         .status_code, 200)
+        self.assertEqual(self._get("/api/v1/protected/test", self.tokens["access_token"])
+                         .status_code, 401)
+        self.assertEqual(self._post("/api/v1/auth/refresh", self.tokens["refresh_token"])
+                         .status_code, 200)
+
+        self._post("/api/v1/auth/logout", self.tokens["refresh_token"])
+        self.assertEqual(self._post("/api/v1/auth/refresh", self.tokens["refresh_token"])
+                         .status_code, 401)
+
+    def test_admin_revokes_every_token_of_a_user(self):
+        guest = HBnBFacade().create_user({"first_name": "Bob", "last_name": "Ray",
+                                          "email": "bob@x.com", "password": "secret"})
+        tokens = self.client.post("/api/v1/auth/login",
+                                  json={"email": "bob@x.com", "password": "secret"}).get_json()
+        res = self._post(f"/api/v1/admin/users/{guest.id}/revoke-tokens",
+                         self.tokens["access_token"])
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(self._get("/api/v1/protected/test", tokens["access_token"])
+                         .status_code, 401)
+        self.assertEqual(self._post("/api/v1/auth/refresh", tokens["refresh_token"])
+                         .status_code, 401)
+        self.assertEqual(self._get("/api/v1/protected/test", self.tokens["access_token"])
+                         .status_code, 200)
+        self.assertEqual(self._post("/api/v1/admin/users/nope/revoke-tokens",
+                                    self.tokens["access_token"]).status_code, 404)
+
+    def test_role_change_and_deletion_revoke_refresh_tokens(self):
+        facade = HBnBFacade()
+        users = [facade.create_user({"first_name": "Bob", "last_name": "Ray", "is_admin": True,
+                                     "email": f"bob{i}@x.com", "password": "secret"})
+                 for i in range(2)]
+        tokens = [self.client.post("/api/v1/auth/login",
+                                   json={"email": user.email, "password": "secret"}).get_json()
+                  for user in users]
+        facade.update_user(users[0].id, {"first_name": "Robert"})
+        self.assertEqual(self._post("/api/v1/auth/refresh", tokens[0]["refresh_token"])
+                         .status_code, 200)
+        facade.update_user(users[0].id, {"is_admin": False})
+        facade.delete_user(users[1].id)
+        for pair in tokens:
+            self.assertEqual(self._post("/api/v1/auth/refresh", pair["refresh_token"])
+                             .status_code, 401)
+
+
+class TestJWTErrorsOutsideTesting(AppTestCase):
+    """Token errors keep their status when exceptions don't propagate"""
+
+    def create_app(self):
+        served = type('ServedConfig', (TestingConfig,), {'TESTING': False})
+        with mock.patch.dict(config, {'served': served}):
+            app = create_app('served')
+        self.assertFalse(app.config['TESTING'])
+        return app
+
+    def _get(self, token):
+        return self.client.get("/api/v1/protected/test",
+                               headers={"Authorization": f"Bearer {token}"})
+
+    def test_expired_and_revoked_tokens_get_401(self):
+        expired = create_access_token(identity="u1", expires_delta=timedelta(seconds=-1))
+        self.assertEqual(self._get(expired).status_code, 401)
+        token = create_access_token(identity="u1")
+        self.assertEqual(self._get(token).status_code, 200)
+        revocation_store().revoke_user("u1")
+        self.assertEqual(self._get(token).status_code, 401)
+        self.assertEqual(self._get("garbage").status_code, 422)
+
+
+class TestRevocationStore(AppTestCase):
+    """RevocationStore persistence and in-memory filter"""
+
+    def setUp(self):
+        super().setUp()
+        self.store = RevocationStore(max_token_lifetime=3600)
+        self.exp = time.time() + 600
+
+    def _payload(self, jti, sub="u1", iat=None):
+        return {"jti": jti, "sub": sub, "iat": iat or int(time.time()), "exp": self.exp}
+
+    def test_unknown_tokens_cost_no_query(self):
+        self.store.rebuild()
+        with count_queries() as statements:
+            self.assertFalse(self.store.is_revoked(self._payload("fresh")))
+        self.assertEqual(statements, [])
+
+    def test_other_process_revocations_arrive_with_rebuild(self):
+        other = RevocationStore(max_token_lifetime=3600)
+        self.store.rebuild()
+        other.revoke("jti-1", self.exp)
+        self.assertTrue(other.is_revoked(self._payload("jti-1")))
+        self.assertFalse(self.store.is_revoked(self._payload("jti-1")))
+        self.store.rebuild()
+        self.assertTrue(self.store.is_revoked(self._payload("jti-1")))
+        self.assertEqual(db.session.query(RevokedToken).count(), 1)
+
+    def test_later_rebuilds_run_in_background(self):
+        store = RevocationStore(max_token_lifetime=3600, app=self.app)
+        store.rebuild()
+        self.store.revoke("jti-1", self.exp)
+        calls, release = [], threading.Event()
+        rebuild = store.rebuild
+
+        def slow_rebuild():
+            calls.append(threading.current_thread().name)
+            release.wait(5)
+            rebuild()
+
+        store.rebuild = slow_rebuild
+        store._next_rebuild = 0
+        # The request thread goes on with the current filter
+        self.assertFalse(store.is_revoked(self._payload("jti-1")))
+        release.set()
+        deadline = time.time() + 5
+        while store.rebuilds < 2 and time.time() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(calls, ["hbnb-revocations"])
+        self.assertTrue(store.is_revoked(self._payload("jti-1")))
+
+    def test_checks_wait_for_the_first_rebuild(self):
+        self.store.revoke_user("u1")
+        store = RevocationStore(max_token_lifetime=3600, app=self.app)
+        payload = self._payload("a", iat=int(time.time()) - 5)
+        started, results = threading.Event(), []
+
+        def slow_filter(*args):
+            started.set()
+            time.sleep(0.2)
+            return BloomFilter(*args)
+
+        def check():
+            with self.app.app_context():
+                results.append(store.is_revoked(payload))
+                db.session.remove()
+
+        with mock.patch("app.services.revocation_store.BloomFilter", side_effect=slow_filter):
+            threads = [threading.Thread(target=check)]
+            threads[0].start()
+            started.wait(5)
+            threads += [threading.Thread(target=check) for _ in range(4)]
+            for thread in threads[1:]:
+                thread.start()
+            for thread in threads:
+                thread.join(5)
+        self.assertEqual(results, [True] * 5)
+        self.assertEqual(store.rebuilds, 1)
+
+    def test_bloom_false_positive_is_checked_against_table(self):
+        self.store.rebuild()
+        self.store._bloom = mock.MagicMock(__contains__=lambda self, key: True)
+        self.assertFalse(self.store.is_revoked(self._payload("fresh")))
+        self.assertEqual(self.store.stats()["false_positives"], 1)
+
+    def test_expired_rows_are_purged(self):
+        self.store.revoke("old", time.time() - 1)
+        self.store.revoke("new", self.exp)
+        jtis = [row.jti for row in db.session.query(RevokedToken)]
+        self.assertEqual(jtis, ["new"])
+
+    def test_user_cutoff(self):
+        issued = int(time.time()) - 5
+        self.store.revoke_user("u1")
+        self.assertTrue(self.store.is_revoked(self._payload("a", iat=issued)))
+        self.assertFalse(self.store.is_revoked(self._payload("b", iat=int(time.time()) + 5)))
+        self.assertFalse(self.store.is_revoked(self._payload("c", sub="u2", iat=issued)))
+
+
+class TestBloomFilter(unittest.TestCase):
+    """BloomFilter sizing and membership"""
+
+    def test_no_false_negatives_and_bounded_false_positives(self):
+        bloom = BloomFilter(1000, 0.01)
+        for i in range(1000):
+            bloom.add(f"in-{i}")
+        self.assertTrue(all(f"in-{i}" in bloom for i in range(1000)))
+        false_positives = sum(f"out-{i}" in bloom for i in range(10000))
+        self.assertLess(false_positives, 300)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,129 @@
+# tests/test_batch.py
+import unittest
+import json
+from flask_jwt_extended import create_access_token
+from app.business.facade import HBnBFacade
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from tests.base import AppTestCase, count_queries
+
+
+class TestBatchCreate(AppTestCase):
+    """POST /batch endpoints for places, amenities and reviews"""
+
+    def setUp(self):
+        super().setUp()
+        self.admin = User(first_name="A", last_name="D", email="admin@x.com",
+                          password="x", is_admin=True)
+        self.owner = User(first_name="O", last_name="W", email="owner@x.com", password="x")
+        self.guest = User(first_name="G", last_name="U", email="guest@x.com", password="x")
+        db.session.add_all([self.admin, self.owner, self.guest])
+        db.session.commit()
+
+    def _post(self, path, items, user):
+        token = create_access_token(identity=user.id,
+                                    additional_claims={"is_admin": user.is_admin})
+        return self.client.post(path, data=json.dumps(items),
+                                content_type="application/json",
+                                headers={"Authorization": f"Bearer {token}"})
+
+    def test_places_batch_reports_per_item_errors(self):
+        items = [{"name": f"P{i}", "city": "Paris", "price": i, "owner_id": self.owner.id}
+                 for i in range(50)]
+        items += [{"name": "No owner", "city": "Paris", "owner_id": "missing"},
+                  {"city": "Paris", "owner_id": self.owner.id},
+                  "not an object"]
+        with count_queries() as statements:
+            res = self._post("/api/v1/places/batch", items, self.admin)
+        self.assertEqual(res.status_code, 207)
+        data = json.loads(res.data)
+        self.assertEqual((data["created"], data["failed"]), (50, 3))
+        self.assertEqual([r["index"] for r in data["results"] if "error" in r], [50, 51, 52])
+        self.assertEqual(Place.query.count(), 50)
+        # One IN (...) lookup for the owners plus batched INSERTs, not one per row
+        inserts = [s for s in statements if s.startswith("INSERT")]
+        self.assertLess(len(inserts), 5)
+
+    def test_places_batch_forces_owner_for_non_admin(self):
+        res = self._post("/api/v1/places/batch",
+                         [{"name": "Mine", "city": "Nice", "owner_id": self.admin.id}],
+                         self.owner)
+        self.assertEqual(res.status_code, 201)
+        self.assertEqual(Place.query.one().owner_id, self.owner.id)
+
+    def test_amenities_batch(self):
+        db.session.add(Amenity(name="WiFi"))
+        db.session.commit()
+        items = [{"name": "WiFi"}, {"name": "Pool"}, {"name": "Pool"}, {"name": "TV"}]
+        res = self._post("/api/v1/amenities/batch", items, self.admin)
+        data = json.loads(res.data)
+        self.assertEqual(data["created"], 2)
+        self.assertEqual(Amenity.query.count(), 3)
+        self.assertEqual(self._post("/api/v1/amenities/batch", items, self.owner).status_code, 403)
+
+    def test_reviews_batch(self):
+        place = Place(name="Loft", city="Paris", price=50, owner_id=self.owner.id)
+        db.session.add(place)
+        db.session.commit()
+        items = [{"text": "Great", "place_id": place.id, "user_id": self.guest.id},
+                 {"text": "Again", "place_id": place.id, "user_id": self.guest.id},
+                 {"text": "Mine", "place_id": place.id, "user_id": self.owner.id},
+                 {"text": "Where?", "place_id": "missing", "user_id": self.guest.id}]
+        res = self._post("/api/v1/reviews/batch", items, self.admin)
+        errors = [r.get("error") for r in json.loads(res.data)["results"]]
+        self.assertEqual(errors, [None, "You have already reviewed this place",
+                                  "You cannot review your own place",
+                                  "Valid place_id is required"])
+        self.assertEqual(Review.query.count(), 1)
+
+    def test_non_string_ids_are_rejected(self):
+        for path, item in [("/api/v1/reviews/batch", {"text": "Hm", "place_id": ["x"]}),
+                           ("/api/v1/reviews/batch", {"text": "Hm", "user_id": {"id": 1}}),
+                           ("/api/v1/places/batch", {"name": "P", "city": "C", "owner_id": 7})]:
+            res = self._post(path, [{"text": "Ok"}, item], self.admin)
+            self.assertEqual(res.status_code, 400, item)
+            self.assertIn("Item 1", json.loads(res.data)["message"])
+        facade = HBnBFacade()
+        results = facade.create_reviews_batch([{"text": "Hm", "place_id": ["x"],
+                                                "user_id": self.guest.id}])
+        self.assertEqual(results, [{"index": 0, "error": "Valid place_id is required"}])
+        results = facade.create_places_batch([{"name": "P", "city": "C", "owner_id": [1]}])
+        self.assertEqual(results, [{"index": 0, "error": "Valid owner_id is required"}])
+        with self.assertRaisesRegex(ValueError, "strings"):
+            facade.get_places_by_ids([self.owner.id, ["x"]])
+
+    def test_malformed_fields_are_per_item_errors(self):
+        ok = {"name": "Fine", "city": "Paris", "owner_id": self.owner.id}
+        items = [ok, dict(ok, price="abc"), dict(ok, latitude="abc"),
+                 dict(ok, name=["x"]), dict(ok, price=True)]
+        res = self._post("/api/v1/places/batch", items, self.admin)
+        self.assertEqual(res.status_code, 207)
+        errors = [r.get("error") for r in json.loads(res.data)["results"]]
+        self.assertEqual(errors, [None, "price must be a number", "latitude must be a number",
+                                  "name must be a string", "price must be a number"])
+        self.assertEqual(Place.query.count(), 1)
+
+        res = self._post("/api/v1/amenities/batch", [{"name": ["x"]}, {"name": "Pool"}],
+                         self.admin)
+        self.assertEqual(res.status_code, 207)
+        self.assertEqual(json.loads(res.data)["results"][0]["error"],
+                         "Amenity name must be a string")
+        self.assertEqual(Amenity.query.count(), 1)
+
+        place = Place.query.one()
+        res = self._post("/api/v1/reviews/batch", [{"text": {"a": 1}, "place_id": place.id,
+                                                    "user_id": self.guest.id}], self.admin)
+        self.assertEqual(json.loads(res.data)["results"][0]["error"],
+                         "Review text must be a string")
+
+    def test_rejects_non_array_and_oversized(self):
+        self.app.config['BATCH_MAX_ITEMS'] = 2
+        self.assertEqual(self._post("/api/v1/places/batch", {"name": "x"}, self.admin).status_code, 400)
+        self.assertEqual(self._post("/api/v1/places/batch", [{}] * 3, self.admin).status_code, 413)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+# tests/test_conditional.py
+import unittest
+from datetime import datetime, timezone
+from unittest import mock
+from flask_jwt_extended import create_access_token
+from app.business.facade import HBnBFacade
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenity
+from app.models.user import User
+from app.persistence.table_versions import get_versions
+from tests.base import AppTestCase
+
+
+class TestConditionalGet(AppTestCase):
+    """ETag / Last-Modified revalidation on GET endpoints"""
+
+    def setUp(self):
+        super().setUp()
+        self.facade = HBnBFacade()
+        owner = User(first_name="Owner", last_name="One", email="owner@x.com", password="x")
+        db.session.add(owner)
+        db.session.flush()
+        self.place = Place(name="Loft", city="Paris", price=90, owner_id=owner.id)
+        db.session.add(self.place)
+        db.session.commit()
+
+    def _revalidate(self, url, res, header="If-None-Match", validator="ETag"):
+        return self.client.get(url, headers={header: res.headers[validator]})
+
+    def test_single_resource_not_modified(self):
+        url = f"/api/v1/places/{self.place.id}"
+        res = self.client.get(url)
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(res.headers["ETag"].startswith('W/"'))
+        self.assertIn("Last-Modified", res.headers)
+
+        with mock.patch("flask_restx.marshalling.marshal") as marshal:
+            again = self._revalidate(url, res)
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.data, b"")
+        self.assertEqual(again.headers["ETag"], res.headers["ETag"])
+        marshal.assert_not_called()
+
+        self.assertEqual(self._revalidate(url, res, "If-Modified-Since", "Last-Modified")
+                         .status_code, 304)
+
+    def test_update_changes_etag(self):
+        url = f"/api/v1/places/{self.place.id}"
+        res = self.client.get(url)
+        self.facade.update_place(self.place.id, {"price": 120})
+        again = self._revalidate(url, res)
+        self.assertEqual(again.status_code, 200)
+        self.assertNotEqual(again.headers["ETag"], res.headers["ETag"])
+
+    def test_amenity_changes_change_place_etag(self):
+        url = f"/api/v1/places/{self.place.id}"
+        res = self.client.get(url)
+        wifi = Amenity(name="Wifi")
+        self.place.amenities.append(wifi)
+        db.session.commit()
+        added = self._revalidate(url, res)
+        self.assertEqual(added.status_code, 200)
+        self.assertEqual(len(added.json["amenities"]), 1)
+        self.assertEqual(self._revalidate(url, added).status_code, 304)
+        # Written around the ORM: only the ETag can tell
+        db.session.execute(place_amenity.delete())
+        db.session.commit()
+        removed = self._revalidate(url, added)
+        self.assertEqual(removed.status_code, 200)
+        self.assertEqual(removed.json["amenities"], [])
+
+    def test_amenity_changes_touch_last_modified(self):
+        url = f"/api/v1/places/{self.place.id}"
+        res = self.client.get(url)
+        with mock.patch("app.models.place.datetime") as clock:
+            clock.now.return_value = datetime(2100, 1, 1, tzinfo=timezone.utc)
+            self.place.amenities.append(Amenity(name="Wifi"))
+            db.session.commit()
+        again = self._revalidate(url, res, "If-Modified-Since", "Last-Modified")
+        self.assertEqual(again.status_code, 200)
+
+    def test_representation_is_part_of_the_etag(self):
+        url = f"/api/v1/places/{self.place.id}"
+        full = self.client.get(url)
+        partial = self.client.get(url + "?fields=name")
+        self.assertNotEqual(full.headers["ETag"], partial.headers["ETag"])
+
+    def test_collection_follows_table_version(self):
+        url = "/api/v1/amenities/"
+        res = self.client.get(url)
+        self.assertEqual(self._revalidate(url, res).status_code, 304)
+        self.facade.create_amenity({"name": "Wifi"})
+        again = self._revalidate(url, res)
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual(len(again.json), 1)
+
+    def test_new_review_refreshes_place_list(self):
+        guest = User(first_name="Guest", last_name="Two", email="guest@x.com", password="x")
+        db.session.add(guest)
+        db.session.commit()
+        url = "/api/v1/places/"
+        res = self.client.get(url)
+        self.assertEqual(res.json[0]["review_count"], 0)
+        token = create_access_token(identity=guest.id)
+        posted = self.client.post("/api/v1/reviews/", headers={"Authorization": f"Bearer {token}"},
+                                  json={"text": "Nice", "rating": 4, "place_id": self.place.id})
+        self.assertEqual(posted.status_code, 201)
+        again = self._revalidate(url, res)
+        self.assertEqual(again.status_code, 200)
+        self.assertEqual((again.json[0]["review_count"], again.json[0]["avg_rating"]), (1, 4.0))
+
+    def test_rolled_back_write_keeps_version(self):
+        before = get_versions(["amenities"])["amenities"][0]
+        with self.assertRaises(RuntimeError):
+            with self.facade.transaction():
+                self.facade.create_amenity({"name": "Pool"})
+                raise RuntimeError
+        self.assertEqual(get_versions(["amenities"])["amenities"][0], before)
+        self.assertEqual(Amenity.query.count(), 0)
+
+    def test_bulk_update_bumps_version(self):
+        before = get_versions(["places"])["places"][0]
+        self.facade.place_repo.recompute_rating_stats()
+        self.assertEqual(get_versions(["places"])["places"][0], before + 1)
+
+    def test_missing_resource_still_404(self):
+        self.assertEqual(self.client.get("/api/v1/places/nope").status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,125 @@
+# tests/test_entity_cache.py
+import unittest
+import json
+from unittest import mock
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.business.facade import HBnBFacade
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.persistence.entity_cache import LRUCache
+from tests.base import AppTestCase, count_queries
+
+
+class TestLRUCache(unittest.TestCase):
+    """Size bound and TTL of the cache itself"""
+
+    def test_lru_eviction(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("a"), 1)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_ttl_expiry(self):
+        cache = LRUCache(maxsize=2, ttl=10)
+        with mock.patch("app.persistence.entity_cache.time.monotonic", return_value=100):
+            cache.put("a", 1)
+        with mock.patch("app.persistence.entity_cache.time.monotonic", return_value=111):
+            self.assertIsNone(cache.get("a"))
+
+
+class TestCachedRepository(AppTestCase):
+    """Read-through caching of get() across requests"""
+
+    def create_app(self):
+        app = create_app('testing')
+        app.config['ENTITY_CACHE'] = {
+            'user': {'enabled': True}, 'place': {'enabled': True},
+        }
+        return app
+
+    def setUp(self):
+        super().setUp()
+        self.facade = HBnBFacade()
+        # The repositories are shared: start each test with fresh caches
+        for repo in (self.facade.user_repo, self.facade.place_repo):
+            repo._cache = None
+        owner = User(first_name="O", last_name="W", email="o@x.com", password="x", is_admin=True)
+        db.session.add(owner)
+        db.session.flush()
+        self.place = Place(name="Loft", city="Paris", price=50, owner_id=owner.id)
+        self.place.amenities.append(Amenity(name="WiFi"))
+        db.session.add(self.place)
+        db.session.commit()
+        self.owner_id, self.place_id = owner.id, self.place.id
+        db.session.remove()
+
+    def test_second_request_hits_cache(self):
+        self.facade.get_place(self.place_id)
+        db.session.remove()  # end of "request"
+        with count_queries() as statements:
+            place = self.facade.get_place(self.place_id)
+        self.assertEqual(place.name, "Loft")
+        self.assertEqual(statements, [])
+        # Relationships still load from the caller's session
+        self.assertEqual([a.name for a in place.amenities], ["WiFi"])
+        stats = self.facade.place_repo.cache_stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+
+    def test_update_invalidates(self):
+        self.facade.get_place(self.place_id)
+        db.session.remove()
+        self.facade.update_place(self.place_id, {"name": "Barn"})
+        db.session.remove()
+        self.assertEqual(self.facade.get_place(self.place_id).name, "Barn")
+
+    def test_eviction_waits_for_commit(self):
+        self.facade.get_place(self.place_id)
+        cache = self.facade.place_repo.cache
+        stale = cache.get(self.place_id)
+        db.session.remove()
+        with self.facade.transaction():
+            self.facade.update_place(self.place_id, {"name": "Barn"})
+            # A concurrent request caching the committed (old) row meanwhile
+            cache.put(self.place_id, stale)
+        db.session.remove()
+        self.assertEqual(self.facade.get_place(self.place_id).name, "Barn")
+
+    def test_rollback_keeps_entry(self):
+        self.facade.get_place(self.place_id)
+        db.session.remove()
+        with self.assertRaises(RuntimeError):
+            with self.facade.transaction():
+                self.facade.update_place(self.place_id, {"name": "Barn"})
+                raise RuntimeError
+        db.session.remove()
+        with count_queries() as statements:
+            self.assertEqual(self.facade.get_place(self.place_id).name, "Loft")
+        self.assertEqual(statements, [])
+
+    def test_disabled_type_bypasses_cache(self):
+        self.app.config['ENTITY_CACHE']['place']['enabled'] = False
+        self.facade.get_place(self.place_id)
+        db.session.remove()
+        with count_queries() as statements:
+            self.facade.get_place(self.place_id)
+        self.assertNotEqual(statements, [])
+
+    def test_stats_endpoint_is_admin_only(self):
+        token = create_access_token(identity=self.owner_id, additional_claims={"is_admin": True})
+        res = self.client.get("/api/v1/admin/cache", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(res.status_code, 200)
+        self.assertIn("place", json.loads(res.data))
+        token = create_access_token(identity=self.owner_id)
+        res = self.client.get("/api/v1/admin/cache", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(res.status_code, 403)
+
+
+if __name__ == "__main__":
+    unittest.main()
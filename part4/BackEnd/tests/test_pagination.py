@@ -0,0 +1,122 @@
+# tests/test_pagination.py
+import unittest
+import json
+from datetime import datetime, timedelta
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.amenity import Amenity
+from tests.base import AppTestCase, count_queries
+
+
+class PaginationTestCase(AppTestCase):
+    """Shared fixture: twelve amenities, page size capped at 5"""
+
+    def create_app(self):
+        app = create_app('testing')
+        app.config['PAGE_SIZE_MAX'] = 5
+        return app
+
+    def setUp(self):
+        super().setUp()
+        # Identical timestamps on half the rows exercise the id tie-breaker
+        base = datetime(2024, 1, 1)
+        for i in range(12):
+            db.session.add(Amenity(name=f"Amenity {i:02d}",
+                                   created_at=base + timedelta(minutes=i // 2)))
+        db.session.commit()
+
+
+class TestPagination(PaginationTestCase):
+    """Keyset pagination on list endpoints"""
+
+    def _walk(self, limit):
+        seen, cursor, pages = [], None, 0
+        while True:
+            url = f"/api/v1/amenities/?limit={limit}"
+            if cursor:
+                url += f"&cursor={cursor}"
+            res = self.client.get(url)
+            self.assertEqual(res.status_code, 200)
+            seen.extend(a["id"] for a in json.loads(res.data))
+            pages += 1
+            cursor = res.headers.get("X-Next-Cursor")
+            if not cursor:
+                return seen, pages
+
+    def test_walk_returns_every_row_once(self):
+        seen, pages = self._walk(limit=4)
+        self.assertEqual(len(seen), 12)
+        self.assertEqual(len(set(seen)), 12)
+        self.assertEqual(pages, 3)
+
+    def test_limit_is_capped(self):
+        res = self.client.get("/api/v1/amenities/?limit=1000")
+        self.assertEqual(len(json.loads(res.data)), 5)
+        self.assertIn("X-Next-Cursor", res.headers)
+        self.assertIn('rel="next"', res.headers["Link"])
+
+    def test_all_opt_in_returns_full_list(self):
+        res = self.client.get("/api/v1/amenities/?all=true")
+        self.assertEqual(len(json.loads(res.data)), 12)
+        self.assertNotIn("X-Next-Cursor", res.headers)
+
+    def test_all_is_capped(self):
+        self.app.config['LIST_ALL_MAX'] = 8
+        res = self.client.get("/api/v1/amenities/?all=true")
+        self.assertEqual(len(json.loads(res.data)), 8)
+        cursor = res.headers["X-Next-Cursor"]
+        res = self.client.get(f"/api/v1/amenities/?all=true&cursor={cursor}")
+        self.assertEqual(len(json.loads(res.data)), 4)
+        self.assertNotIn("X-Next-Cursor", res.headers)
+
+    def test_invalid_cursor_and_limit(self):
+        self.assertEqual(self.client.get("/api/v1/amenities/?cursor=nope").status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/amenities/?limit=0").status_code, 400)
+
+    def test_users_endpoint_is_paginated(self):
+        for i in range(7):
+            user = User(first_name="U", last_name=str(i), email=f"u{i}@x.com")
+            user.password = "x"
+            db.session.add(user)
+        db.session.commit()
+        res = self.client.get("/api/v1/users/")
+        self.assertEqual(len(json.loads(res.data)), 5)
+
+
+class TestMultiGet(PaginationTestCase):
+    """?ids= on list endpoints"""
+
+    def _ids(self):
+        return [a.id for a in Amenity.query.order_by(Amenity.name)]
+
+    def test_preserves_order_and_skips_missing(self):
+        ids = self._ids()
+        wanted = [ids[3], "missing", ids[0], ids[7], ids[3]]
+        res = self.client.get("/api/v1/amenities/?ids=" + ",".join(wanted))
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual([a["id"] for a in json.loads(res.data)], [ids[3], ids[0], ids[7]])
+
+    def test_single_query_ignores_page_size(self):
+        ids = self._ids()
+        with count_queries() as statements:
+            res = self.client.get("/api/v1/amenities/?ids=" + ",".join(ids))
+        self.assertEqual(len(json.loads(res.data)), 12)
+        self.assertEqual(len(statements), 1)
+
+    def test_id_count_is_capped(self):
+        self.app.config['MULTI_GET_MAX_IDS'] = 3
+        res = self.client.get("/api/v1/amenities/?ids=a,b,c,d")
+        self.assertEqual(res.status_code, 400)
+
+    def test_users_by_ids(self):
+        user = User(first_name="U", last_name="X", email="ux@x.com")
+        user.password = "x"
+        db.session.add(user)
+        db.session.commit()
+        res = self.client.get(f"/api/v1/users/?ids={user.id},other")
+        self.assertEqual([u["email"] for u in json.loads(res.data)], ["ux@x.com"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,153 @@
+# tests/test_password_hasher.py
+import unittest
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+from flask_jwt_extended import create_access_token
+from app.business.facade import HBnBFacade
+from app.extensions import db
+from app.models.user import User
+from app.services.password_hasher import (PasswordHasher, PasswordHasherBusy, hash_rounds,
+                                          password_hasher)
+from tests.base import AppTestCase
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLogin(AppTestCase):
+    """POST /api/v1/auth/login with the password hasher"""
+
+    def setUp(self):
+        super().setUp()
+        self.facade = HBnBFacade()
+        self.user = self.facade.create_user({"first_name": "Ann", "last_name": "Lee",
+                                             "email": "ann@x.com", "password": "secret"})
+        self.hasher = password_hasher()
+
+    def _login(self, password="secret"):
+        return self.client.post("/api/v1/auth/login",
+                                json={"email": "ann@x.com", "password": password})
+
+    def test_configured_cost(self):
+        self.assertEqual(hash_rounds(self.user.password), 4)
+        self.assertEqual(self._login().status_code, 200)
+        self.assertEqual(self._login("wrong").status_code, 401)
+
+    def test_rehash_on_login_when_cost_changes(self):
+        old_hash = self.user.password
+        self.hasher.rounds = 5
+        self.assertEqual(self._login().status_code, 200)
+        user = db.session.get(User, self.user.id)
+        self.assertNotEqual(user.password, old_hash)
+        self.assertEqual(hash_rounds(user.password), 5)
+        self.assertEqual(self._login().status_code, 200)
+
+    def test_failed_login_does_not_rehash(self):
+        old_hash = self.user.password
+        self.hasher.rounds = 5
+        self._login("wrong")
+        self.assertEqual(db.session.get(User, self.user.id).password, old_hash)
+
+    def test_saturated_hasher_answers_503(self):
+        self.hasher.timeout = 0
+        for _ in range(self.hasher.max_pending):
+            self.hasher._slots.acquire()
+        try:
+            res = self._login()
+        finally:
+            for _ in range(self.hasher.max_pending):
+                self.hasher._slots.release()
+        self.assertEqual(res.status_code, 503)
+        self.assertEqual(res.headers["Retry-After"], "1")
+        self.assertEqual(self.hasher.stats()["rejected"], 1)
+
+    def test_stats_endpoint(self):
+        admin = User(first_name="A", last_name="D", email="a@x.com", password="x", is_admin=True)
+        db.session.add(admin)
+        db.session.commit()
+        self._login()
+        token = create_access_token(identity=admin.id, additional_claims={"is_admin": True})
+        res = self.client.get("/api/v1/admin/password-hasher",
+                              headers={"Authorization": f"Bearer {token}"})
+        stats = json.loads(res.data)
+        self.assertEqual((stats["rounds"], stats["pending"]), (4, 0))
+        self.assertEqual(stats["completed"], 2)  # create_user's hash + the login check
+
+
+class TestProcessPool(unittest.TestCase):
+    """PasswordHasher running bcrypt in worker processes"""
+
+    def test_hash_and_verify_in_workers(self):
+        hasher = PasswordHasher(rounds=4, workers=1)
+        try:
+            hasher.start()
+            # Never forked from the (threaded) server process
+            self.assertIn(hasher._executor._mp_context.get_start_method(),
+                          ("forkserver", "spawn"))
+            hashed = hasher.hash("secret")
+            self.assertTrue(hasher.verify(hashed, "secret"))
+            self.assertFalse(hasher.verify(hashed, "other"))
+        finally:
+            hasher.shutdown()
+        self.assertFalse(hasher.needs_rehash(hashed))
+        self.assertTrue(PasswordHasher(rounds=5).needs_rehash(hashed))
+
+    def test_scripts_without_main_guard(self):
+        # Worker processes re-import __main__: a script creating an app and
+        # hashing at import time must neither fail nor start pools there
+        script = textwrap.dedent("""
+            import sys
+            from config import TestingConfig, config
+            from app import create_app
+            from app.services.password_hasher import password_hasher
+            config['pooled'] = type('Pooled', (TestingConfig,), {
+                'PASSWORD_HASHER': {'workers': 1, 'max_pending': 4, 'timeout': 30}})
+            app = create_app('pooled')
+            with app.app_context():
+                hasher = password_hasher()
+                if sys.argv[1:] == ['start']:
+                    hasher.start()
+                hashed = hasher.hash('secret')
+                print(hasher.verify(hashed, 'secret'), hasher._executor is not None)
+                hasher.shutdown()
+        """)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "script.py")
+            with open(path, "w") as f:
+                f.write(script)
+            env = dict(os.environ, PYTHONPATH=ROOT)
+            for args, pooled in (([], "False"), (["start"], "True")):
+                result = subprocess.run([sys.executable, path, *args], env=env, cwd=directory,
+                                        capture_output=True, text=True, timeout=60)
+                self.assertEqual(result.returncode, 0, result.stderr)
+                # A worker re-running the script prints first and hashes inline
+                self.assertEqual(result.stdout.splitlines()[-1].split(), ["True", pooled])
+
+    def test_compatible_with_flask_bcrypt(self):
+        from flask_bcrypt import Bcrypt
+        hasher = PasswordHasher(rounds=4, workers=0)
+        legacy = Bcrypt().generate_password_hash("secret", 4).decode("utf-8")
+        self.assertTrue(hasher.verify(legacy, "secret"))
+        self.assertTrue(Bcrypt().check_password_hash(hasher.hash("secret"), "secret"))
+        self.assertFalse(hasher.verify("not a hash", "secret"))
+
+    def test_failures_are_counted_apart(self):
+        hasher = PasswordHasher(rounds=4, workers=0)
+        with self.assertRaises(ZeroDivisionError):
+            hasher._run(divmod, 1, 0)
+        hasher.hash("secret")
+        stats = hasher.stats()
+        self.assertEqual((stats["completed"], stats["failed"], stats["pending"]), (1, 1, 0))
+
+    def test_busy_without_free_slot(self):
+        hasher = PasswordHasher(rounds=4, workers=0, max_pending=1, timeout=0)
+        hasher._slots.acquire()
+        with self.assertRaises(PasswordHasherBusy):
+            hasher.hash("secret")
+
+
+if __name__ == "__main__":
+    unittest.main()
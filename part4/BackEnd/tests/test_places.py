@@ -0,0 +1,332 @@
+# tests/test_places.py
+import unittest
+import json
+from unittest import mock
+from flask_jwt_extended import create_access_token
+from app.extensions import db
+from app.business.facade import HBnBFacade
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.persistence.pagination import decode_cursor
+from tests.base import AppTestCase, count_queries
+
+
+class TestPlaceSearch(AppTestCase):
+    """Server-side filtering and sorting on GET /api/v1/places/"""
+
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="Owner", last_name="One", email="owner@x.com", password="x")
+        db.session.add(owner)
+        db.session.flush()
+        for i, (city, price) in enumerate([("Paris", 80), ("Paris", 150), ("Lyon", 60),
+                                           ("Paris", 120), ("Lyon", 200), ("Nice", 120)]):
+            db.session.add(Place(name=f"Place {i}", city=city, price=price, owner_id=owner.id))
+        db.session.commit()
+
+    def _get(self, query):
+        res = self.client.get(f"/api/v1/places/?{query}")
+        self.assertEqual(res.status_code, 200)
+        return json.loads(res.data), res.headers.get("X-Next-Cursor")
+
+    def test_filters(self):
+        data, _ = self._get("city=Paris&max_price=130")
+        self.assertEqual(sorted(p["price"] for p in data), [80, 120])
+        data, _ = self._get("min_price=120&all=true")
+        self.assertEqual(len(data), 4)
+
+    def test_sort_by_price_paginates(self):
+        prices, cursor = [], None
+        while True:
+            data, cursor = self._get("sort=-price&limit=4" + (f"&cursor={cursor}" if cursor else ""))
+            prices.extend(p["price"] for p in data)
+            if not cursor:
+                break
+        self.assertEqual(prices, [200, 150, 120, 120, 80, 60])
+
+    def test_invalid_sort(self):
+        res = self.client.get("/api/v1/places/?sort=name")
+        self.assertEqual(res.status_code, 400)
+
+    def test_indexes_created(self):
+        names = {ix.name for ix in Place.__table__.indexes}
+        self.assertTrue({"idx_places_city_price", "idx_places_price"} <= names)
+
+
+class PlaceListTestCase(AppTestCase):
+    """Shared fixture: an owner and three amenities attached to every place"""
+
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="Owner", last_name="One", email="owner@x.com", password="x")
+        self.amenities = [Amenity(name=f"Amenity {i}") for i in range(3)]
+        db.session.add_all([owner] + self.amenities)
+        db.session.flush()
+        self.owner_id = owner.id
+        db.session.commit()
+
+    def _add_places(self, count):
+        for i in range(count):
+            place = Place(name=f"Place {i}", city="Paris", price=10, owner_id=self.owner_id)
+            place.amenities.extend(self.amenities)
+            db.session.add(place)
+        db.session.commit()
+        # Start from a cold identity map, like a fresh request would
+        db.session.expunge_all()
+
+
+class TestPlaceEagerLoading(PlaceListTestCase):
+    """Listing places must not lazy-load amenities per place"""
+
+    def _listing_queries(self):
+        with count_queries() as statements:
+            res = self.client.get("/api/v1/places/?limit=50")
+        self.assertEqual(res.status_code, 200)
+        self.assertTrue(all(len(p["amenities"]) == 3 for p in json.loads(res.data)))
+        return len(statements)
+
+    def test_query_count_is_constant(self):
+        self._add_places(2)
+        small = self._listing_queries()
+        self._add_places(20)
+        large = self._listing_queries()
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 2)
+
+    def test_detail_loads_amenities_eagerly(self):
+        self._add_places(1)
+        place_id = db.session.query(Place.id).scalar()
+        db.session.expunge_all()
+        with count_queries() as statements:
+            res = self.client.get(f"/api/v1/places/{place_id}")
+        self.assertEqual(len(json.loads(res.data)["amenities"]), 3)
+        self.assertLessEqual(len(statements), 2)
+
+
+class TestPlacesNearby(AppTestCase):
+    """GET /api/v1/places/nearby"""
+
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="Owner", last_name="One", email="owner@x.com", password="x")
+        db.session.add(owner)
+        db.session.flush()
+        coords = {
+            "Louvre": (48.8606, 2.3376),
+            "Eiffel": (48.8584, 2.2945),
+            "Versailles": (48.8049, 2.1204),
+            "London": (51.5074, -0.1278),
+        }
+        for name, (lat, lng) in coords.items():
+            db.session.add(Place(name=name, city="X", price=1, latitude=lat,
+                                 longitude=lng, owner_id=owner.id))
+        db.session.commit()
+
+    def _names(self, query):
+        res = self.client.get(f"/api/v1/places/nearby?{query}")
+        self.assertEqual(res.status_code, 200)
+        return [p["name"] for p in json.loads(res.data)]
+
+    def test_sorted_by_distance_within_radius(self):
+        self.assertEqual(self._names("lat=48.8566&lng=2.3522&radius_km=5"), ["Louvre", "Eiffel"])
+        self.assertEqual(self._names("lat=48.8566&lng=2.3522&radius_km=30"),
+                         ["Louvre", "Eiffel", "Versailles"])
+        self.assertEqual(self._names("lat=48.8566&lng=2.3522&radius_km=400")[-1], "London")
+
+    def test_geohash_maintained_on_update(self):
+        place = Place.query.filter_by(name="London").one()
+        place.latitude, place.longitude = 48.857, 2.352
+        db.session.commit()
+        self.assertIn("London", self._names("lat=48.8566&lng=2.3522&radius_km=1"))
+
+    def test_coordinates_are_validated_on_write(self):
+        owner = User.query.one()
+        headers = {"Authorization": f"Bearer {create_access_token(identity=owner.id)}"}
+        for coords in ({"latitude": 95}, {"latitude": "abc"}, {"longitude": -181}):
+            res = self.client.post("/api/v1/places/", headers=headers,
+                                   json={"name": "Bad", "city": "X", "price": 1, **coords})
+            self.assertEqual(res.status_code, 400, coords)
+        place = Place.query.filter_by(name="London").one()
+        res = self.client.put(f"/api/v1/places/{place.id}", headers=headers,
+                              json={"longitude": 200})
+        self.assertEqual(res.status_code, 400)
+        res = self.client.put(f"/api/v1/places/{place.id}", headers=headers,
+                              json={"latitude": None, "longitude": None})
+        self.assertEqual(res.status_code, 200)
+        self.assertIsNone(db.session.get(Place, place.id).geohash)
+        self.assertNotIn("London", self._names("lat=51.5&lng=-0.13&radius_km=50"))
+
+    def test_validation(self):
+        self.assertEqual(self.client.get("/api/v1/places/nearby?lat=1").status_code, 400)
+        self.assertEqual(self.client.get("/api/v1/places/nearby?lat=95&lng=0").status_code, 400)
+        self.assertEqual(
+            self.client.get("/api/v1/places/nearby?lat=0&lng=0&radius_km=100000").status_code, 400)
+
+
+class TestPlaceFullTextSearch(AppTestCase):
+    """GET /api/v1/places/search"""
+
+    def setUp(self):
+        super().setUp()
+        owner = User(first_name="Owner", last_name="One", email="owner@x.com", password="x")
+        db.session.add(owner)
+        db.session.flush()
+        self.owner_id = owner.id
+        for name, description, city in [
+            ("Sunny beach house", "Walk to the sea", "Nice"),
+            ("Mountain cabin", "Quiet, near the beach lake", "Chamonix"),
+            ("City loft", "Close to museums", "Paris"),
+            ("Beachfront villa", "Private pool", "Biarritz"),
+        ]:
+            db.session.add(Place(name=name, description=description, city=city,
+                                 price=1, owner_id=owner.id))
+        db.session.commit()
+
+    def _search(self, query):
+        res = self.client.get(f"/api/v1/places/search?{query}")
+        self.assertEqual(res.status_code, 200)
+        return [p["name"] for p in json.loads(res.data)], res.headers.get("X-Next-Cursor")
+
+    def test_ranked_matches(self):
+        names, _ = self._search("q=beach")
+        # Name matches outrank description matches; "beach" also prefixes "Beachfront"
+        self.assertEqual(set(names), {"Sunny beach house", "Mountain cabin", "Beachfront villa"})
+        self.assertEqual(names[-1], "Mountain cabin")
+        names, _ = self._search("q=paris")
+        self.assertEqual(names, ["City loft"])
+
+    def test_index_follows_updates_and_deletes(self):
+        place = Place.query.filter_by(name="City loft").one()
+        place.description = "Rooftop with a beach bar"
+        db.session.commit()
+        self.assertIn("City loft", self._search("q=rooftop")[0])
+        db.session.delete(place)
+        db.session.commit()
+        self.assertEqual(self._search("q=rooftop")[0], [])
+
+    def test_pagination_and_hostile_input(self):
+        names, cursor = self._search("q=beach&limit=2")
+        self.assertEqual(len(names), 2)
+        more, cursor = self._search(f"q=beach&limit=2&cursor={cursor}")
+        self.assertEqual(len(more), 1)
+        self.assertIsNone(cursor)
+        self.assertEqual(self._search('q=beach" OR NEAR(*')[0], [])
+        self.assertEqual(self.client.get("/api/v1/places/search?q=%20").status_code, 400)
+
+    def _walk(self, query):
+        names, cursor = [], None
+        while True:
+            page, cursor = self._search(query + (f"&cursor={cursor}" if cursor else ""))
+            names.extend(page)
+            if not cursor:
+                return names
+
+    def test_pages_resume_after_last_match(self):
+        ranked, _ = self._search("q=beach")
+        self.assertEqual(self._walk("q=beach&limit=1"), ranked)
+        # The cursor holds the (score, id) of the last match, not an offset
+        _, cursor = self._search("q=beach&limit=1")
+        self.assertIsInstance(decode_cursor(cursor, float)[0], float)
+        self.assertEqual(self.client.get("/api/v1/places/search?q=beach&cursor=nope")
+                         .status_code, 400)
+
+    def test_like_fallback(self):
+        repo = HBnBFacade().place_repo
+        with mock.patch.object(type(repo.repository), "_has_fts", return_value=False):
+            names, _ = self._search("q=beach")
+        self.assertEqual(set(names), {"Sunny beach house", "Mountain cabin", "Beachfront villa"})
+        with mock.patch.object(type(repo.repository), "_has_fts", return_value=False):
+            self.assertEqual(self._walk("q=beach&limit=1&fields=name"), names)
+
+
+class TestSparseFieldsets(PlaceListTestCase):
+    """?fields= trims the response and the SELECT"""
+
+    def test_list_loads_only_requested_columns(self):
+        self._add_places(3)
+        with count_queries() as statements:
+            res = self.client.get("/api/v1/places/?fields=id,name,price")
+        self.assertEqual(res.status_code, 200)
+        places = json.loads(res.data)
+        self.assertEqual(len(places), 3)
+        self.assertTrue(all(set(p) == {"id", "name", "price"} for p in places))
+        # No amenity query and no description column
+        self.assertEqual(len(statements), 1)
+        self.assertNotIn("description", statements[0])
+
+    def test_computed_field_loads_its_columns(self):
+        self._add_places(1)
+        with count_queries() as statements:
+            res = self.client.get("/api/v1/places/?fields=name,avg_rating,amenities")
+        place = json.loads(res.data)[0]
+        self.assertEqual(set(place), {"name", "avg_rating", "amenities"})
+        self.assertEqual(len(place["amenities"]), 3)
+        self.assertIn("rating_sum", statements[0])
+        self.assertEqual(len(statements), 2)
+
+    def test_cursor_still_works_with_price_sort(self):
+        self._add_places(3)
+        res = self.client.get("/api/v1/places/?fields=name&sort=price&limit=2")
+        cursor = res.headers["X-Next-Cursor"]
+        res = self.client.get(f"/api/v1/places/?fields=name&sort=price&limit=2&cursor={cursor}")
+        self.assertEqual(len(json.loads(res.data)), 1)
+
+    def test_unknown_field_rejected(self):
+        res = self.client.get("/api/v1/places/?fields=id,password")
+        self.assertEqual(res.status_code, 400)
+
+    def test_detail_and_partial_rows_stay_out_of_the_cache(self):
+        self.app.config['ENTITY_CACHE'] = {'place': {'enabled': True}}
+        self._add_places(1)
+        place_id = json.loads(self.client.get("/api/v1/places/?fields=id").data)[0]["id"]
+        res = self.client.get(f"/api/v1/places/{place_id}?fields=city")
+        self.assertEqual(json.loads(res.data), {"city": "Paris"})
+        res = self.client.get(f"/api/v1/places/{place_id}")
+        self.assertEqual(json.loads(res.data)["name"], "Place 0")
+
+
+class TestStreaming(PlaceListTestCase):
+    """NDJSON export of GET /api/v1/places/"""
+
+    def _lines(self, res):
+        self.assertEqual(res.status_code, 200)
+        self.assertEqual(res.mimetype, "application/x-ndjson")
+        return [json.loads(line) for line in res.get_data(as_text=True).splitlines()]
+
+    def test_streams_every_place_in_batches(self):
+        self.app.config['STREAM_BATCH_SIZE'] = 2
+        self.app.config['PAGE_SIZE_MAX'] = 2
+        self._add_places(5)
+        with count_queries() as statements:
+            res = self.client.get("/api/v1/places/?stream=1")
+            self.assertTrue(res.is_streamed)
+            places = self._lines(res)
+        self.assertEqual(len(places), 5)
+        self.assertTrue(all(len(p["amenities"]) == 3 for p in places))
+        # A places SELECT and an amenities SELECT ... IN per batch of 2
+        self.assertEqual(len(statements), 2 * 3)
+
+    def test_accept_header_filters_and_fields(self):
+        self._add_places(2)
+        db.session.add(Place(name="Far", city="Lyon", price=10, owner_id=self.owner_id))
+        db.session.commit()
+        res = self.client.get("/api/v1/places/?city=Lyon&fields=name",
+                              headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(self._lines(res), [{"name": "Far"}])
+
+    def test_sort_is_honoured(self):
+        self.app.config['STREAM_BATCH_SIZE'] = 2
+        for price in (30, 10, 50, 20, 40):
+            db.session.add(Place(name=f"P{price}", city="Nice", price=price,
+                                 owner_id=self.owner_id))
+        db.session.commit()
+        res = self.client.get("/api/v1/places/?stream=1&sort=-price&fields=name")
+        self.assertEqual([p["name"] for p in self._lines(res)],
+                         ["P50", "P40", "P30", "P20", "P10"])
+        res = self.client.get("/api/v1/places/?stream=1&sort=price&fields=price")
+        self.assertEqual([p["price"] for p in self._lines(res)], [10, 20, 30, 40, 50])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# tests/test_profiler.py
+import unittest
+import os
+import shutil
+import tempfile
+import time
+from unittest import mock
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.utils.profiler import init_profiler
+from tests.base import AppTestCase
+
+
+def _slow_page(limit, cursor=None, fields=None):
+    time.sleep(0.05)
+    return [], None
+
+
+class TestSamplingProfiler(AppTestCase):
+    """Stacks of sampled requests, collapsed per route"""
+
+    def create_app(self):
+        app = create_app('testing')
+        app.config['PROFILER'] = {'enabled': True, 'sample_rate': 1, 'interval_ms': 1}
+        init_profiler(app)
+        return app
+
+    def setUp(self):
+        super().setUp()
+        self.profiler = self.app.extensions['profiler']
+        token = create_access_token(identity="admin", additional_claims={"is_admin": True})
+        self.headers = {"Authorization": f"Bearer {token}"}
+
+    def tearDown(self):
+        self.profiler.close()
+        super().tearDown()
+
+    def _profile_amenities(self):
+        with mock.patch("app.api.amenity_endpoints.facade.get_amenities_page", _slow_page):
+            self.assertEqual(self.client.get("/api/v1/amenities/").status_code, 200)
+
+    def test_stacks_are_collapsed_per_route(self):
+        self._profile_amenities()
+        res = self.client.get("/api/v1/admin/profile/collapsed?route=AmenityList.get",
+                              headers=self.headers)
+        self.assertEqual(res.status_code, 200)
+        self.assertIn('filename="AmenityList.get.folded"', res.headers["Content-Disposition"])
+        lines = res.get_data(as_text=True).splitlines()
+        self.assertTrue(lines)
+        stack, count = lines[0].rsplit(" ", 1)
+        frames = stack.split(";")
+        self.assertEqual(frames[0], "AmenityList.get")
+        self.assertEqual(frames[1], "flask.app:Flask.wsgi_app")
+        self.assertEqual(frames[-1], f"{__name__}:_slow_page")
+        self.assertGreater(int(count), 0)
+
+    def test_summary_and_reset(self):
+        self._profile_amenities()
+        summary = self.client.get("/api/v1/admin/profile", headers=self.headers).get_json()
+        routes = {row["route"]: row for row in summary["routes"]}
+        self.assertEqual(routes["AmenityList.get"]["requests"], 1)
+        self.assertGreater(routes["AmenityList.get"]["samples"], 0)
+        self.assertIn("Profile.get", routes)
+
+        self.client.delete("/api/v1/admin/profile", headers=self.headers)
+        self.assertEqual(self.profiler.collapsed("AmenityList.get"), "")
+
+    def test_unsampled_requests_are_not_profiled(self):
+        self.profiler.sample_rate = 0
+        self._profile_amenities()
+        self.assertEqual(self.profiler.summary()["routes"], [])
+
+    def test_dump_writes_one_file_per_route(self):
+        self._profile_amenities()
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        paths = self.profiler.dump(directory)
+        self.assertEqual([os.path.basename(path) for path in paths], ["AmenityList.get.folded"])
+
+    def test_disabled_profiler_endpoint(self):
+        app = create_app('testing')
+        with app.app_context():
+            db.create_all()
+            token = create_access_token(identity="admin", additional_claims={"is_admin": True})
+            res = app.test_client().get("/api/v1/admin/profile",
+                                        headers={"Authorization": f"Bearer {token}"})
+            db.drop_all()
+        self.assertEqual(res.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+# tests/test_query_stats.py
+import unittest
+import json
+import re
+from sqlalchemy import event
+from app import create_app
+from app.business.facade import HBnBFacade
+from app.extensions import db
+from app.persistence.query_stats import _after_cursor_execute, init_query_stats
+from tests.base import AppTestCase, count_queries
+
+
+class TestQueryStats(AppTestCase):
+    """Per-request query count and database time"""
+
+    def create_app(self):
+        app = create_app('testing')
+        app.config['QUERY_STATS'] = {'enabled': True, 'server_timing': True, 'log': True}
+        init_query_stats(app)
+        return app
+
+    def setUp(self):
+        super().setUp()
+        HBnBFacade().create_amenity({"name": "Wifi"})
+
+    def test_server_timing_header(self):
+        with count_queries() as statements:
+            res = self.client.get("/api/v1/amenities/")
+        timing = res.headers["Server-Timing"]
+        match = re.match(r'db;dur=[\d.]+;desc="(\d+) queries", app;dur=[\d.]+$', timing)
+        self.assertIsNotNone(match, timing)
+        # count_queries leaves out the table_versions reads
+        self.assertGreaterEqual(int(match.group(1)), len(statements))
+        self.assertGreater(int(match.group(1)), 0)
+
+    def test_structured_log_line(self):
+        with self.assertLogs(self.app.logger, level="INFO") as logs:
+            self.client.get("/api/v1/amenities/")
+        line = json.loads(logs.records[-1].getMessage())
+        self.assertEqual((line["method"], line["path"], line["status"]),
+                         ("GET", "/api/v1/amenities/", 200))
+        self.assertGreater(line["queries"], 0)
+
+    def test_disabled_registers_nothing(self):
+        app = create_app('testing')
+        with app.app_context():
+            engine = db.engine
+        self.assertFalse(event.contains(engine, 'after_cursor_execute', _after_cursor_execute))
+        with app.test_client() as client:
+            self.assertNotIn("Server-Timing", client.get("/swagger.json").headers)
+
+
+if __name__ == "__main__":
+    unittest.main()
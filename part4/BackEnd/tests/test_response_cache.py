@@ -0,0 +1,113 @@
+# tests/test_response_cache.py
+import unittest
+import json
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.business.facade import HBnBFacade
+from app.extensions import db
+from app.models.user import User
+from app.utils.response_cache import ResponseCache
+from tests.base import AppTestCase, count_queries
+
+
+class TestResponseCache(AppTestCase):
+    """Cached GET /api/v1/amenities/ with commit-driven invalidation"""
+
+    def create_app(self):
+        app = create_app('testing')
+        app.config['RESPONSE_CACHE'] = {'amenities': {'enabled': True, 'ttl': 60}}
+        return app
+
+    def setUp(self):
+        super().setUp()
+        self.facade = HBnBFacade()
+        self.facade.create_amenity({"name": "Wifi"})
+
+    def test_second_read_is_served_from_cache(self):
+        first = self.client.get("/api/v1/amenities/")
+        self.assertEqual(first.headers["X-Cache"], "MISS")
+        with count_queries() as statements:
+            second = self.client.get("/api/v1/amenities/")
+        self.assertEqual(second.headers["X-Cache"], "HIT")
+        self.assertEqual(statements, [])
+        self.assertEqual(json.loads(second.data), json.loads(first.data))
+
+    def test_query_string_is_part_of_the_key(self):
+        self.client.get("/api/v1/amenities/")
+        res = self.client.get("/api/v1/amenities/?fields=name")
+        self.assertEqual(res.headers["X-Cache"], "MISS")
+        self.assertEqual(json.loads(res.data), [{"name": "Wifi"}])
+
+    def test_commit_invalidates(self):
+        self.client.get("/api/v1/amenities/")
+        self.facade.create_amenity({"name": "Pool"})
+        res = self.client.get("/api/v1/amenities/")
+        self.assertEqual(res.headers["X-Cache"], "MISS")
+        self.assertEqual(len(json.loads(res.data)), 2)
+
+    def test_rollback_keeps_entry(self):
+        self.client.get("/api/v1/amenities/")
+        with self.assertRaises(RuntimeError):
+            with self.facade.transaction():
+                self.facade.create_amenity({"name": "Pool"})
+                raise RuntimeError
+        self.assertEqual(self.client.get("/api/v1/amenities/").headers["X-Cache"], "HIT")
+
+    def test_stats_endpoint(self):
+        admin = User(first_name="A", last_name="D", email="a@x.com", password="x", is_admin=True)
+        db.session.add(admin)
+        db.session.commit()
+        self.client.get("/api/v1/amenities/")
+        self.client.get("/api/v1/amenities/")
+        token = create_access_token(identity=admin.id, additional_claims={"is_admin": True})
+        res = self.client.get("/api/v1/admin/response-cache",
+                              headers={"Authorization": f"Bearer {token}"})
+        stats = json.loads(res.data)["amenities"]
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_ratio"], 0.5)
+
+    def test_review_aggregates_invalidate_place_list(self):
+        self.app.config['RESPONSE_CACHE']['places'] = {'enabled': True, 'ttl': 60}
+        owner = User(first_name="O", last_name="W", email="o@x.com", password="x")
+        guest = User(first_name="G", last_name="U", email="g@x.com", password="x")
+        db.session.add_all([owner, guest])
+        db.session.commit()
+        place = self.facade.create_place({"name": "Loft", "city": "Paris", "price": 90,
+                                          "latitude": 48.8, "longitude": 2.3,
+                                          "owner_id": owner.id})
+        self.client.get("/api/v1/places/")
+        self.assertEqual(self.client.get("/api/v1/places/").headers["X-Cache"], "HIT")
+        self.facade.create_review({"text": "Nice", "rating": 5, "user_id": guest.id,
+                                   "place_id": place.id})
+        res = self.client.get("/api/v1/places/")
+        self.assertEqual(res.headers["X-Cache"], "MISS")
+        body = json.loads(res.data)[0]
+        self.assertEqual((body["review_count"], body["avg_rating"]), (1, 5.0))
+
+
+class TestStaleWhileRevalidate(unittest.TestCase):
+    """ResponseCache lookup states"""
+
+    def test_one_caller_revalidates_while_others_get_stale(self):
+        cache = ResponseCache(ttl=0, stale_while_revalidate=60)
+        cache.store("k", (1,), "page")
+        self.assertEqual(cache.lookup("k", (1,)), (None, None))
+        self.assertEqual(cache.lookup("k", (1,)), ("page", "stale"))
+        cache.store("k", (1,), "new page")
+        self.assertEqual(cache.lookup("k", (1,)), (None, None))
+
+    def test_version_change_is_never_served_stale(self):
+        cache = ResponseCache(ttl=60, stale_while_revalidate=60)
+        cache.store("k", (1,), "page")
+        self.assertEqual(cache.lookup("k", (1,)), ("page", "fresh"))
+        self.assertEqual(cache.lookup("k", (2,)), (None, None))
+        self.assertEqual(cache.stats()["invalidations"], 1)
+
+    def test_expired_past_stale_window(self):
+        cache = ResponseCache(ttl=0, stale_while_revalidate=0)
+        cache.store("k", (1,), "page")
+        self.assertEqual(cache.lookup("k", (1,)), (None, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
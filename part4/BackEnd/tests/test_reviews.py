@@ -0,0 +1,257 @@
+# tests/test_reviews.py
+import unittest
+import json
+from datetime import datetime, timedelta
+from unittest import mock
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, text
+from app.business.facade import HBnBFacade
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.persistence.review_repository import ReviewRepository
+from tests.base import AppTestCase, count_queries
+
+
+class ReviewTestCase(AppTestCase):
+    """Shared fixture: one owner, one place, a handful of reviewers"""
+
+    def setUp(self):
+        super().setUp()
+        self.users = [User(first_name="User", last_name=str(i), email=f"u{i}@x.com", password="x")
+                      for i in range(6)]
+        db.session.add_all(self.users)
+        db.session.flush()
+        self.place = Place(name="Loft", city="Paris", price=90, owner_id=self.users[0].id)
+        self.other_place = Place(name="Barn", city="Lyon", price=40, owner_id=self.users[0].id)
+        db.session.add_all([self.place, self.other_place])
+        db.session.commit()
+
+
+class TestReviewsByPlace(ReviewTestCase):
+    """GET /api/v1/reviews/place/<place_id>"""
+
+    def setUp(self):
+        super().setUp()
+        base = datetime(2024, 1, 1)
+        for i, user in enumerate(self.users[1:]):
+            db.session.add(Review(text=f"Review {i}", rating=4, user_id=user.id,
+                                  place_id=self.place.id, created_at=base + timedelta(days=i)))
+            db.session.add(Review(text="Elsewhere", rating=3, user_id=user.id,
+                                  place_id=self.other_place.id))
+        db.session.commit()
+
+    def test_newest_first_with_pagination(self):
+        texts, cursor = [], None
+        while True:
+            url = f"/api/v1/reviews/place/{self.place.id}?limit=2"
+            res = self.client.get(url + (f"&cursor={cursor}" if cursor else ""))
+            self.assertEqual(res.status_code, 200)
+            texts.extend(r["text"] for r in json.loads(res.data))
+            cursor = res.headers.get("X-Next-Cursor")
+            if not cursor:
+                break
+        self.assertEqual(texts, [f"Review {i}" for i in range(4, -1, -1)])
+
+    def _plan_of_by_place(self, **kwargs):
+        """EXPLAIN QUERY PLAN of the SELECT ReviewRepository.by_place runs."""
+        executed = []
+
+        def record(conn, cursor, statement, parameters, *args):
+            executed.append((statement, parameters))
+
+        event.listen(db.engine, "before_cursor_execute", record)
+        try:
+            ReviewRepository().by_place(self.place.id, limit=2, **kwargs)
+        finally:
+            event.remove(db.engine, "before_cursor_execute", record)
+        statement, parameters = [e for e in executed if "FROM reviews" in e[0]][0]
+        cursor = db.session.connection().connection.cursor()
+        cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return " ".join(row[-1] for row in cursor.fetchall())
+
+    def test_query_uses_place_index(self):
+        _, next_cursor = ReviewRepository().by_place(self.place.id, limit=2)
+        for kwargs in ({}, {"with_authors": True}, {"cursor": next_cursor}):
+            detail = self._plan_of_by_place(**kwargs)
+            self.assertIn("idx_reviews_place_id", detail, kwargs)
+            self.assertNotIn("TEMP B-TREE", detail, kwargs)
+
+    def test_stream_exports_every_review(self):
+        res = self.client.get("/api/v1/reviews/?stream=1&fields=text")
+        lines = res.get_data(as_text=True).splitlines()
+        self.assertEqual(len(lines), 10)
+        self.assertEqual(json.loads(lines[0]), {"text": "Review 0"})
+
+
+class TestDuplicateReviews(ReviewTestCase):
+    """One review per (user, place), enforced by query and constraint"""
+
+    def _post_review(self, user):
+        token = create_access_token(identity=user.id)
+        return self.client.post("/api/v1/reviews/",
+            data=json.dumps({"text": "Nice", "place_id": self.place.id}),
+            content_type="application/json",
+            headers={"Authorization": f"Bearer {token}"})
+
+    def test_second_review_rejected(self):
+        self.assertEqual(self._post_review(self.users[1]).status_code, 201)
+        res = self._post_review(self.users[1])
+        self.assertEqual(res.status_code, 400)
+        self.assertIn("already reviewed", json.loads(res.data)["message"])
+
+    def test_has_user_reviewed_place(self):
+        facade = HBnBFacade()
+        self.assertFalse(facade.has_user_reviewed_place(self.users[2].id, self.place.id))
+        self._post_review(self.users[2])
+        self.assertTrue(facade.has_user_reviewed_place(self.users[2].id, self.place.id))
+
+    def test_race_past_check_hits_unique_constraint(self):
+        facade = HBnBFacade()
+        data = {"text": "Nice", "user_id": self.users[3].id, "place_id": self.place.id}
+        facade.create_review(dict(data))
+        with mock.patch.object(HBnBFacade, "has_user_reviewed_place", return_value=False):
+            with self.assertRaisesRegex(ValueError, "already reviewed"):
+                facade.create_review(dict(data))
+        # The session is usable again after the rollback
+        self.assertEqual(Review.query.filter_by(place_id=self.place.id).count(), 1)
+
+
+class TestRatingAggregates(ReviewTestCase):
+    """review_count / rating_sum on places follow review writes"""
+
+    def setUp(self):
+        super().setUp()
+        self.facade = HBnBFacade()
+
+    def _stats(self):
+        db.session.expire_all()
+        place = db.session.get(Place, self.place.id)
+        return place.review_count, place.rating_sum, place.avg_rating
+
+    def _review(self, user, rating):
+        return self.facade.create_review({"text": "Nice", "rating": rating,
+                                          "user_id": user.id, "place_id": self.place.id})
+
+    def test_create_update_delete(self):
+        self.assertEqual(self._stats(), (0, 0, None))
+        first = self._review(self.users[1], 5)
+        self._review(self.users[2], 2)
+        self.assertEqual(self._stats(), (2, 7, 3.5))
+        self.facade.update_review(first.id, {"rating": 3})
+        self.assertEqual(self._stats(), (2, 5, 2.5))
+        self.facade.delete_review(first.id)
+        self.assertEqual(self._stats(), (1, 2, 2.0))
+
+    def test_invalid_rating_rejected(self):
+        with self.assertRaisesRegex(ValueError, "Rating"):
+            self._review(self.users[1], 9)
+        review = self._review(self.users[1], 4)
+        with self.assertRaisesRegex(ValueError, "Rating"):
+            self.facade.update_review(review.id, {"rating": 0})
+        self.assertEqual(self._stats(), (1, 4, 4.0))
+
+    def test_batch_aggregates_per_place(self):
+        items = [{"text": "Ok", "rating": r, "user_id": u.id, "place_id": self.place.id}
+                 for u, r in zip(self.users[1:4], (1, 2, 3))]
+        self.facade.create_reviews_batch(items)
+        self.assertEqual(self._stats(), (3, 6, 2.0))
+
+    def test_place_payload_exposes_average(self):
+        self._review(self.users[1], 4)
+        res = self.client.get(f"/api/v1/places/{self.place.id}")
+        body = json.loads(res.data)
+        self.assertEqual(body["review_count"], 1)
+        self.assertEqual(body["avg_rating"], 4.0)
+
+    def test_recompute_repairs_drift(self):
+        self._review(self.users[1], 4)
+        self._review(self.users[2], None)
+        db.session.execute(text("UPDATE places SET review_count = 9, rating_count = 9, "
+                                "rating_sum = 1"))
+        db.session.commit()
+        self.facade.place_repo.recompute_rating_stats()
+        self.assertEqual(self._stats(), (2, 4, 4.0))
+
+    def test_unrated_reviews_leave_average_alone(self):
+        self._review(self.users[1], 4)
+        unrated = self._review(self.users[2], None)
+        self.facade.create_reviews_batch([{"text": "Ok", "user_id": self.users[3].id,
+                                           "place_id": self.place.id}])
+        self.assertEqual(self._stats(), (3, 4, 4.0))
+        self.facade.update_review(unrated.id, {"rating": 2})
+        self.assertEqual(self._stats(), (3, 6, 3.0))
+        self.facade.update_review(unrated.id, {"rating": None})
+        self.assertEqual(self._stats(), (3, 4, 4.0))
+        self.facade.delete_review(unrated.id)
+        self.assertEqual(self._stats(), (2, 4, 4.0))
+
+    def test_average_readable_before_commit(self):
+        with self.facade.transaction():
+            self._review(self.users[1], 4)
+            place = db.session.get(Place, self.place.id)
+            self.assertEqual((place.review_count, place.avg_rating), (1, 4.0))
+
+    def test_unsaved_place_updates_in_python(self):
+        now = datetime(2024, 1, 1)
+        place = Place(name="New", city="Nice", price=10, owner_id=self.users[0].id,
+                      created_at=now, updated_at=now)
+        place.add_review_stats(1, 1, 5)
+        place.add_review_stats(1, 0, 0)
+        self.assertEqual((place.review_count, place.avg_rating), (2, 5.0))
+        self.assertEqual(place.to_dict()["avg_rating"], 5.0)
+
+
+class TestPlaceFull(ReviewTestCase):
+    """GET /api/v1/places/<place_id>/full"""
+
+    def _fill(self, reviewers, amenities, start=0):
+        place = db.session.get(Place, self.place_id)
+        place.amenities.extend(Amenity(name=f"Amenity {i}")
+                                 for i in range(start, start + amenities))
+        for i, user_id in enumerate(self.user_ids[1 + start:1 + start + reviewers], start):
+            db.session.add(Review(text=f"Review {i}", rating=4, user_id=user_id,
+                                  place_id=self.place_id,
+                                  created_at=datetime(2024, 1, 1) + timedelta(days=i)))
+        db.session.commit()
+        db.session.expunge_all()
+
+    def _get(self, query=""):
+        with count_queries() as statements:
+            res = self.client.get(f"/api/v1/places/{self.place_id}/full{query}")
+        self.assertEqual(res.status_code, 200)
+        return json.loads(res.data), len(statements)
+
+    def setUp(self):
+        super().setUp()
+        self.place_id = self.place.id
+        self.user_ids = [user.id for user in self.users]
+
+    def test_embeds_amenities_reviews_and_authors(self):
+        self._fill(reviewers=3, amenities=2)
+        body, _ = self._get("?reviews_limit=2")
+        self.assertEqual(body["name"], "Loft")
+        self.assertEqual(sorted(a["name"] for a in body["amenities"]),
+                         ["Amenity 0", "Amenity 1"])
+        self.assertEqual([r["text"] for r in body["reviews"]], ["Review 2", "Review 1"])
+        self.assertEqual(body["reviews"][0]["author_name"], "User 3")
+        self.assertIsNotNone(body["reviews_next_cursor"])
+
+    def test_query_count_is_bounded(self):
+        self._fill(reviewers=1, amenities=1)
+        _, small = self._get()
+        db.session.expunge_all()
+        self._fill(reviewers=4, amenities=5, start=1)
+        _, large = self._get()
+        self.assertEqual(small, large)
+        self.assertLessEqual(large, 3)
+
+    def test_unknown_place(self):
+        res = self.client.get("/api/v1/places/nope/full")
+        self.assertEqual(res.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
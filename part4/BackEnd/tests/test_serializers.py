@@ -0,0 +1,75 @@
+# tests/test_serializers.py
+import unittest
+import json
+from flask_restx import Model, fields, marshal
+from flask_restx.fields import MarshallingError
+from app.api.amenity_endpoints import amenity_model
+from app.api.place_endpoints import place_full_model, place_model
+from app.api.review_endpoints import review_model
+from app.api.user_endpoints import user_model
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+from app.utils.serializers import compile_model
+from tests.base import AppTestCase
+
+
+class TestCompiledSerializers(AppTestCase):
+    """Compiled serializers give the same output as flask-restx marshal()"""
+
+    def setUp(self):
+        super().setUp()
+        self.user = User(first_name="Ann", last_name="Lee", email="ann@x.com", password="x")
+        db.session.add(self.user)
+        db.session.flush()
+        self.wifi = Amenity(name="Wifi")
+        self.place = Place(name="Loft", description=None, city="Paris", price=90,
+                           owner_id=self.user.id, amenities=[self.wifi])
+        db.session.add(self.place)
+        db.session.flush()
+        self.review = Review(text="Great", rating=5, user_id=self.user.id,
+                             place_id=self.place.id)
+        db.session.add(self.review)
+        db.session.commit()
+
+    def test_same_output_as_marshal(self):
+        for obj, model in ((self.place, place_model), (self.review, review_model),
+                           (self.user, user_model), (self.wifi, amenity_model)):
+            with self.subTest(model=model.name):
+                self.assertEqual(compile_model(model)(obj), marshal(obj, model))
+
+    def test_nested_lists(self):
+        self.place.reviews = [self.review]
+        self.place.reviews_next_cursor = None
+        self.assertEqual(compile_model(place_full_model)(self.place),
+                         marshal(self.place, place_full_model))
+
+    def test_dicts_and_missing_attributes(self):
+        serialize = compile_model(place_model)
+        self.assertEqual(serialize({"name": "Loft", "price": "12"}),
+                         marshal({"name": "Loft", "price": "12"}, place_model))
+        self.assertEqual(serialize(self.wifi), marshal(self.wifi, place_model))
+
+    def test_unknown_field_types_and_errors(self):
+        model = Model("Odd", {
+            "name": fields.String(attribute="city"),
+            "price": fields.Fixed(decimals=2),
+            "rating": fields.Integer(default=0),
+            "flag": fields.Boolean,
+        })
+        self.assertEqual(compile_model(model)(self.place), marshal(self.place, model))
+        broken = Model("Broken", {"name": fields.Integer})
+        with self.assertRaises(MarshallingError):
+            compile_model(broken)(self.place)
+
+    def test_list_endpoint_output_unchanged(self):
+        res = self.client.get("/api/v1/places/")
+        self.assertEqual(json.loads(res.data), [marshal(self.place, place_model)])
+        res = self.client.get("/api/v1/places/?fields=name,price")
+        self.assertEqual(json.loads(res.data), [{"name": "Loft", "price": 90.0}])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,93 @@
+# tests/test_slow_queries.py
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from app import create_app
+from app.business.facade import HBnBFacade
+from app.extensions import db
+from app.models.user import User
+from app.persistence.query_stats import _after_cursor_execute, init_query_stats
+from app.persistence.slow_queries import fingerprint, init_slow_query_log
+from tests.base import AppTestCase
+
+
+class TestSlowQueryLog(AppTestCase):
+    """Slow statements logged with their plan and grouped by fingerprint"""
+
+    def create_app(self):
+        self.tmp = tempfile.mkdtemp()
+        self.path = os.path.join(self.tmp, "slow.log")
+        app = create_app('testing')
+        # Every statement counts as slow
+        app.config['SLOW_QUERY_LOG'] = {'enabled': True, 'threshold_ms': 0, 'path': self.path}
+        init_slow_query_log(app)
+        return app
+
+    def setUp(self):
+        super().setUp()
+        self.facade = HBnBFacade()
+
+    def tearDown(self):
+        super().tearDown()
+        self.app.extensions['slow_query_log'].close()
+        shutil.rmtree(self.tmp)
+
+    def _log_lines(self):
+        with open(self.path, encoding="utf-8") as log:
+            return [json.loads(line) for line in log]
+
+    def test_log_line_has_caller_shape_and_plan(self):
+        self.facade.get_user_by_email("nobody@x.com")
+        line = [entry for entry in self._log_lines() if "FROM users" in entry["sql"]][-1]
+        self.assertEqual(line["caller"], "HBnBFacade.get_user_by_email")
+        self.assertEqual(line["parameters"], ["str", "int", "int"])
+        self.assertTrue(any("users" in step for step in line["plan"]), line["plan"])
+        self.assertIn("duration_ms", line)
+
+    def test_report_flags_full_scans(self):
+        admin = User(first_name="A", last_name="D", email="a@x.com", password="x", is_admin=True)
+        db.session.add(admin)
+        db.session.commit()
+        for city in ("Paris", "Lyon"):
+            db.session.execute(text(f"SELECT id FROM places WHERE description = '{city}'"))
+        token = create_access_token(identity=admin.id, additional_claims={"is_admin": True})
+        res = self.client.get("/api/v1/admin/slow-queries?limit=100&sort=count",
+                              headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(res.status_code, 200)
+        report = {row["fingerprint"]: row for row in res.get_json()}
+        row = report["SELECT id FROM places WHERE description = ?"]
+        self.assertEqual(row["count"], 2)
+        self.assertTrue(row["full_scan"])
+        self.assertEqual(row["plan"], ["SCAN places"])
+
+    def test_fingerprint_folds_literals_and_in_lists(self):
+        self.assertEqual(
+            fingerprint("SELECT *  FROM places\n WHERE price > 10.5 AND id IN (?, ?, ?) "
+                        "AND city = 'O''Hare'"),
+            "SELECT * FROM places WHERE price > ? AND id IN (...) AND city = ?")
+
+    def test_threshold(self):
+        logged = len(self._log_lines())
+        self.app.extensions['slow_query_log'].threshold = 60
+        self.facade.get_user_by_email("nobody@x.com")
+        self.assertEqual(len(self._log_lines()), logged)
+
+    def test_shares_the_query_stats_timer(self):
+        self.app.config['QUERY_STATS'] = {'enabled': True, 'log': False}
+        init_query_stats(self.app)
+        listeners = list(db.engine.dispatch.after_cursor_execute)
+        self.assertEqual(listeners.count(_after_cursor_execute), 1)
+        logged = len(self._log_lines())
+        res = self.client.get("/api/v1/amenities/")
+        # Both features see every statement of the request
+        counted = int(res.headers["Server-Timing"].split('desc="')[1].split()[0])
+        self.assertGreater(counted, 0)
+        self.assertEqual(len(self._log_lines()), logged + counted)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,48 @@
+# tests/test_unit_of_work.py
+import unittest
+from sqlalchemy import event
+from app.extensions import db
+from app.business.facade import HBnBFacade
+from app.models.amenity import Amenity
+from tests.base import AppTestCase
+
+
+class TestUnitOfWork(AppTestCase):
+    """facade.transaction() defers repository commits to the end of the block"""
+
+    def setUp(self):
+        super().setUp()
+        self.facade = HBnBFacade()
+        self.commits = 0
+        event.listen(db.session, "after_commit", self._count_commit)
+
+    def tearDown(self):
+        event.remove(db.session, "after_commit", self._count_commit)
+        super().tearDown()
+
+    def _count_commit(self, session):
+        self.commits += 1
+
+    def test_single_commit_for_block(self):
+        with self.facade.transaction():
+            for i in range(10):
+                self.facade.create_amenity({"name": f"A{i}"})
+            with self.facade.transaction():
+                self.facade.create_amenity({"name": "nested"})
+            self.assertEqual(self.commits, 0)
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(Amenity.query.count(), 11)
+
+    def test_error_rolls_back_whole_block(self):
+        with self.assertRaises(RuntimeError):
+            with self.facade.transaction():
+                self.facade.create_amenity({"name": "kept?"})
+                raise RuntimeError("boom")
+        self.assertEqual(Amenity.query.count(), 0)
+        # Outside a block, writes commit immediately again
+        self.facade.create_amenity({"name": "after"})
+        self.assertEqual(self.commits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -71,8 +71,10 @@ async function loginUser(email, password) {
         if (response.ok) {
             const data = await response.json();
             
-            // Store the JWT token in a cookie
+            // Store the JWT tokens in cookies; the refresh token renews
+            // the access token when it expires (see authorizedFetch)
             setCookie('token', data.access_token, 7);
+            setCookie('refresh_token', data.refresh_token, 7);
             
             // Redirect to main page
             window.location.href = 'index.html';
@@ -93,9 +95,51 @@ function isAuthenticated() {
     return getCookie('token') !== null;
 }
 
+// Get a new access token with the refresh token; returns it, or null
+async function refreshAccessToken() {
+    const refreshToken = getCookie('refresh_token');
+    if (!refreshToken) {
+        return null;
+    }
+    const response = await fetch(`${API_BASE_URL}/auth/refresh`, {
+        method: 'POST',
+        headers: { 'Authorization': `Bearer ${refreshToken}` }
+    });
+    if (!response.ok) {
+        return null;
+    }
+    const data = await response.json();
+    setCookie('token', data.access_token, 7);
+    return data.access_token;
+}
+
+// fetch() with the access token, refreshed once if it has expired
+async function authorizedFetch(url, options = {}) {
+    const send = (token) => fetch(url, {
+        ...options,
+        headers: { ...(options.headers || {}), 'Authorization': `Bearer ${token}` }
+    });
+    const response = await send(getCookie('token'));
+    if (response.status !== 401) {
+        return response;
+    }
+    const token = await refreshAccessToken();
+    return token ? send(token) : response;
+}
+
 // Logout functionality
-function logout() {
-    deleteCookie('token');
+async function logout() {
+    // Revoke both tokens server-side; log out locally even if this fails
+    for (const name of ['token', 'refresh_token']) {
+        const token = getCookie(name);
+        if (token) {
+            await fetch(`${API_BASE_URL}/auth/logout`, {
+                method: 'POST',
+                headers: { 'Authorization': `Bearer ${token}` }
+            }).catch(() => {});
+        }
+        deleteCookie(name);
+    }
     window.location.href = 'login.html';
 }
 
@@ -130,17 +174,34 @@ function checkAuthentication() {
     }
 }
 
-async function fetchPlaces() {
+async function fetchPlaces(maxPrice = 'all') {
+    // Let the API do the filtering so only matching places are downloaded
+    const params = new URLSearchParams();
+    if (maxPrice !== 'all') {
+        params.set('max_price', maxPrice);
+    }
+
+    // The list is paginated: follow X-Next-Cursor until the last page
+    params.set('limit', '100');
+
     try {
-        const response = await fetch(`${API_BASE_URL}/places`);
+        const places = [];
+        let cursor = null;
+        do {
+            if (cursor) {
+                params.set('cursor', cursor);
+            }
+            const response = await fetch(`${API_BASE_URL}/places/?${params.toString()}`);
+            if (!response.ok) {
+                document.getElementById('places-list').innerHTML = '<p class="error">Failed to load places.</p>';
+                return;
+            }
+            places.push(...await response.json());
+            cursor = response.headers.get('X-Next-Cursor');
+        } while (cursor);
 
-        if (response.ok) {
-            const places = await response.json();
-            allPlaces = places;
-            displayPlaces(places);
-        } else {
-            document.getElementById('places-list').innerHTML = '<p class="error">Failed to load places.</p>';
-        }
+        allPlaces = places;
+        displayPlaces(places);
     } catch (error) {
         console.error('Error fetching places:', error);
         document.getElementById('places-list').innerHTML = '<p class="error">Error loading places. Please check if the API is running.</p>';
@@ -193,22 +254,7 @@ function setupPriceFilter() {
 }
 
 function filterPlacesByPrice(maxPrice) {
-    const placeCards = document.querySelectorAll('.place-card');
-
-    placeCards.forEach(card => {
-        const price = parseFloat(card.dataset.price);
-
-        if (maxPrice === 'all') {
-            card.style.display = 'inline-block';
-        } else {
-            const max = parseFloat(maxPrice);
-            if (price <= max) {
-                card.style.display = 'inline-block';
-            } else {
-                card.style.display = 'none';
-            }
-        }
-    });
+    fetchPlaces(maxPrice);
 }
 
 function viewPlaceDetails(placeId) {
@@ -266,16 +312,17 @@ function checkAuthenticationForPlaceDetails() {
                     
                     const placeId = getPlaceIdFromURL();
                     const reviewText = document.getElementById('review-text').value;
+                    const rating = parseInt(document.getElementById('rating').value, 10);
                     
                     try {
-                        const response = await fetch(`${API_BASE_URL}/reviews/`, {
+                        const response = await authorizedFetch(`${API_BASE_URL}/reviews/`, {
                             method: 'POST',
                             headers: {
-                                'Content-Type': 'application/json',
-                                'Authorization': `Bearer ${token}`
+                                'Content-Type': 'application/json'
                             },
                             body: JSON.stringify({
                                 text: reviewText,
+                                rating: rating,
                                 place_id: placeId
                             })
                         });
@@ -311,15 +358,16 @@ async function fetchPlaceDetails(placeId) {
     }
 
     try {
-        const response = await fetch(`${API_BASE_URL}/places/${placeId}`, {
+        // One request returns the place, its amenities and the first reviews
+        const response = await fetch(`${API_BASE_URL}/places/${placeId}/full`, {
             method: 'GET',
             headers: headers
         });
 
         if (response.ok) {
             const place = await response.json();
-            await displayPlaceDetails(place);
-            await fetchReviews(placeId);
+            displayPlaceDetails(place);
+            displayReviews(place.reviews);
         } else if (response.status === 404) {
             document.getElementById('place-details').innerHTML = '<p class="error">Place not found.</p>';
         } else {
@@ -331,7 +379,7 @@ async function fetchPlaceDetails(placeId) {
     }
 }
 
-async function displayPlaceDetails(place) {
+function displayPlaceDetails(place) {
     // Set the main title
     const placeTitle = document.getElementById('place-title');
     if (placeTitle) {
@@ -365,25 +413,7 @@ async function displayPlaceDetails(place) {
     amenitiesDiv.style.fontSize = '1.1rem';
     
     if (place.amenities && place.amenities.length > 0) {
-        // Extract amenity IDs from strings like "<Amenity UUID>"
-        const amenityIds = place.amenities.map(a => {
-            const match = a.match(/[a-f0-9-]{36}/);
-            return match ? match[0] : null;
-        }).filter(id => id !== null);
-        
-        // Fetch amenity names
-        const amenityNames = [];
-        for (const amenityId of amenityIds) {
-            try {
-                const amenityResponse = await fetch(`${API_BASE_URL}/amenities/${amenityId}`);
-                if (amenityResponse.ok) {
-                    const amenity = await amenityResponse.json();
-                    amenityNames.push(amenity.name);
-                }
-            } catch (error) {
-                console.error('Error fetching amenity:', error);
-            }
-        }
+        const amenityNames = place.amenities.map(amenity => amenity.name);
         
         if (amenityNames.length > 0) {
             amenitiesDiv.innerHTML = `<strong>Amenities:</strong> ${amenityNames.join(', ')}`;
@@ -398,11 +428,11 @@ async function displayPlaceDetails(place) {
 
 async function fetchReviews(placeId) {
     try {
-        const response = await fetch(`${API_BASE_URL}/reviews/place/${placeId}`);
+        const response = await fetch(`${API_BASE_URL}/places/${placeId}/full`);
 
         if (response.ok) {
-            const reviews = await response.json();
-            displayReviews(reviews);
+            const place = await response.json();
+            displayReviews(place.reviews);
         } else {
             document.getElementById('reviews-list').innerHTML = '<p>Failed to load reviews.</p>';
         }
@@ -412,7 +442,7 @@ async function fetchReviews(placeId) {
     }
 }
 
-async function displayReviews(reviews) {
+function displayReviews(reviews) {
     const reviewsList = document.getElementById('reviews-list');
     const reviewsSection = document.getElementById('reviews-section');
     reviewsList.innerHTML = '';
@@ -427,7 +457,6 @@ async function displayReviews(reviews) {
         return;
     }
 
-    // Fetch user information for each review
     for (const review of reviews) {
         const reviewCard = document.createElement('div');
         reviewCard.style.background = 'white';
@@ -436,19 +465,8 @@ async function displayReviews(reviews) {
         reviewCard.style.marginBottom = '20px';
         reviewCard.style.boxShadow = '0 2px 8px rgba(0,0,0,0.1)';
 
-        // Fetch user name
-        let userName = 'Anonymous';
-        if (review.user_id) {
-            try {
-                const userResponse = await fetch(`${API_BASE_URL}/users/${review.user_id}`);
-                if (userResponse.ok) {
-                    const user = await userResponse.json();
-                    userName = `${user.first_name} ${user.last_name}`;
-                }
-            } catch (error) {
-                console.error('Error fetching user info:', error);
-            }
-        }
+        // Author name comes embedded in the review
+        const userName = review.author_name || 'Anonymous';
 
         const reviewHeader = document.createElement('p');
         reviewHeader.innerHTML = `<strong>${userName}:</strong>`;
@@ -514,16 +532,17 @@ document.addEventListener('DOMContentLoaded', () => {
             event.preventDefault();
             
             const reviewText = document.getElementById('review').value;
+            const rating = parseInt(document.getElementById('rating').value, 10);
             
             try {
-                const response = await fetch(`${API_BASE_URL}/reviews/`, {
+                const response = await authorizedFetch(`${API_BASE_URL}/reviews/`, {
                     method: 'POST',
                     headers: {
-                        'Content-Type': 'application/json',
-                        'Authorization': `Bearer ${token}`
+                        'Content-Type': 'application/json'
                     },
                     body: JSON.stringify({
                         text: reviewText,
+                        rating: rating,
                         place_id: placeId
                     })
                 });